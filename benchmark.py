@@ -0,0 +1,261 @@
+"""Headless benchmark harness for the platformer.
+
+Runs the game loop under the SDL dummy video driver for each shipped level and
+for a parameterized stress scene, and reports ticks/sec plus the per-phase
+cost recorded by FrameProfiler. Levels wider or taller than the screen also
+get a scroll scenario that runs the player across them, exercising the chunk
+streamer; its chunk statistics are reported with the result. Results can be saved as a baseline and later
+runs compared against it:
+
+    python benchmark.py --save-baseline
+    python benchmark.py --bees 80 --stingers 400 --compare
+
+Results are keyed by scenario and mode (sim, or the drawing quality tier), so
+a --sim-only or --quality run is only compared against a baseline recorded
+the same way.
+"""
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import contextlib
+import io
+
+# Must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import platformer_game as game
+
+BASELINE_PATH = "benchmark_baseline.json"
+DEFAULT_TICKS = 600
+DEFAULT_REPEATS = 3  # Runs per scenario, the fastest one is reported
+WARMUP_TICKS = 60
+REGRESSION_THRESHOLD = 0.10  # Fractional ticks/sec drop flagged as a regression
+JUMP_INTERVAL = 45  # Ticks between scripted jumps
+SCROLL_INTERVAL = 480  # Ticks the scroll scenarios run one way before turning back
+
+def scripted_input(tick):
+    """Deterministic input: stand still and jump every JUMP_INTERVAL ticks"""
+    return game.PlayerInput(jump=tick % JUMP_INTERVAL == 0)
+
+def scrolling_input(tick):
+    """Deterministic input: run right then back left every SCROLL_INTERVAL ticks, jumping as in scripted_input"""
+    rightward = (tick // SCROLL_INTERVAL) % 2 == 0
+    return game.PlayerInput(left=not rightward, right=rightward, jump=tick % JUMP_INTERVAL == 0)
+
+def build_stress_world(bees, stingers, platforms, essences, headless, seed=0):
+    """Return a level 1 world filled with the given numbers of extra entities"""
+    rng = random.Random(seed)
+    world = game.World(1, headless=headless, verbose=False, prefetch=False)
+    level_data = world.level_data
+
+    # Bees spread around the player so they stay in attack range and keep firing
+    player_x, player_y = world.player.x, world.player.y
+    for _ in range(bees):
+        x = player_x + rng.uniform(-game.BEE_ATTACK_RANGE, game.BEE_ATTACK_RANGE) * 0.6
+        y = player_y + rng.uniform(-game.BEE_ATTACK_RANGE, game.BEE_ATTACK_RANGE) * 0.6
+        world.hive_guard_bees.add(game.HiveGuardBee(x, y, world.hive_guard_bees.store))
+
+    # Extra platforms scattered above the floor
+    collision_index = level_data['collision_index']
+    for _ in range(platforms):
+        platform = game.Platform(rng.randrange(0, game.SCREEN_WIDTH - 100), rng.randrange(60, game.SCREEN_HEIGHT - 100),
+                                 rng.randrange(40, 160), 20)
+        world.platforms.append(platform)
+        collision_index.insert(platform)
+
+    # Extra essences away from the player so they are not collected at once
+    essence_index = level_data['essence_index']
+    for _ in range(essences):
+        essence = game.DreamEssence(rng.randrange(0, game.SCREEN_WIDTH - 30), rng.randrange(0, game.SCREEN_HEIGHT // 2),
+                                    world.dream_essences.store)
+        world.dream_essences.add(essence)
+        essence_index.insert(essence, essence.float_bounds())
+
+    # The extra platforms change the chunks' static layers
+    world.chunks.invalidate()
+
+    world.stress_stingers = stingers
+    world.stress_rng = rng
+    return world
+
+def top_up_stingers(world):
+    """Keep the stress scene's stingers in flight at their target count"""
+    target = getattr(world, 'stress_stingers', 0)
+    rng = getattr(world, 'stress_rng', None)
+    player = world.player
+    for _ in range(target - len(world.stingers)):
+        world.stingers.spawn(rng.randrange(0, game.SCREEN_WIDTH), rng.randrange(0, game.SCREEN_HEIGHT),
+                             player.x + rng.randrange(-200, 200), player.y + rng.randrange(-200, 200),
+                             game.BEE_PROJECTILE_SPEED)
+
+def run_scenario(world, ticks, screen=None, quality=game.QUALITY_TIERS[0], inputs=scripted_input):
+    """Step (and draw, given a screen, with the given EffectQuality) the world for ticks ticks after a warmup.
+
+    The player is kept alive so the scene stays in a steady state. Returns the
+    tick rate and the FrameProfiler holding the per-phase timings.
+    """
+    profiler = game.FrameProfiler(history=ticks)
+    hud = game.HUD() if screen else None
+    particles = game.ParticleSystem() if screen else None
+
+    elapsed = 0.0
+    for tick in range(WARMUP_TICKS + ticks):
+        if tick == WARMUP_TICKS:
+            world.profiler = profiler
+        prof = world.profiler
+        # Scene upkeep stays outside the measured time
+        top_up_stingers(world)
+        world.player.health = world.player.max_health
+        start = time.perf_counter()
+        if prof:
+            prof.start()
+        pygame.event.pump()
+        if prof:
+            prof.lap("events")
+
+        world.step(inputs(tick))
+
+        if screen:
+            view = world.camera.view()
+            screen.blit(world.chunks.view_layer(view), (0, 0))
+            game.draw_world(screen, world, particles, 1.0, view, quality)
+            if prof:
+                prof.lap("draw_world")
+            hud.draw(screen, world)
+            if prof:
+                prof.lap("draw_hud")
+            pygame.display.flip()
+            if prof:
+                prof.lap("flip")
+        if prof:
+            elapsed += time.perf_counter() - start
+            prof.end_frame({
+                "bees": len(world.hive_guard_bees),
+                "stingers": len(world.stingers),
+                "essences": len(world.dream_essences),
+                "platforms": len(world.platforms),
+            })
+    return ticks / elapsed, profiler, world.chunks.stats()
+
+def run_benchmarks(args):
+    """Run every selected scenario and return {"scenario/mode": result}"""
+    headless = args.sim_only
+    screen = None
+    if not headless:
+        screen = pygame.display.set_mode((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+        game.asset_manager.preload()
+
+    scenarios = []
+    for level_num in range(1, game.MAX_LEVELS + 1):
+        def make_level(level_num=level_num):
+            return game.World(level_num, headless=headless, verbose=False, prefetch=False)
+        scenarios.append((f"level_{level_num}", make_level, scripted_input))
+        width, height = game.create_level_data(level_num)['world_size']
+        if width > game.SCREEN_WIDTH or height > game.SCREEN_HEIGHT:
+            scenarios.append((f"scroll_level_{level_num}", make_level, scrolling_input))
+    stress_name = f"stress_b{args.bees}_s{args.stingers}_p{args.platforms}_e{args.essences}"
+    scenarios.append((stress_name, lambda: build_stress_world(args.bees, args.stingers, args.platforms,
+                                                              args.essences, headless), scripted_input))
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if scenario[0].startswith(args.only)]
+
+    quality = next(tier for tier in game.QUALITY_TIERS if tier.name == args.quality)
+    mode = "sim" if headless else quality.name
+    results = {}
+    for name, make_world, inputs in scenarios:
+        runs = []
+        for _ in range(args.repeat):
+            random.seed(0)
+            # Keep the game's own messages out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                runs.append(run_scenario(make_world(), args.ticks, screen, quality, inputs))
+        ticks_per_sec, profiler, chunk_stats = max(runs, key=lambda run: run[0])
+        summary = profiler.summary()
+        key = f"{name}/{mode}"
+        results[key] = {
+            "ticks_per_sec": ticks_per_sec,
+            "phases_ms": {column: sum(profiler.recent(column)) / args.ticks for column in profiler.COLUMNS},
+            "total_p95_ms": summary["total"]["p95"],
+            "counts": profiler.counts,
+            "chunks": chunk_stats,
+        }
+        print_result(key, results[key])
+    return results
+
+def print_result(name, result):
+    phases = result["phases_ms"]
+    busiest = sorted(game.FrameProfiler.PHASES, key=phases.get, reverse=True)[:3]
+    chunks = result["chunks"]
+    print(f"{name:<36}{result['ticks_per_sec']:10.1f} ticks/s  p95 {result['total_p95_ms']:6.2f} ms  " +
+          "  ".join(f"{phase} {phases[phase]:.3f}" for phase in busiest) +
+          f"  chunks {chunks['active']}/{chunks['chunks']} active, {chunks['misses']} rendered")
+
+def compare(results, baseline, threshold):
+    """Print the change against the baseline and return the regressed scenario names"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<36}no baseline recorded for this mode")
+            continue
+        before = baseline[name]["ticks_per_sec"]
+        change = result["ticks_per_sec"] / before - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36}{before:10.1f} -> {result['ticks_per_sec']:10.1f} ticks/s ({change:+.1%}){flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless platformer benchmarks")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="measured ticks per scenario")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEATS, help="runs per scenario, best is kept")
+    parser.add_argument("--bees", type=int, default=50)
+    parser.add_argument("--stingers", type=int, default=200)
+    parser.add_argument("--platforms", type=int, default=100)
+    parser.add_argument("--essences", type=int, default=100)
+    parser.add_argument("--only", help="run only scenarios whose name starts with this prefix")
+    parser.add_argument("--sim-only", action="store_true", help="step the simulation without drawing")
+    parser.add_argument("--quality", default=game.QUALITY_TIERS[0].name,
+                        choices=[tier.name for tier in game.QUALITY_TIERS], help="effect quality tier to draw with")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to save or compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="fractional ticks/sec drop reported as a regression")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = run_benchmarks(args)
+
+    baseline = None
+    if args.compare or args.save_baseline:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as error:
+            if args.compare:
+                print(f"Warning: could not read baseline {args.baseline}: {error}")
+
+    if args.compare:
+        if baseline is not None:
+            regressions = compare(results, baseline, args.threshold)
+            if regressions:
+                print(f"{len(regressions)} scenario(s) regressed more than {args.threshold:.0%}")
+                sys.exit(1)
+
+    if args.save_baseline:
+        # Keep the other modes' entries so sim-only and drawn baselines can share a file
+        merged = dict(baseline or {})
+        merged.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(merged, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+if __name__ == "__main__":
+    main()
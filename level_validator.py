@@ -0,0 +1,708 @@
+"""Static reachability validator for platformer levels.
+
+Player physics is fixed (GRAVITY, JUMP_STRENGTH, PLAYER_SPEED and a 50x50
+body), so every jump and fall arc has a closed form. For each level the
+validator splits platform and puzzle block tops into walkable segments and
+links them by the jump and fall arcs that land without hitting anything on
+the way. From that graph it reports:
+
+- dream essences and puzzle blocks the player can never reach
+- the minimal route, in ticks, from the spawn point to the puzzle block
+- the worst-case stinger exposure along that route, assuming every bee in
+  range fires as soon as it is ready and every stinger hits
+
+Graphs are cached under LEVEL_CACHE_DIR by the compiled level's hash, and
+level sets are validated in parallel across processes:
+
+    python level_validator.py
+    python level_validator.py generated/ --workers 8 --json report.json
+"""
+import os
+import sys
+import math
+import json
+import heapq
+import hashlib
+import argparse
+import concurrent.futures
+
+# Must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import platformer_game as game
+
+REACHABILITY_VERSION = 1
+REACHABILITY_CACHE_DIR = os.path.join(game.LEVEL_CACHE_DIR, "reach")  # <hash>.json graphs
+PLAYER_SIZE = 50  # Player body width and height
+TAKEOFF_STEP = 25  # Pixels between sampled take-off points along a segment
+MAX_AIR_TICKS = 300  # Longest arc followed before giving up on a landing
+
+# Damage model, matching Player.take_damage and World.step
+STINGER_DAMAGE = 10
+INVULNERABLE_TICKS = 60
+PLAYER_HEALTH = 100
+
+# Horizontal path shapes tried for every arc: evenly spread, move first then drop, rise then move
+PATH_SHAPES = ("linear", "early", "late")
+
+def arc_y(y0, vel0, tick):
+    """Player y after tick ticks in the air, starting at y0 with vertical velocity vel0"""
+    return y0 + vel0 * tick + game.GRAVITY * tick * (tick + 1) / 2
+
+def path_x(x0, x_end, ticks, shape, first=0):
+    """Player x for ticks 1..ticks moving from x0 to x_end, PLAYER_SPEED pixels per moving tick.
+
+    x_end must be a whole number of moves away, except for the "pushed"
+    shape which drops straight down and is side-snapped onto x_end on the
+    last tick. A nonzero first forces the first tick's move, as when
+    walking off a ledge.
+    """
+    xs = []
+    if first:
+        x0 += first
+        xs.append(x0)
+        ticks -= 1
+    moves = abs(x_end - x0) // game.PLAYER_SPEED
+    step = game.PLAYER_SPEED if x_end > x0 else -game.PLAYER_SPEED
+    for tick in range(1, ticks + 1):
+        if shape == "pushed":
+            xs.append(x0 if tick < ticks else x_end)
+            continue
+        if shape == "linear":
+            moved = tick * moves // ticks
+        elif shape == "early":
+            moved = min(tick, moves)
+        else:
+            moved = max(0, tick - (ticks - moves))
+        xs.append(x0 + moved * step)
+    return xs
+
+def first_step(kind):
+    """Forced move on the first tick of an arc: walking off a ledge keeps going the same way"""
+    return {"fall_left": -game.PLAYER_SPEED, "fall_right": game.PLAYER_SPEED}.get(kind, 0)
+
+class Segment:
+    """A stretch of a surface top the player can walk along without being blocked.
+
+    x_min and x_max bound the player's x while standing on it; the open ends
+    are the ones the player can walk off.
+    """
+    def __init__(self, kind, surface, top, x_min, x_max, open_left=False, open_right=False, span=None):
+        self.kind = kind  # "platform", "puzzle" or "ground"
+        self.surface = surface  # Index into the level's collision items, -1 for the ground
+        self.top = top
+        self.x_min = x_min
+        self.x_max = x_max
+        self.span = span or (x_min, x_max)  # x range over the whole surface, blocked parts included
+        self.open_left = open_left
+        self.open_right = open_right
+
+    @property
+    def jumpable(self):
+        # Player.update clears on_ground after the world floor clamp, so only surfaces allow jumping
+        return self.kind != "ground"
+
+    @property
+    def stand_y(self):
+        return self.top - PLAYER_SIZE
+
+    def to_list(self):
+        return [self.kind, self.surface, self.top, self.x_min, self.x_max, self.open_left, self.open_right,
+                list(self.span)]
+
+class Arc:
+    """A move through the air from a take-off point, see ReachabilityGraph.arc_positions"""
+    def __init__(self, kind, source, target, x0, x_end, ticks, shape):
+        self.kind = kind  # "spawn", "jump" or "fall_left"/"fall_right"
+        self.source = source  # Segment index, -1 for the spawn point
+        self.target = target  # Segment index, or essence index for essence arcs
+        self.x0 = x0
+        self.x_end = x_end
+        self.ticks = ticks
+        self.shape = shape
+
+    def to_list(self):
+        return [self.kind, self.source, self.target, self.x0, self.x_end, self.ticks, self.shape]
+
+class ReachabilityGraph:
+    """Walkable segments of a level and the arcs between them"""
+    def __init__(self, level_data):
+        self.level_data = level_data
+        self.world_width, self.world_height = level_data['world_size']
+        self.spawn = level_data['player_start']
+        self.bees = [tuple(bee) for bee in level_data['bees']]
+        self.essences = [tuple(essence) for essence in level_data['dream_essences']]
+
+        # Same item order as the level's collision grid: platforms, then the puzzle block
+        self.items = list(level_data['platforms'])
+        puzzle_pos = level_data['puzzle_pos']
+        self.puzzle = game.PuzzleBlock(*puzzle_pos) if puzzle_pos else None
+        if self.puzzle:
+            self.items.append(self.puzzle)
+        # The compiled collision grid, as (left, top, right, bottom) edges per cell
+        self.cell_size = level_data['collision_cell_size']
+        self.cells = {cell: [(i, self.items[i].rect.left, self.items[i].rect.top,
+                              self.items[i].rect.right, self.items[i].rect.bottom) for i in positions]
+                      for cell, positions in level_data['collision_cells'].items()}
+        self.blocked_cache = {}  # (x, y) -> blocked(x, y); arcs from the same height share positions
+        self.height_cache = {}  # (y0, vel0) -> (y, rounded y) on every tick of the arc
+        self.landing_cache = {}  # (y0, vel0, top) -> ticks an arc can land on a surface at top
+
+        self.segments = []
+        self.arcs = []  # Spawn, jump and fall arcs that land on a segment
+        self.essence_touches = []  # Per essence, [kind, source segment, ...] lists of the ways of touching it
+
+    def build(self):
+        self.find_segments()
+        for target in range(len(self.segments)):
+            arc = self.find_arc("spawn", -1, self.spawn[0], self.spawn[1], 0, target)
+            if arc:
+                self.arcs.append(arc)
+        for source, segment in enumerate(self.segments):
+            for target in range(len(self.segments)):
+                if target == source:
+                    continue
+                for arc in self.segment_arcs(source, segment, target):
+                    self.arcs.append(arc)
+        for essence in range(len(self.essences)):
+            self.essence_touches.append(self.find_essence_touches(essence))
+        return self
+
+    def find_segments(self):
+        """Split every surface top into the spans not blocked by other geometry"""
+        max_x = self.world_width - PLAYER_SIZE
+        surfaces = [(("puzzle" if item is self.puzzle else "platform"), index, item.rect)
+                    for index, item in enumerate(self.items)]
+        for kind, index, rect in surfaces:
+            low, high = max(0, rect.left - PLAYER_SIZE + 1), min(max_x, rect.right - 1)
+            # Geometry in the standing band blocks walking, and so does a surface at the same height:
+            # standing on both, Player.update lands on one and side-snaps off the other
+            blocked = []
+            for other_index, other in enumerate(self.items):
+                other_rect = other.rect
+                if other_index != index and other_rect.top <= rect.top and other_rect.bottom > rect.top - PLAYER_SIZE:
+                    blocked.append((other_rect.left - PLAYER_SIZE + 1, other_rect.right - 1))
+            self.add_spans(kind, index, rect.top, low, high, blocked, low > 0, high < max_x)
+        # The world floor catches everything but cannot be jumped from
+        self.add_spans("ground", -1, self.world_height, 0, max_x,
+                       [(item.rect.left - PLAYER_SIZE + 1, item.rect.right - 1) for item in self.items
+                        if item.rect.bottom > self.world_height - PLAYER_SIZE], False, False)
+
+    def add_spans(self, kind, surface, top, low, high, blocked, open_left, open_right):
+        start = low
+        for block_low, block_high in sorted(blocked):
+            if block_high < start or block_low > high:
+                continue
+            if block_low > start:
+                self.segments.append(Segment(kind, surface, top, start, block_low - 1,
+                                             open_left and start == low, False, (low, high)))
+            start = max(start, block_high + 1)
+        if start <= high:
+            self.segments.append(Segment(kind, surface, top, start, high, open_left and start == low, open_right,
+                                         (low, high)))
+
+    def segment_arcs(self, source, segment, target):
+        """Yield the jump and fall arcs from a segment that land on the target segment"""
+        if segment.jumpable:
+            # Try take-off points nearest the target first
+            goal = self.segments[target]
+            points = set(range(segment.x_min, segment.x_max + 1, TAKEOFF_STEP))
+            points.update((segment.x_max, min(max(goal.x_min, segment.x_min), segment.x_max),
+                           min(max(goal.x_max, segment.x_min), segment.x_max)))
+            for x0 in sorted(points, key=lambda x: (max(goal.x_min - x, x - goal.x_max, 0), x)):
+                arc = self.find_arc("jump", source, x0, segment.stand_y, game.JUMP_STRENGTH, target)
+                if arc:
+                    yield arc
+                    break
+        if segment.open_left:
+            arc = self.find_arc("fall_left", source, segment.x_min, segment.stand_y, 0, target)
+            if arc:
+                yield arc
+        if segment.open_right:
+            arc = self.find_arc("fall_right", source, segment.x_max, segment.stand_y, 0, target)
+            if arc:
+                yield arc
+
+    def reach(self, kind, x0, tick):
+        """Range of player x reachable tick ticks into an arc"""
+        first = first_step(kind)
+        spread = game.PLAYER_SPEED * (tick - 1 if first else tick)
+        return max(0, x0 + first - spread), min(self.world_width - PLAYER_SIZE, x0 + first + spread)
+
+    def heights(self, y0, vel0):
+        """Player (y, rounded y) on every tick of an arc until it drops out of the world"""
+        key = (y0, vel0)
+        heights = self.height_cache.get(key)
+        if heights is None:
+            heights = []
+            for tick in range(1, MAX_AIR_TICKS + 1):
+                y = arc_y(y0, vel0, tick)
+                heights.append((y, game.rect_round(y)))
+                if y > self.world_height:
+                    break
+            self.height_cache[key] = heights
+        return heights
+
+    def landing_ticks(self, y0, vel0, top):
+        """Ticks of an arc on which it lands on a surface at top, given horizontal overlap"""
+        key = (y0, vel0, top)
+        ticks = self.landing_cache.get(key)
+        if ticks is None:
+            ticks = []
+            for tick, (y, rounded_y) in enumerate(self.heights(y0, vel0), 1):
+                if vel0 + game.GRAVITY * tick > 0:
+                    if y >= top:
+                        break
+                    # Player.update lands on any platform overlapped while falling with its top still above
+                    if rounded_y + PLAYER_SIZE > top:
+                        ticks.append(tick)
+            self.landing_cache[key] = ticks
+        return ticks
+
+    def find_arc(self, kind, source, x0, y0, vel0, target):
+        """Return the first Arc from the take-off point landing on the target segment, or None"""
+        goal = self.segments[target]
+        for tick in self.landing_ticks(y0, vel0, goal.top):
+            low, high = self.reach(kind, x0, tick)
+            if kind == "spawn":
+                # A player spawned overlapping geometry can land in a blocked part of the surface
+                low, high = max(low, goal.span[0]), min(high, goal.span[1])
+            else:
+                low, high = max(low, goal.x_min), min(high, goal.x_max)
+            if low > high:
+                continue
+            # A straight drop from the spawn point may land inside geometry, see push_out
+            arc = self.clear_arc(kind, source, target, x0, y0, vel0, tick, low, high, last=tick - 1,
+                                 landing=None if kind == "spawn" else goal.surface)
+            if arc and kind == "spawn":
+                arc = self.push_out(arc, goal)
+            if arc:
+                return arc
+        return None
+
+    def push_out(self, arc, goal):
+        """Move a spawn landing in a blocked part of a surface onto the goal segment, or return None.
+
+        Moving while overlapping a platform side-snaps the player past it, so
+        the landing point reaches the segments on either side of its gap.
+        """
+        x = arc.x_end
+        if goal.x_min <= x <= goal.x_max:
+            return arc
+        if x != arc.x0:
+            return None  # Only a straight drop from the spawn point ends up inside geometry
+        for segment in self.segments:
+            if segment.surface == goal.surface and segment is not goal:
+                if min(x, goal.x_min) <= segment.x_max and segment.x_min <= max(x, goal.x_max):
+                    return None  # Landed on, or the wrong side of, another segment
+        # Moving right snaps to the platform's left side and moving left to its right side
+        return Arc(arc.kind, arc.source, arc.target, arc.x0, min(max(x, goal.x_min), goal.x_max),
+                   arc.ticks + 1, "pushed")
+
+    def clear_arc(self, kind, source, target, x0, y0, vel0, ticks, low, high, last, landing=None):
+        """Return an Arc ending between low and high whose first last ticks hit nothing, or None.
+
+        With landing given, the final tick may only touch that collision item
+        (-1 for the world floor): touching another as well would side-snap the player.
+        """
+        first = first_step(kind)
+        heights = self.heights(y0, vel0)
+        ys = [rounded_y for _, rounded_y in heights[:last]]
+        landing_y = heights[ticks - 1][1]
+        start = x0 + first
+        speed = game.PLAYER_SPEED
+        # Only whole moves from the start are reachable: the nearest one, then the range ends
+        low = start + -((start - low) // speed) * speed
+        high = start + (high - start) // speed * speed
+        if low > high:
+            return None
+        for x_end in dict.fromkeys((min(max(start, low), high), low, high)):
+            for shape in PATH_SHAPES:
+                xs = path_x(x0, x_end, ticks, shape, first)
+                if landing is not None and self.overlaps_geometry(xs[-1], landing_y, landing):
+                    continue
+                if not any(map(self.blocked, xs[:last], ys)):
+                    return Arc(kind, source, target, x0, x_end, ticks, shape)
+        return None
+
+    def blocked(self, x, y):
+        """True when the player body at (x, y) overlaps level geometry or leaves the world"""
+        key = (x, y)
+        result = self.blocked_cache.get(key)
+        if result is None:
+            result = y + PLAYER_SIZE > self.world_height or self.overlaps_geometry(x, y)
+            self.blocked_cache[key] = result
+        return result
+
+    def overlaps_geometry(self, x, y, ignore=None):
+        """True when the player body at (x, y) overlaps any collision item but the one at index ignore"""
+        size = self.cell_size
+        right, bottom = x + PLAYER_SIZE, y + PLAYER_SIZE
+        cells = self.cells
+        for cell_x in range(x // size, (right - 1) // size + 1):
+            for cell_y in range(y // size, (bottom - 1) // size + 1):
+                for index, left, top, item_right, item_bottom in cells.get((cell_x, cell_y), ()):
+                    if x < item_right and left < right and y < item_bottom and top < bottom and index != ignore:
+                        return True
+        return False
+
+    def find_essence_touches(self, essence):
+        """Return every way of touching an essence: standing on a segment, or an arc from one"""
+        x, y = self.essences[essence]
+        # The bobbing animation keeps the essence inside float_bounds
+        width, height = game.DreamEssence.width, game.DreamEssence.height
+        bounds = pygame.Rect(x, y - 12, width, height + 24)
+        low_x, high_x = bounds.left - PLAYER_SIZE + 1, bounds.right - 1
+        touches = []
+        for index, segment in enumerate(self.segments):
+            stand_x = max(low_x, segment.x_min)
+            if (stand_x <= min(high_x, segment.x_max) and segment.stand_y < bounds.bottom and
+                    bounds.top < segment.top):
+                touches.append(["stand", index, essence, stand_x])
+                continue
+            starts = []
+            if segment.jumpable:
+                middle = min(max((low_x + high_x) // 2, segment.x_min), segment.x_max)
+                starts.extend(("jump", x0, game.JUMP_STRENGTH)
+                              for x0 in sorted(set(range(segment.x_min, segment.x_max + 1, TAKEOFF_STEP)) |
+                                               {middle, segment.x_max}, key=lambda x: abs(x - middle)))
+            if segment.open_left:
+                starts.append(("fall_left", segment.x_min, 0))
+            if segment.open_right:
+                starts.append(("fall_right", segment.x_max, 0))
+            for kind, x0, vel0 in starts:
+                arc = self.touch_arc(kind, index, essence, x0, segment.stand_y, vel0, bounds, low_x, high_x)
+                if arc:
+                    touches.append(arc.to_list())
+                    break
+        arc = self.touch_arc("spawn", -1, essence, self.spawn[0], self.spawn[1], 0, bounds, low_x, high_x)
+        if arc:
+            touches.append(arc.to_list())
+        return touches
+
+    def touch_arc(self, kind, source, essence, x0, y0, vel0, bounds, low_x, high_x):
+        """Return the first Arc from the take-off point whose body overlaps bounds, or None"""
+        for tick, (_, y) in enumerate(self.heights(y0, vel0), 1):
+            if y >= bounds.bottom and vel0 + game.GRAVITY * tick > 0 or y + PLAYER_SIZE > self.world_height:
+                break
+            if y + PLAYER_SIZE <= bounds.top:
+                continue
+            low, high = self.reach(kind, x0, tick)
+            low, high = max(low, low_x), min(high, high_x)
+            if low <= high:
+                arc = self.clear_arc(kind, source, essence, x0, y0, vel0, tick, low, high, last=tick)
+                if arc:
+                    return arc
+        return None
+
+    def aligned_arc(self, arc, x):
+        """Return (walk ticks, arc) taking off a whole number of moves from x, or None.
+
+        Walking moves PLAYER_SPEED pixels per tick, so the arc is shifted to
+        the nearest take-off points the player can stop at and re-checked,
+        falling back to a new search from those points.
+        """
+        segment = self.segments[arc.source]
+        speed = game.PLAYER_SPEED
+        moves = (arc.x0 - x) / speed
+        for count in sorted({math.floor(moves), math.ceil(moves)}, key=lambda count: abs(count - moves)):
+            x0 = x + count * speed
+            if segment.x_min <= x0 <= segment.x_max:
+                shifted = self.shift_arc(arc, x0 - arc.x0)
+                if shifted is None:
+                    vel0 = game.JUMP_STRENGTH if arc.kind == "jump" else 0
+                    shifted = self.find_arc(arc.kind, arc.source, x0, segment.stand_y, vel0, arc.target)
+                if shifted:
+                    return abs(count), shifted
+        return None
+
+    def shift_arc(self, arc, dx):
+        """Return the arc moved dx pixels sideways if it still lands on its target, or None"""
+        if dx == 0:
+            return arc
+        shifted = Arc(arc.kind, arc.source, arc.target, arc.x0 + dx, arc.x_end + dx, arc.ticks, arc.shape)
+        goal = self.segments[arc.target]
+        if not goal.x_min <= shifted.x_end <= goal.x_max:
+            return None
+        max_x = self.world_width - PLAYER_SIZE
+        positions = self.arc_positions(shifted)
+        if any(not 0 <= x <= max_x or self.blocked(x, game.rect_round(y)) for x, y in positions[:-1]):
+            return None
+        y0, vel0 = self.arc_start(shifted)
+        if self.overlaps_geometry(shifted.x_end, self.heights(y0, vel0)[shifted.ticks - 1][1], goal.surface):
+            return None
+        return shifted
+
+    def arc_start(self, arc):
+        """(y0, vel0) an arc takes off with"""
+        if arc.source < 0:
+            return self.spawn[1], 0
+        return self.segments[arc.source].stand_y, game.JUMP_STRENGTH if arc.kind == "jump" else 0
+
+    def arc_positions(self, arc):
+        """Player (x, y) on every tick of a landing arc, ending snapped onto the target segment"""
+        y0, vel0 = self.arc_start(arc)
+        xs = path_x(arc.x0, arc.x_end, arc.ticks, arc.shape, first_step(arc.kind))
+        positions = [(x, arc_y(y0, vel0, tick)) for tick, x in enumerate(xs, 1)]
+        positions[-1] = (arc.x_end, self.segments[arc.target].stand_y)
+        return positions
+
+    def to_dict(self):
+        return {
+            'version': REACHABILITY_VERSION,
+            'segments': [segment.to_list() for segment in self.segments],
+            'arcs': [arc.to_list() for arc in self.arcs],
+            'essence_touches': self.essence_touches,
+        }
+
+    @classmethod
+    def from_dict(cls, level_data, data):
+        graph = cls(level_data)
+        graph.segments = [Segment(*segment) for segment in data['segments']]
+        graph.arcs = [Arc(*arc) for arc in data['arcs']]
+        graph.essence_touches = data['essence_touches']
+        return graph
+
+def level_body(level):
+    """Return the compiled body of a level number or a level JSON path"""
+    if isinstance(level, int):
+        return game.load_compiled_level(level)
+    with open(level, "rb") as source_file:
+        return game.compile_level(source_file.read())
+
+def load_graph(level, use_cache=True):
+    """Return the level's ReachabilityGraph, from the cache when its compiled body is unchanged"""
+    body = level_body(level)
+    level_data = game.decode_level(body)
+    digest = hashlib.sha256(body).hexdigest()
+    cache_path = os.path.join(REACHABILITY_CACHE_DIR, f"{digest}.json")
+    if use_cache:
+        try:
+            with open(cache_path) as cache_file:
+                data = json.load(cache_file)
+            if data.get('version') == REACHABILITY_VERSION:
+                return ReachabilityGraph.from_dict(level_data, data)
+        except (OSError, ValueError):
+            pass
+
+    graph = ReachabilityGraph(level_data).build()
+    if use_cache:
+        # Write then rename, other workers may be reading the same graph
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(REACHABILITY_CACHE_DIR, exist_ok=True)
+            with open(temp_path, "w") as cache_file:
+                json.dump(graph.to_dict(), cache_file)
+            os.replace(temp_path, cache_path)
+        except OSError as error:
+            print(f"Warning: could not write reachability cache {cache_path}: {error}")
+    return graph
+
+def find_route(graph):
+    """Return the fewest-tick list of arcs from the spawn point onto the puzzle block, or None.
+
+    Walking between a landing point and the next take-off point costs one
+    tick per PLAYER_SPEED pixels; the returned arcs are aligned to the
+    points the player can actually walk to.
+    """
+    outgoing = {}
+    for arc in graph.arcs:
+        outgoing.setdefault(arc.source, []).append(arc)
+    # States are (segment, x) landing points; the spawn point is segment -1
+    start = (-1, graph.spawn[0])
+    best = {start: 0}
+    previous = {}
+    queue = [(0, start)]
+    while queue:
+        ticks, state = heapq.heappop(queue)
+        if ticks > best[state]:
+            continue
+        segment, x = state
+        if segment >= 0 and graph.segments[segment].kind == "puzzle":
+            route = []
+            while state in previous:
+                state, arc = previous[state]
+                route.append(arc)
+            return route[::-1]
+        for arc in outgoing.get(segment, ()):
+            walk = 0
+            if segment >= 0:
+                aligned = graph.aligned_arc(arc, x)
+                if aligned is None:
+                    continue
+                walk, arc = aligned
+            next_state = (arc.target, arc.x_end)
+            next_ticks = ticks + walk + arc.ticks
+            if next_ticks < best.get(next_state, math.inf):
+                best[next_state] = next_ticks
+                previous[next_state] = (state, arc)
+                heapq.heappush(queue, (next_ticks, next_state))
+    return None
+
+def route_positions(graph, route):
+    """Player (x, y) on every tick of a route, walking between arcs"""
+    positions = []
+    x = graph.spawn[0]
+    for arc in route:
+        if arc.source >= 0:
+            y = graph.segments[arc.source].stand_y
+            step = game.PLAYER_SPEED if arc.x0 > x else -game.PLAYER_SPEED
+            while x != arc.x0:
+                x += step
+                positions.append((x, y))
+        positions.extend(graph.arc_positions(arc))
+        x = arc.x_end
+    return positions
+
+def stinger_exposure(graph, positions):
+    """Worst-case stinger fire along a path, with every ready bee in range firing and hitting.
+
+    Returns (ticks in range of a bee, stingers fired, most bees in range at once, damage).
+    """
+    range_sq = game.BEE_ATTACK_RANGE * game.BEE_ATTACK_RANGE
+    half_bee_w, half_bee_h = game.HiveGuardBee.width // 2, game.HiveGuardBee.height // 2
+    bee_centers = [(x + half_bee_w, y + half_bee_h) for x, y in graph.bees]
+    ready = [0] * len(bee_centers)
+    exposed_ticks = fired = most = damage = 0
+    invulnerable = 0
+    for tick, (x, y) in enumerate(positions):
+        center_x, center_y = x + PLAYER_SIZE // 2, game.rect_round(y) + PLAYER_SIZE // 2
+        in_range = 0
+        hit = False
+        for bee, (bee_x, bee_y) in enumerate(bee_centers):
+            if (center_x - bee_x) ** 2 + (center_y - bee_y) ** 2 <= range_sq:
+                in_range += 1
+                if ready[bee] <= tick:
+                    ready[bee] = tick + game.HiveGuardBee.max_fire_cooldown
+                    fired += 1
+                    hit = True
+        if invulnerable > 0:
+            invulnerable -= 1
+        if hit and invulnerable <= 0:
+            damage += STINGER_DAMAGE
+            invulnerable = INVULNERABLE_TICKS
+        exposed_ticks += in_range > 0
+        most = max(most, in_range)
+    return exposed_ticks, fired, most, damage
+
+def reachable_segments(graph):
+    """Return the segment indices reachable from the spawn point"""
+    outgoing = {}
+    for arc in graph.arcs:
+        outgoing.setdefault(arc.source, set()).add(arc.target)
+    seen = set()
+    pending = [-1]
+    while pending:
+        for target in outgoing.get(pending.pop(), ()):
+            if target not in seen:
+                seen.add(target)
+                pending.append(target)
+    return seen
+
+def validate_level(level, use_cache=True):
+    """Build (or load) a level's reachability graph and return its report dict"""
+    graph = load_graph(level, use_cache)
+    reachable = reachable_segments(graph) | {-1}
+    problems = []
+
+    unreachable_essences = [list(graph.essences[index]) for index, touches in enumerate(graph.essence_touches)
+                            if not any(touch[1] in reachable for touch in touches)]
+    for x, y in unreachable_essences:
+        problems.append(f"dream essence at ({x}, {y}) is unreachable")
+
+    report = {
+        'level': level,
+        'name': graph.level_data['level_name'],
+        'segments': len(graph.segments),
+        'arcs': len(graph.arcs),
+        'reachable_segments': len(reachable) - 1,
+        'essences': len(graph.essences),
+        'unreachable_essences': unreachable_essences,
+        'puzzle_reachable': None,
+        'route': None,
+    }
+    if graph.puzzle is None:
+        problems.append("level has no puzzle block")
+    else:
+        route = find_route(graph)
+        report['puzzle_reachable'] = route is not None
+        if route is None:
+            problems.append("puzzle block is unreachable")
+        else:
+            positions = route_positions(graph, route)
+            exposed_ticks, fired, most, damage = stinger_exposure(graph, positions)
+            report['route'] = {
+                'ticks': len(positions),
+                'steps': [[arc.kind, arc.target, arc.x_end] for arc in route],
+                'exposed_ticks': exposed_ticks,
+                'stingers': fired,
+                'max_bees_in_range': most,
+                'worst_case_damage': damage,
+            }
+            if damage >= PLAYER_HEALTH:
+                problems.append(f"minimal route can take {damage} stinger damage")
+    report['problems'] = problems
+    return report
+
+def level_paths(targets):
+    """Expand level numbers, JSON files and directories of JSON files into level specs"""
+    levels = []
+    for target in targets:
+        if target.isdigit():
+            levels.append(int(target))
+        elif os.path.isdir(target):
+            levels.extend(os.path.join(target, name) for name in sorted(os.listdir(target)) if name.endswith(".json"))
+        else:
+            levels.append(target)
+    return levels
+
+def validate_levels(levels, workers=None, use_cache=True):
+    """Validate many levels across worker processes, yielding reports in order"""
+    if workers == 1 or len(levels) <= 1:
+        for level in levels:
+            yield validate_level(level, use_cache)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(levels) // ((workers or os.cpu_count() or 1) * 4))
+        yield from executor.map(validate_level, levels, [use_cache] * len(levels), chunksize=chunksize)
+
+def format_report(report):
+    """Return a level report as indented text lines"""
+    lines = [f"{report['level']}: {report['name']} - {report['reachable_segments']}/{report['segments']} "
+             f"segments reachable, {report['essences'] - len(report['unreachable_essences'])}/"
+             f"{report['essences']} essences reachable"]
+    route = report['route']
+    if route:
+        lines.append(f"  route: {route['ticks']} ticks, {len(route['steps'])} moves, "
+                     f"{route['exposed_ticks']} ticks in bee range, {route['stingers']} stingers, "
+                     f"up to {route['worst_case_damage']} damage")
+    lines.extend(f"  PROBLEM: {problem}" for problem in report['problems'])
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check level reachability from the player physics")
+    parser.add_argument("levels", nargs="*", help="level numbers, level JSON files or directories (default: all levels)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild every reachability graph")
+    parser.add_argument("--json", metavar="PATH", help="also write the reports to a JSON file")
+    parser.add_argument("--quiet", action="store_true", help="only print levels with problems")
+    args = parser.parse_args()
+
+    levels = level_paths(args.levels) if args.levels else list(range(1, game.MAX_LEVELS + 1))
+    reports = []
+    for report in validate_levels(levels, args.workers, not args.no_cache):
+        reports.append(report)
+        if report['problems'] or not args.quiet:
+            print(format_report(report))
+
+    failed = sum(1 for report in reports if report['problems'])
+    print(f"{len(reports)} levels checked, {failed} with problems")
+    if args.json:
+        with open(args.json, "w") as report_file:
+            json.dump(reports, report_file, indent=2)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
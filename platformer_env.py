@@ -0,0 +1,357 @@
+"""Gym-style training environments for the platformer.
+
+PlatformerEnv runs one level headless and is stepped with discrete actions,
+the INPUT_* bits of platformer_game (0-7). Observations are either a
+compact float32 state vector or the rendered RGB frame:
+
+    env = PlatformerEnv(level_num=1)
+    observation, info = env.reset(seed=0)
+    observation, reward, terminated, truncated, info = env.step(INPUT_RIGHT | INPUT_JUMP)
+
+VectorPlatformerEnv steps many instances across worker processes. Workers
+write observations, rewards and done flags straight into shared memory, so
+only the actions and small info dicts cross the pipes:
+
+    envs = VectorPlatformerEnv(64, num_workers=8)
+    observations, infos = envs.reset(seed=0)
+    observations, rewards, terminated, truncated, infos = envs.step(actions)
+"""
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+
+# Must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import platformer_game as game
+
+NUM_ACTIONS = 8  # Every combination of INPUT_LEFT, INPUT_RIGHT and INPUT_JUMP
+DEFAULT_MAX_STEPS = 3600  # Steps before an episode is truncated, a minute of game time
+DEFAULT_FRAME_SIZE = (84, 63)  # Pixel observation size, the screen scaled down by 1/9.5
+
+# Rewards
+ESSENCE_REWARD = 1.0
+DAMAGE_PENALTY = 0.1  # Per health point lost
+LEVEL_COMPLETE_REWARD = 10.0
+GAME_OVER_PENALTY = 10.0
+
+# State vector layout: the player, the puzzle block, then the nearest entities of each kind
+OBS_ESSENCES = 4  # Nearest dream essences, (dx, dy, present) each
+OBS_BEES = 4  # Nearest bees, (dx, dy, ready to fire, present) each
+OBS_STINGERS = 8  # Nearest stingers, (dx, dy, vel_x, vel_y, present) each
+PLAYER_FEATURES = 7
+PUZZLE_FEATURES = 4
+STATE_SIZE = PLAYER_FEATURES + PUZZLE_FEATURES + 3 * OBS_ESSENCES + 4 * OBS_BEES + 5 * OBS_STINGERS
+
+def nearest(entries, origin_x, origin_y, count):
+    """Return the count entries whose first two values lie closest to the origin, nearest first"""
+    if len(entries) <= 1:
+        return entries
+    return sorted(entries, key=lambda entry: (entry[0] - origin_x) ** 2 + (entry[1] - origin_y) ** 2)[:count]
+
+class PlatformerEnv:
+    """One level of the game behind a reset()/step(action) interface.
+
+    The world is created through World (and so create_game_objects) without
+    a display; pixel observations draw it into an offscreen surface and read
+    it through pygame.surfarray. An episode ends when the puzzle is solved
+    or the player dies, and is truncated after max_steps steps.
+    """
+    def __init__(self, level_num=1, observation="state", max_steps=DEFAULT_MAX_STEPS, action_repeat=1,
+                 frame_size=DEFAULT_FRAME_SIZE, projectile_engine=False):
+        if observation not in ("state", "pixels"):
+            raise ValueError(f"Unknown observation type {observation!r}, expected 'state' or 'pixels'")
+        self.level_num = level_num
+        self.observation = observation
+        self.max_steps = max_steps
+        self.action_repeat = action_repeat
+        self.frame_size = frame_size
+        self.projectile_engine = projectile_engine
+        self.world = None
+        self.steps = 0
+        self.inputs = [game.PlayerInput.from_bits(action) for action in range(NUM_ACTIONS)]
+
+        if observation == "pixels":
+            self.observation_shape = (frame_size[1], frame_size[0], 3)
+            self.canvas = pygame.Surface((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+            self.frame = pygame.Surface(frame_size)
+            self.particles = None  # Seeded from each episode's world in reset()
+        else:
+            self.observation_shape = (STATE_SIZE,)
+        self.observation_dtype = np.uint8 if observation == "pixels" else np.float32
+
+    def reset(self, seed=None):
+        """Start a new episode, returning (observation, info)"""
+        self.world = game.World(self.level_num, headless=self.observation == "state", verbose=False,
+                                projectile_engine=self.projectile_engine, prefetch=False, seed=seed)
+        if self.observation == "pixels":
+            # A fresh, seeded renderer so the same seed gives the same frames
+            self.particles = game.ParticleSystem(self.world.seed)
+        self.steps = 0
+        return self.observe(), self.info()
+
+    def step(self, action, out=None):
+        """Apply an action for action_repeat ticks.
+
+        Returns (observation, reward, terminated, truncated, info); the
+        observation is written into out when it is given.
+        """
+        world = self.world
+        player = world.player
+        essences = world.dream_essence_count
+        health = player.health
+        player_input = self.inputs[action]
+        for _ in range(self.action_repeat):
+            world.step(player_input)
+            if not world.running or world.level_complete_timer:
+                break
+        self.steps += 1
+
+        completed = world.level_complete_timer > 0
+        reward = (ESSENCE_REWARD * (world.dream_essence_count - essences) -
+                  DAMAGE_PENALTY * (health - player.health))
+        if completed:
+            reward += LEVEL_COMPLETE_REWARD
+        if world.game_over:
+            reward -= GAME_OVER_PENALTY
+        terminated = completed or not world.running
+        truncated = not terminated and self.steps >= self.max_steps
+        return self.observe(out), reward, terminated, truncated, self.info()
+
+    def info(self):
+        world = self.world
+        return {"steps": self.steps, "health": world.player.health, "essences": world.dream_essence_count,
+                "level_complete": world.level_complete_timer > 0}
+
+    def observe(self, out=None):
+        """Return the current observation, writing it into out when given"""
+        if out is None:
+            out = np.empty(self.observation_shape, self.observation_dtype)
+        if self.observation == "pixels":
+            self.render_frame(out)
+        else:
+            self.state_vector(out)
+        return out
+
+    def render_frame(self, out):
+        """Draw the world into the offscreen canvas and copy the scaled RGB frame into out"""
+        world = self.world
+        view = world.camera.view()
+        self.canvas.blit(world.chunks.view_layer(view), (0, 0))
+        game.draw_world(self.canvas, world, self.particles, 1.0, view)
+        pygame.transform.scale(self.canvas, self.frame_size, self.frame)
+        # pixels3d is a view of the surface's memory, indexed [x][y]
+        pixels = pygame.surfarray.pixels3d(self.frame)
+        out[...] = pixels.transpose(1, 0, 2)
+        del pixels  # Unlock the surface
+
+    def state_vector(self, out):
+        """Fill out with the state features, positions relative to the player and scaled by the screen size"""
+        world = self.world
+        player = world.player
+        width, height = game.SCREEN_WIDTH, game.SCREEN_HEIGHT
+        world_width, world_height = world.level_data['world_size']
+        center_x, center_y = player.rect.center
+        out[:] = 0
+
+        out[0:PLAYER_FEATURES] = (player.x / world_width, player.y / world_height,
+                                  player.vel_x / game.PLAYER_SPEED, player.vel_y / abs(game.JUMP_STRENGTH),
+                                  player.on_ground, player.health / player.max_health,
+                                  player.invulnerable_time > 0)
+        index = PLAYER_FEATURES
+
+        puzzle_block = world.puzzle_block
+        if puzzle_block:
+            out[index:index + PUZZLE_FEATURES] = ((puzzle_block.rect.centerx - center_x) / width,
+                                                  (puzzle_block.rect.centery - center_y) / height,
+                                                  puzzle_block.activated, 1)
+        index += PUZZLE_FEATURES
+
+        essences = [essence.rect.center for essence in world.dream_essences]
+        for x, y in nearest(essences, center_x, center_y, OBS_ESSENCES):
+            out[index:index + 3] = ((x - center_x) / width, (y - center_y) / height, 1)
+            index += 3
+        index = PLAYER_FEATURES + PUZZLE_FEATURES + 3 * OBS_ESSENCES
+
+        bees = world.hive_guard_bees
+        store = bees.store
+        bee_entries = [(store.x[bee.slot] + bee.width // 2, store.y[bee.slot] + bee.height // 2,
+                        store.ready_tick[bee.slot] <= bees.tick) for bee in bees]
+        for x, y, ready in nearest(bee_entries, center_x, center_y, OBS_BEES):
+            out[index:index + 4] = ((x - center_x) / width, (y - center_y) / height, ready, 1)
+            index += 4
+        index = PLAYER_FEATURES + PUZZLE_FEATURES + 3 * OBS_ESSENCES + 4 * OBS_BEES
+
+        stingers = world.stingers.kinematics()
+        for x, y, vel_x, vel_y in nearest(stingers, center_x, center_y, OBS_STINGERS):
+            out[index:index + 5] = ((x - center_x) / width, (y - center_y) / height,
+                                    vel_x / game.BEE_PROJECTILE_SPEED, vel_y / game.BEE_PROJECTILE_SPEED, 1)
+            index += 5
+        return out
+
+    def render(self):
+        """Return the full-size RGB frame of the current state as a (height, width, 3) array"""
+        world = self.world
+        if self.observation != "pixels":
+            raise ValueError("render() needs an environment created with observation='pixels'")
+        view = world.camera.view()
+        self.canvas.blit(world.chunks.view_layer(view), (0, 0))
+        game.draw_world(self.canvas, world, self.particles, 1.0, view)
+        return pygame.surfarray.array3d(self.canvas).transpose(1, 0, 2)
+
+def attach_shared_memory(name):
+    """Attach to a shared memory block owned by another process"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching always registers the block, but spawned workers share
+        # the parent's resource tracker, so the registration is the parent's own
+        return shared_memory.SharedMemory(name=name)
+
+class SharedBuffers:
+    """Observation, reward and done arrays for every instance in one shared memory block"""
+    def __init__(self, num_envs, observation_shape, observation_dtype, name=None):
+        self.layout = [
+            ("observations", (num_envs, *observation_shape), np.dtype(observation_dtype)),
+            ("rewards", (num_envs,), np.dtype(np.float32)),
+            ("terminated", (num_envs,), np.dtype(np.bool_)),
+            ("truncated", (num_envs,), np.dtype(np.bool_)),
+        ]
+        size = sum(int(np.prod(shape)) * dtype.itemsize for _, shape, dtype in self.layout)
+        if name is None:
+            self.block = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.block = attach_shared_memory(name)
+        offset = 0
+        for field, shape, dtype in self.layout:
+            array = np.ndarray(shape, dtype, buffer=self.block.buf, offset=offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+
+    def close(self):
+        # The arrays must go before the buffer they view can be released
+        for field, _, _ in self.layout:
+            setattr(self, field, None)
+        self.block.close()
+
+def env_worker(connection, shm_name, num_envs, start, stop, env_kwargs):
+    """Run environments start..stop-1 of a VectorPlatformerEnv, serving commands from connection"""
+    envs = [PlatformerEnv(**env_kwargs) for _ in range(start, stop)]
+    buffers = SharedBuffers(num_envs, envs[0].observation_shape, envs[0].observation_dtype, shm_name)
+    try:
+        while True:
+            command, payload = connection.recv()
+            if command == "reset":
+                infos = []
+                for i, (env, seed) in enumerate(zip(envs, payload), start):
+                    env.reset(seed)
+                    env.observe(buffers.observations[i])
+                    infos.append(env.info())
+                connection.send(infos)
+            elif command == "step":
+                infos = []
+                for i, (env, action) in enumerate(zip(envs, payload), start):
+                    _, reward, terminated, truncated, info = env.step(action, buffers.observations[i])
+                    if terminated or truncated:
+                        # Start the next episode; the final observation is reported in the info
+                        info["final_observation"] = buffers.observations[i].copy()
+                        env.reset()
+                        env.observe(buffers.observations[i])
+                    buffers.rewards[i] = reward
+                    buffers.terminated[i] = terminated
+                    buffers.truncated[i] = truncated
+                    infos.append(info)
+                connection.send(infos)
+            elif command == "close":
+                break
+    finally:
+        buffers.close()
+        connection.close()
+
+class VectorPlatformerEnv:
+    """Steps num_envs PlatformerEnvs split across num_workers processes.
+
+    Finished episodes are reset automatically, with the last observation of
+    the episode in info["final_observation"]. The returned observation,
+    reward and done arrays are views of the shared memory and are
+    overwritten by the next step; copy them to keep them.
+    """
+    def __init__(self, num_envs, num_workers=None, **env_kwargs):
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, num_envs))
+        self.num_envs = num_envs
+
+        # Shapes come from a throwaway instance, which needs no world
+        probe = PlatformerEnv(**env_kwargs)
+        self.observation_shape = probe.observation_shape
+        self.buffers = SharedBuffers(num_envs, probe.observation_shape, probe.observation_dtype)
+
+        # Spread the instances as evenly as possible
+        context = multiprocessing.get_context("spawn")
+        self.connections = []
+        self.processes = []
+        self.slices = []
+        for worker in range(num_workers):
+            start = worker * num_envs // num_workers
+            stop = (worker + 1) * num_envs // num_workers
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(target=env_worker, daemon=True,
+                                      args=(child_connection, self.buffers.block.name, num_envs, start, stop,
+                                            env_kwargs))
+            process.start()
+            child_connection.close()
+            self.connections.append(parent_connection)
+            self.processes.append(process)
+            self.slices.append((start, stop))
+        self.closed = False
+
+    def gather(self):
+        """Collect every worker's infos in instance order"""
+        infos = []
+        for connection in self.connections:
+            infos.extend(connection.recv())
+        return infos
+
+    def reset(self, seed=None):
+        """Reset every instance; instance i is seeded with seed + i when a seed is given"""
+        for connection, (start, stop) in zip(self.connections, self.slices):
+            seeds = [None if seed is None else seed + i for i in range(start, stop)]
+            connection.send(("reset", seeds))
+        return self.buffers.observations, self.gather()
+
+    def step(self, actions):
+        """Step every instance with its action; returns (observations, rewards, terminated, truncated, infos)"""
+        actions = [int(action) for action in actions]
+        for connection, (start, stop) in zip(self.connections, self.slices):
+            connection.send(("step", actions[start:stop]))
+        infos = self.gather()
+        buffers = self.buffers
+        return buffers.observations, buffers.rewards, buffers.terminated, buffers.truncated, infos
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self.connections:
+            connection.close()
+        self.buffers.close()
+        self.buffers.block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -5,6 +5,19 @@ import time
 import os
 import random
 import colorsys
+import array
+import json
+import struct
+import hashlib
+import heapq
+import zlib
+import threading
+import concurrent.futures
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the ProjectileEngine needs it
+    np = None
 
 # Initialize Pygame
 pygame.init()
@@ -20,11 +33,63 @@ PLAYER_SPEED = 5
 BEE_ATTACK_RANGE = 300
 BEE_PROJECTILE_SPEED = 5
 BEE_FIRE_COOLDOWN = 100  # frames (about 1.5 seconds at 60 FPS)
+BEE_AI_MAX_SLEEP = 30  # Max ticks between range checks of an out-of-range bee, 1 checks every tick
+BEE_ANIMATION_LOD_DISTANCE = 2 * BEE_ATTACK_RANGE  # Bees further away animate at a reduced rate
+BEE_ANIMATION_LOD_INTERVAL = 4  # Ticks between animation frames of distant bees
 
-# Level constants
-MAX_LEVELS = 5
+# Level constants (MAX_LEVELS is counted from the level files, see count_levels)
+# Levels ship next to this module, so they are found whatever the working directory
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")  # level_<n>.json sources
+LEVEL_CACHE_DIR = os.path.join(LEVELS_DIR, ".cache")  # Compiled level_<n>.bin files
+DEFAULT_BACKGROUND = "assets/pRSfmIss.jpeg"
 LEVEL_COMPLETE_DELAY = 180  # 3 seconds at 60 FPS
 
+# Timing constants
+SIMULATION_HZ = 60  # Fixed simulation rate; the per-frame physics constants above are per tick
+SIMULATION_DT = 1.0 / SIMULATION_HZ
+MAX_CATCH_UP_STEPS = 5  # Max simulation ticks per rendered frame before dropping time
+MAX_RENDER_FPS = 240  # Render rate cap, 0 renders as fast as possible
+
+# Animation constants
+PLAYER_ANIMATION_PHASES = 32  # Pre-rendered phases per jump/idle animation cycle
+STINGER_ANGLE_STEP = 10  # degrees between atlas frames, matches spin rate per frame
+STINGER_PULSE_PHASES = 16  # Pre-rendered phases per stinger pulse cycle
+ESSENCE_HUE_STEPS = 72  # Pre-rendered hues per color cycle, 5 degrees is the per-frame hue shift
+ESSENCE_PULSE_PHASES = 32  # Pre-rendered phases per essence pulse cycle
+
+# Pooling constants
+STINGER_POOL_CAPACITY = 256  # Max idle Stinger instances kept for reuse
+
+# Collision constants
+SPATIAL_HASH_CELL_SIZE = 64  # pixels per broadphase grid cell
+
+# World streaming constants
+CHUNK_SIZE = 400  # World pixels per side of a square level chunk
+CHUNK_LOAD_MARGIN = 200  # Pixels around the view whose chunks stay loaded and updated
+CHUNK_CACHE_CAPACITY = 16  # Max rendered chunk static layers kept, least recently used are evicted
+
+# Frame profiler
+PROFILER_HISTORY = 600  # Frames kept per phase for the rolling percentiles, 10 seconds at 60 FPS
+PROFILER_OVERLAY_REFRESH = 30  # Frames between profiler overlay rebuilds
+PROFILER_EXPORT_PATH = "frame_profile.csv"  # Default export file, .json exports JSON instead
+
+# Effects quality governor (tiers are listed in QUALITY_TIERS)
+QUALITY_FRAME_BUDGET = 1.0 / 60  # Seconds of work per frame that hold 60 FPS
+QUALITY_DOWNGRADE_FRAMES = 30  # Frames averaged over budget before dropping a tier
+QUALITY_UPGRADE_FRAMES = 180  # Frames averaged with headroom before restoring a tier
+QUALITY_UPGRADE_HEADROOM = 0.6  # Share of the budget the upgrade average must stay under
+
+# Snapshots
+SNAPSHOT_HISTORY = 600  # Ticks kept for rewinding, 10 seconds at 60 FPS
+QUICKSAVE_PATH = "quicksave.sav"  # F5 saves the world here, F9 loads it
+
+# Per-tick input bits, shared by PlayerInput and recorded sessions
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+COMMAND_RESTART = 8  # Restart the current level before the tick
+COMMAND_NEW_GAME = 16  # Start a new game before the tick
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -39,17 +104,243 @@ ORANGE = (255, 165, 0)
 PURPLE = (128, 0, 128)
 CYAN = (0, 255, 255)
 
+# Images loaded by the game, preloaded once per process: (path, size, alpha)
+ASSET_MANIFEST = [
+    ("assets/player.png", (50, 50), True),
+    ("assets/stinger.png", (20, 8), True),
+    ("assets/bee.png", (40, 40), True),
+    ("assets/dreamessence.png", (30, 30), True),
+    (DEFAULT_BACKGROUND, (SCREEN_WIDTH, SCREEN_HEIGHT), False),
+]
+
+class AssetManager:
+    """Process-wide registry of decoded and display-converted images.
+    
+    Every image is decoded and converted once, keyed by path, target size and
+    alpha mode. The returned surfaces are shared, so callers must treat them as
+    read-only and copy before drawing on them.
+    """
+    def __init__(self):
+        self.surfaces = {}
+        self.missing = set()  # Paths that failed to load, so fallbacks skip the disk
+        self.stats = {}  # key -> (load time in ms, bytes)
+        self.fonts = {}
+    
+    def get_image(self, path, size=None, alpha=True):
+        """Return the shared surface for path scaled to size, raising pygame.error if missing"""
+        key = (path, size, alpha)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            return surface
+        if path in self.missing:
+            raise pygame.error(f"Unable to load {path}")
+        
+        start = time.perf_counter()
+        try:
+            surface = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError):
+            self.missing.add(path)
+            raise pygame.error(f"Unable to load {path}")
+        # Without a display (headless simulation) surfaces are kept unconverted
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        load_ms = (time.perf_counter() - start) * 1000
+        
+        self.surfaces[key] = surface
+        self.stats[key] = (load_ms, surface.get_width() * surface.get_height() * surface.get_bytesize())
+        return surface
+    
+    def get_font(self, size):
+        """Return the shared default font at the given size"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+    
+    def preload(self, manifest=ASSET_MANIFEST):
+        """Decode every image in the manifest up front, skipping missing files"""
+        for path, size, alpha in manifest:
+            try:
+                self.get_image(path, size, alpha)
+            except pygame.error:
+                pass
+    
+    def report(self):
+        """Return one line per loaded asset with its load time and memory use"""
+        lines = []
+        for (path, size, alpha), (load_ms, num_bytes) in self.stats.items():
+            width, height = self.surfaces[(path, size, alpha)].get_size()
+            lines.append(f"{path} ({width}x{height}): {load_ms:.2f} ms, {num_bytes / 1024:.1f} KB")
+        total_bytes = sum(num_bytes for _, num_bytes in self.stats.values())
+        lines.append(f"Total: {len(self.stats)} assets, {total_bytes / 1024:.1f} KB")
+        return lines
+
+# Shared asset registry used by all game objects
+asset_manager = AssetManager()
+
+class ParticleSystem:
+    """Batched one-frame particles for stinger trails and essence sparkles.
+    
+    Particles are queued into compact arrays while the frame is built and
+    drawn together with a single Surface.blits call. Every dot sprite is
+    pre-rendered, so a particle costs an array append and its share of the blit.
+    Sparkles are placed from the seed (the world's, see World.seed), so the
+    same seed draws the same sparkles.
+    """
+    TRAIL_LENGTH = 8  # Positions kept per stinger trail
+    SPARKLE_COLOR = (255, 255, 255, 150)
+    
+    # Shared dot sprites and their radii, indexed by sprite id
+    dot_sprites = None
+    dot_radii = None
+    trail_sprite_ids = None  # (trail length, index in trail) -> sprite id
+    sparkle_sprite_ids = None  # sparkle size -> sprite id
+    
+    def __init__(self, seed=None):
+        if ParticleSystem.dot_sprites is None:
+            ParticleSystem.build_dot_sprites()
+        self.sprite_ids = array.array('H')
+        self.xs = array.array('d')  # Top-left corner of each dot
+        self.ys = array.array('d')
+        self.drawn_count = 0  # Particles drawn by the last draw call
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.bursts = {}  # key -> (tick, sparkles) of the bursts drawn last frame
+        self.next_bursts = {}  # The same for this frame
+    
+    @classmethod
+    def build_dot_sprites(cls):
+        """Pre-render every dot the trail and sparkle effects can draw"""
+        sprites = {}
+        
+        def dot_sprite(color, size):
+            if (color, size) not in sprites:
+                dot = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.draw.circle(dot, color, (size, size), size)
+                sprites[(color, size)] = len(sprites), dot
+            return sprites[(color, size)][0]
+        
+        # Stinger trails fade in from the oldest position
+        trail_sprite_ids = {}
+        for trail_len in range(1, cls.TRAIL_LENGTH + 1):
+            for i in range(trail_len - 1):  # Don't draw trail at current position
+                trail_alpha = int(255 * (i / trail_len) * 0.5)
+                trail_size = max(1, int(3 * (i / trail_len)))
+                trail_sprite_ids[(trail_len, i)] = dot_sprite((*YELLOW, trail_alpha), trail_size)
+        
+        sparkle_sprite_ids = {size: dot_sprite(cls.SPARKLE_COLOR, size) for size in range(1, 4)}
+        
+        ordered = sorted(sprites.items(), key=lambda item: item[1][0])
+        cls.dot_sprites = [dot for _, (_, dot) in ordered]
+        cls.dot_radii = [size for (_, size), _ in ordered]
+        cls.trail_sprite_ids = trail_sprite_ids
+        cls.sparkle_sprite_ids = sparkle_sprite_ids
+    
+    def __len__(self):
+        return len(self.sprite_ids)
+    
+    def emit(self, sprite_id, x, y):
+        """Queue one dot centered on (x, y)"""
+        radius = self.dot_radii[sprite_id]
+        self.sprite_ids.append(sprite_id)
+        self.xs.append(x - radius)
+        self.ys.append(y - radius)
+    
+    def emit_many(self, sprite_id, xs, ys):
+        """Queue many dots of the same sprite centered on the given coordinates"""
+        radius = self.dot_radii[sprite_id]
+        self.sprite_ids.extend([sprite_id] * len(xs))
+        self.xs.extend([x - radius for x in xs])
+        self.ys.extend([y - radius for y in ys])
+    
+    def emit_trail(self, trail_positions):
+        """Queue the fading trail behind one stinger, oldest position first"""
+        trail_len = len(trail_positions)
+        trail_sprite_ids = self.trail_sprite_ids
+        for i in range(trail_len - 1):
+            x, y = trail_positions[i]
+            self.emit(trail_sprite_ids[(trail_len, i)], x, y)
+    
+    def emit_sparkle(self, x, y, size):
+        self.emit(self.sparkle_sprite_ids[size], x, y)
+    
+    def emit_sparkle_burst(self, key, tick, center_x, center_y):
+        """Queue a burst of three sparkles around a center.
+        
+        key is a small integer naming the emitter. The burst is placed from the
+        seed, key and tick alone, so every frame drawn during the tick shows the
+        same sparkles and a replay draws them where the live session did,
+        whichever frames either of them skipped.
+        """
+        burst = self.bursts.get(key)
+        if burst is None or burst[0] != tick:
+            rng = random.Random((self.seed * 1000003 + key) * 1000003 + tick)
+            burst = (tick, [(center_x + rng.randint(-25, 25), center_y + rng.randint(-25, 25), rng.randint(1, 3))
+                            for _ in range(3)])
+        self.next_bursts[key] = burst
+        for x, y, size in burst[1]:
+            self.emit_sparkle(x, y, size)
+    
+    def draw(self, screen, offset=(0, 0)):
+        """Draw every queued particle shifted by offset with one blits call and clear the queue"""
+        if self.sprite_ids:
+            sprites = self.dot_sprites
+            offset_x, offset_y = offset
+            screen.blits([(sprites[sprite_id], (x + offset_x, y + offset_y))
+                          for sprite_id, x, y in zip(self.sprite_ids, self.xs, self.ys)], doreturn=False)
+        self.drawn_count = len(self.sprite_ids)
+        del self.sprite_ids[:]
+        del self.xs[:]
+        del self.ys[:]
+        # Only bursts still being drawn are kept
+        self.bursts = self.next_bursts
+        self.next_bursts = {}
+
+class PlayerInput:
+    """Buttons held by the player during one simulation tick"""
+    __slots__ = ('left', 'right', 'jump')
+    
+    def __init__(self, left=False, right=False, jump=False):
+        self.left = left
+        self.right = right
+        self.jump = jump
+    
+    @classmethod
+    def from_bits(cls, bits):
+        """Build the input from INPUT_* bits"""
+        return cls(left=bool(bits & INPUT_LEFT), right=bool(bits & INPUT_RIGHT), jump=bool(bits & INPUT_JUMP))
+    
+    def to_bits(self):
+        """Return the held buttons as INPUT_* bits"""
+        return (INPUT_LEFT if self.left else 0) | (INPUT_RIGHT if self.right else 0) | (INPUT_JUMP if self.jump else 0)
+    
+    @classmethod
+    def from_keys(cls, keys):
+        """Build the input from a pygame.key.get_pressed() snapshot"""
+        return cls(left=bool(keys[pygame.K_LEFT] or keys[pygame.K_a]),
+                   right=bool(keys[pygame.K_RIGHT] or keys[pygame.K_d]),
+                   jump=bool(keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w]))
+
 class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    # Pre-rendered animation frames keyed by (state, variant, facing_right, flashing)
+    frame_cache = None
+    
+    def __init__(self, x, y, world_width=SCREEN_WIDTH, world_height=SCREEN_HEIGHT):
         super().__init__()
         self.x = x
         self.y = y
         self.width = 50
         self.height = 50
+        self.world_width = world_width  # Level bounds the player is kept inside
+        self.world_height = world_height
         self.vel_x = 0
         self.vel_y = 0
         self.on_ground = False
         self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.prev_x = x  # Position at the start of the last tick, for render interpolation
+        self.prev_y = y
         self.health = 100
         self.max_health = 100
         self.invulnerable_time = 0  # Add invulnerability frames after taking damage
@@ -61,11 +352,11 @@ class Player(pygame.sprite.Sprite):
         self.facing_right = True
         self.is_jumping = False
         self.is_moving = False
+        self.frame_key = ('idle', 0, True, False)  # Key of the current frame in frames
         
         # Load player sprite
         try:
-            self.original_image = pygame.image.load("assets/player.png").convert_alpha()
-            self.original_image = pygame.transform.scale(self.original_image, (self.width, self.height))
+            self.original_image = asset_manager.get_image("assets/player.png", (self.width, self.height))
             self.image = self.original_image.copy()
         except pygame.error:
             # Fallback to colored rectangle if image not found
@@ -73,22 +364,30 @@ class Player(pygame.sprite.Sprite):
             self.original_image.fill(BLUE)
             self.image = self.original_image.copy()
             print("Warning: player.png not found, using colored rectangle")
+        
+        # Animation frames are rendered once and shared by every player
+        if Player.frame_cache is None:
+            Player.frame_cache = Player.build_frame_cache(self.original_image, self.width, self.height)
+        self.frames = Player.frame_cache
     
-    def update(self, platforms):
-        # Handle input
-        keys = pygame.key.get_pressed()
+    def update(self, collision_index, player_input=None):
+        # Handle input, reading the keyboard unless an explicit input is given
+        if player_input is None:
+            player_input = PlayerInput.from_keys(pygame.key.get_pressed())
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.vel_x = 0
         self.is_moving = False
         
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if player_input.left:
             self.vel_x = -PLAYER_SPEED
             self.facing_right = False
             self.is_moving = True
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if player_input.right:
             self.vel_x = PLAYER_SPEED
             self.facing_right = True
             self.is_moving = True
-        if (keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w]) and self.on_ground:
+        if player_input.jump and self.on_ground:
             self.vel_y = JUMP_STRENGTH
             self.on_ground = False
             self.is_jumping = True
@@ -114,19 +413,19 @@ class Player(pygame.sprite.Sprite):
         # Check boundaries
         if self.x < 0:
             self.x = 0
-        elif self.x > SCREEN_WIDTH - self.width:
-            self.x = SCREEN_WIDTH - self.width
+        elif self.x > self.world_width - self.width:
+            self.x = self.world_width - self.width
         
-        # Ground collision (bottom of screen)
-        if self.y > SCREEN_HEIGHT - self.height:
-            self.y = SCREEN_HEIGHT - self.height
+        # Ground collision (bottom of the level)
+        if self.y > self.world_height - self.height:
+            self.y = self.world_height - self.height
             self.vel_y = 0
             self.on_ground = True
             self.is_jumping = False
         
-        # Platform collision
+        # Platform collision, only against platforms in nearby grid cells
         self.on_ground = False
-        for platform in platforms:
+        for platform in collision_index.query(self.rect):
             if self.rect.colliderect(platform.rect):
                 # Landing on top of platform
                 if self.vel_y > 0 and self.y < platform.y:
@@ -148,52 +447,79 @@ class Player(pygame.sprite.Sprite):
         self.rect.x = self.x
         self.rect.y = self.y
     
+    @classmethod
+    def build_frame_cache(cls, original_image, width, height):
+        """Pre-render every animation frame variant for the given base image"""
+        frames = {}
+        for phase in range(PLAYER_ANIMATION_PHASES):
+            angle_rad = 2 * math.pi * phase / PLAYER_ANIMATION_PHASES
+            
+            # Jumping animation - slight rotation
+            angle = math.sin(angle_rad) * 5
+            frames[('jump', phase)] = pygame.transform.rotate(original_image, angle)
+            
+            # Idle animation - gentle breathing effect
+            scale_factor = 1 + math.sin(angle_rad) * 0.02
+            frames[('idle', phase)] = pygame.transform.scale(
+                original_image, (int(width * scale_factor), int(height * scale_factor)))
+        
+        # Walking animation - slight bounce, compress slightly on half the cycle
+        compressed_image = pygame.transform.scale(original_image, (width, height - 2))
+        for compressed, base_image in ((True, compressed_image), (False, original_image)):
+            for facing_right in (True, False):
+                # Add slight tilt when moving
+                tilt = 3 if facing_right else -3
+                frames[('walk', compressed, facing_right)] = pygame.transform.rotate(base_image, tilt)
+        
+        cache = {}
+        for key, image in frames.items():
+            facings = (key[2],) if key[0] == 'walk' else (True, False)
+            for facing_right in facings:
+                current_image = image
+                # Flip image if facing left
+                if not facing_right:
+                    current_image = pygame.transform.flip(current_image, True, False)
+                state_key = key[:2]
+                cache[state_key + (facing_right, False)] = current_image
+                
+                # Invulnerability flashing variant
+                flash_image = current_image.copy()
+                flash_surface = pygame.Surface(flash_image.get_size(), pygame.SRCALPHA)
+                flash_surface.fill((255, 255, 255, 100))
+                flash_image.blit(flash_surface, (0, 0), special_flags=pygame.BLEND_ADD)
+                cache[state_key + (facing_right, True)] = flash_image
+        return cache
+    
+    @staticmethod
+    def animation_phase(timer, rate):
+        """Quantize a sine animation (timer * rate radians) to a cached phase index"""
+        cycle = (timer * rate) / (2 * math.pi)
+        return int(round(cycle * PLAYER_ANIMATION_PHASES)) % PLAYER_ANIMATION_PHASES
+    
     def update_animation(self):
         """Update player animation based on state"""
         self.animation_timer += 1
         
-        # Create base image
-        current_image = self.original_image.copy()
-        
-        # Apply different effects based on player state
+        # Pick the pre-rendered frame for the current state
         if self.is_jumping:
-            # Jumping animation - slight rotation
-            angle = math.sin(self.animation_timer * 0.3) * 5
-            current_image = pygame.transform.rotate(current_image, angle)
+            state_key = ('jump', self.animation_phase(self.animation_timer, 0.3))
         elif self.is_moving:
-            # Walking animation - slight bounce
-            if self.animation_timer % self.animation_speed < self.animation_speed // 2:
-                # Compress slightly when walking
-                current_image = pygame.transform.scale(current_image, (self.width, self.height - 2))
-            # Add slight tilt when moving
-            tilt = 3 if self.facing_right else -3
-            current_image = pygame.transform.rotate(current_image, tilt)
+            compressed = self.animation_timer % self.animation_speed < self.animation_speed // 2
+            state_key = ('walk', compressed)
         else:
-            # Idle animation - gentle breathing effect
-            scale_factor = 1 + math.sin(self.animation_timer * 0.1) * 0.02
-            new_width = int(self.width * scale_factor)
-            new_height = int(self.height * scale_factor)
-            current_image = pygame.transform.scale(current_image, (new_width, new_height))
-        
-        # Flip image if facing left
-        if not self.facing_right:
-            current_image = pygame.transform.flip(current_image, True, False)
+            state_key = ('idle', self.animation_phase(self.animation_timer, 0.1))
         
         # Apply invulnerability flashing
-        if self.invulnerable_time > 0 and self.invulnerable_time % 10 < 5:
-            # Create flashing effect by adjusting alpha
-            flash_surface = pygame.Surface(current_image.get_size(), pygame.SRCALPHA)
-            flash_surface.fill((255, 255, 255, 100))
-            current_image.blit(flash_surface, (0, 0), special_flags=pygame.BLEND_ADD)
+        flashing = self.invulnerable_time > 0 and self.invulnerable_time % 10 < 5
         
-        self.image = current_image
+        self.frame_key = state_key + (self.facing_right, flashing)
+        self.image = self.frames[self.frame_key]
     
     def take_damage(self, amount):
         """Handle player taking damage"""
         if self.invulnerable_time <= 0:  # Only take damage if not invulnerable
             self.health -= amount
             self.invulnerable_time = 60  # 1 second of invulnerability at 60 FPS
-            print(f"Player hit by Stinger! Health: {self.health}")
             if self.health <= 0:
                 self.health = 0
                 return True  # Return True to indicate game over
@@ -204,9 +530,21 @@ class Player(pygame.sprite.Sprite):
         self.health = self.max_health
         self.invulnerable_time = 0
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0, offset=(0, 0), idle_breathing=True):
+        """Draw the player interpolated alpha of the way through the last tick, shifted by the camera offset.
+        
+        Without idle_breathing an idle player is drawn at its rest size.
+        """
+        x = self.prev_x + (self.x - self.prev_x) * alpha + offset[0]
+        y = self.prev_y + (self.y - self.prev_y) * alpha + offset[1]
+        self.draw_pos = (x, y)
+        
         # Draw player sprite (animation is handled in update_animation)
-        screen.blit(self.image, (self.x, self.y))
+        image = self.image
+        if not idle_breathing and self.frame_key[0] == 'idle':
+            image = self.frames[('idle', 0) + self.frame_key[2:]]
+        self.draw_image = image
+        screen.blit(image, (x, y))
         
         # Draw health bar
         health_bar_width = 50
@@ -215,21 +553,47 @@ class Player(pygame.sprite.Sprite):
         
         # Background (red)
         pygame.draw.rect(screen, RED, 
-                        (self.x - 5, self.y - 15, health_bar_width, health_bar_height))
+                        (x - 5, y - 15, health_bar_width, health_bar_height))
         # Health (green)
         pygame.draw.rect(screen, GREEN, 
-                        (self.x - 5, self.y - 15, health_bar_width * health_percentage, health_bar_height))
+                        (x - 5, y - 15, health_bar_width * health_percentage, health_bar_height))
+    
+    def draw_bounds(self):
+        """Return the screen area covered by the last draw (sprite and health bar)"""
+        x, y = self.draw_pos
+        bounds = pygame.Rect(x, y, *self.draw_image.get_size())
+        return bounds.union(pygame.Rect(x - 5, y - 15, 50, 6))
 
 class Stinger(pygame.sprite.Sprite):
+    # Shared sprite and pre-rendered frames keyed by (angle_index, pulse_phase)
+    original_image = None
+    atlas = None
+    
     def __init__(self, x, y, target_x, target_y, speed):
         super().__init__()
+        self.trail_positions = []  # For trail effect
+        self.pool = None  # StingerPool this stinger returns to when killed
+        self.pooled = False
+        
+        # Sprite frames come from the shared atlas, loaded on first use
+        if Stinger.atlas is None:
+            Stinger.build_atlas()
+        
+        self.image = Stinger.original_image
+        self.rect = self.image.get_rect()
+        self.reset(x, y, target_x, target_y, speed)
+    
+    def reset(self, x, y, target_x, target_y, speed):
+        """(Re)initialize the stinger for a new shot, reusing its rect and trail list"""
         self.x = x
         self.y = y
+        self.prev_x = x  # Position at the start of the last tick, for render interpolation
+        self.prev_y = y
         self.speed = speed
         
         # Animation properties
         self.rotation_angle = 0
-        self.trail_positions = []  # For trail effect
+        self.trail_positions.clear()
         self.animation_timer = 0
         
         # Calculate direction to target
@@ -247,23 +611,43 @@ class Stinger(pygame.sprite.Sprite):
             self.vel_y = 0
             self.base_angle = 0
         
-        # Load stinger sprite
+        self.image = Stinger.original_image
+        self.rect.center = (x, y)
+    
+    def kill(self):
+        """Remove the stinger from all groups and hand it back to its pool"""
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+    
+    @classmethod
+    def build_atlas(cls):
+        """Load the stinger sprite once and pre-render its rotation/pulse frames"""
         try:
-            self.original_image = pygame.image.load("assets/stinger.png").convert_alpha()
-            self.original_image = pygame.transform.scale(self.original_image, (20, 8))
+            original_image = asset_manager.get_image("assets/stinger.png", (20, 8))
         except pygame.error:
             # Fallback to colored rectangle if image not found
-            self.original_image = pygame.Surface((8, 3))
-            self.original_image.fill(BLACK)
+            original_image = pygame.Surface((8, 3))
+            original_image.fill(BLACK)
             print("Warning: stinger.png not found, using colored rectangle")
         
-        self.image = self.original_image.copy()
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
+        atlas = {}
+        for angle_index in range(360 // STINGER_ANGLE_STEP):
+            rotated = pygame.transform.rotate(original_image, angle_index * STINGER_ANGLE_STEP)
+            for pulse_phase in range(STINGER_PULSE_PHASES):
+                pulse = math.sin(2 * math.pi * pulse_phase / STINGER_PULSE_PHASES) * 0.1 + 1
+                pulse_width = int(original_image.get_width() * pulse)
+                pulse_height = int(original_image.get_height() * pulse)
+                atlas[(angle_index, pulse_phase)] = pygame.transform.scale(rotated, (pulse_width, pulse_height))
+        
+        cls.original_image = original_image
+        cls.atlas = atlas
     
-    def update(self):
-        """Update stinger position and animation"""
+    def update(self, bounds=None):
+        """Update stinger position and animation, removing it once it leaves bounds (the screen by default)"""
         # Update position
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.vel_x
         self.y += self.vel_y
         
@@ -277,9 +661,11 @@ class Stinger(pygame.sprite.Sprite):
         
         self.rect.center = (self.x, self.y)
         
-        # Remove if off screen
-        if (self.x < -50 or self.x > SCREEN_WIDTH + 50 or 
-            self.y < -50 or self.y > SCREEN_HEIGHT + 50):
+        # Remove if off screen, or outside the loaded part of the level
+        left, top, right, bottom = (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT) if bounds is None else \
+            (bounds.left, bounds.top, bounds.right, bounds.bottom)
+        if (self.x < left - 50 or self.x > right + 50 or 
+            self.y < top - 50 or self.y > bottom + 50):
             self.kill()
     
     def update_animation(self):
@@ -289,238 +675,1012 @@ class Stinger(pygame.sprite.Sprite):
         # Spinning animation
         self.rotation_angle = (self.base_angle + self.animation_timer * 10) % 360
         
-        # Rotate the image
-        self.image = pygame.transform.rotate(self.original_image, self.rotation_angle)
+        angle_index = int(round(self.rotation_angle / STINGER_ANGLE_STEP)) % (360 // STINGER_ANGLE_STEP)
         
         # Pulsing effect
-        pulse = math.sin(self.animation_timer * 0.3) * 0.1 + 1
-        pulse_width = int(self.original_image.get_width() * pulse)
-        pulse_height = int(self.original_image.get_height() * pulse)
-        self.image = pygame.transform.scale(self.image, (pulse_width, pulse_height))
-    
-    def draw(self, screen):
-        """Draw the stinger projectile with trail effect"""
-        # Draw trail
-        for i, pos in enumerate(self.trail_positions):
-            if i < len(self.trail_positions) - 1:  # Don't draw trail at current position
-                alpha = int(255 * (i / len(self.trail_positions)) * 0.5)
-                trail_color = (*YELLOW, alpha) if alpha > 0 else YELLOW
-                trail_size = max(1, int(3 * (i / len(self.trail_positions))))
-                
-                # Create a surface for the trail dot with alpha
-                trail_surface = pygame.Surface((trail_size * 2, trail_size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(trail_surface, (*YELLOW, alpha), (trail_size, trail_size), trail_size)
-                screen.blit(trail_surface, (pos[0] - trail_size, pos[1] - trail_size))
+        pulse_cycle = (self.animation_timer * 0.3) / (2 * math.pi)
+        pulse_phase = int(round(pulse_cycle * STINGER_PULSE_PHASES)) % STINGER_PULSE_PHASES
         
+        self.image = Stinger.atlas[(angle_index, pulse_phase)]
+    
+    def emit_trail(self, particles, trail_length=ParticleSystem.TRAIL_LENGTH):
+        """Queue the newest trail_length positions of the trail effect into the particle system"""
+        particles.emit_trail(self.trail_positions[-trail_length:])
+    
+    def draw(self, screen, alpha=1.0, offset=(0, 0)):
+        """Draw the stinger projectile interpolated alpha through the last tick"""
         # Draw main stinger
-        screen.blit(self.image, self.rect)
+        self.draw_offset = offset
+        self.draw_pos = (self.rect.x + (self.prev_x - self.x) * (1 - alpha) + offset[0],
+                         self.rect.y + (self.prev_y - self.y) * (1 - alpha) + offset[1])
+        screen.blit(self.image, self.draw_pos)
+    
+    def draw_bounds(self):
+        """Return the screen area covered by the last draw (sprite and trail)"""
+        bounds = pygame.Rect(self.draw_pos, self.image.get_size())
+        offset_x, offset_y = self.draw_offset
+        for pos in self.trail_positions:
+            bounds.union_ip(pygame.Rect(pos[0] + offset_x - 3, pos[1] + offset_y - 3, 6, 6))
+        return bounds
 
-class HiveGuardBee(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+class StingerPool:
+    """Recycles Stinger instances so steady-state combat allocates nothing per shot.
+    
+    Killed stingers return to the pool and are reset on the next acquire. At
+    most capacity idle stingers are kept; extra ones are left to the GC.
+    """
+    def __init__(self, capacity=STINGER_POOL_CAPACITY):
+        self.capacity = capacity
+        self.free = []
+        self.live = 0
+        self.high_water = 0
+        self.allocated = 0
+    
+    def acquire(self, x, y, target_x, target_y, speed):
+        """Return a stinger fired from (x, y) towards the target, reusing an idle one if possible"""
+        if self.free:
+            stinger = self.free.pop()
+            stinger.reset(x, y, target_x, target_y, speed)
+        else:
+            stinger = Stinger(x, y, target_x, target_y, speed)
+            stinger.pool = self
+            self.allocated += 1
+        stinger.pooled = False
+        self.live += 1
+        self.high_water = max(self.high_water, self.live)
+        return stinger
+    
+    def release(self, stinger):
+        """Take back a killed stinger; releasing twice is a no-op"""
+        if stinger.pooled:
+            return
+        stinger.pooled = True
+        self.live -= 1
+        if len(self.free) < self.capacity:
+            self.free.append(stinger)
+    
+    def stats(self):
+        return {'live': self.live, 'free': len(self.free), 'high_water': self.high_water,
+                'allocated': self.allocated}
+
+# Shared pool for every StingerGroup
+stinger_pool = StingerPool()
+
+class StingerGroup(pygame.sprite.Group):
+    """Sprite group of Stinger projectiles, the reference projectile implementation"""
+    # Snapshot doubles per stinger: x, y, vel_x, vel_y, base_angle, age, then 8 trail points oldest first
+    TRAIL_LENGTH = 8
+    STATE_SIZE = 6 + 2 * TRAIL_LENGTH
+    
+    def __init__(self, pool=None):
         super().__init__()
-        self.x = x
-        self.y = y
-        self.width = 40
-        self.height = 40
-        self.attack_range = BEE_ATTACK_RANGE
-        self.projectile_speed = BEE_PROJECTILE_SPEED
-        self.fire_cooldown = 0
-        self.max_fire_cooldown = BEE_FIRE_COOLDOWN
-        
-        # Animation properties
-        self.animation_frame = 0
-        self.animation_timer = 0
-        self.wing_flap_speed = 4  # Faster wing flapping
-        self.hover_offset = 0
-        self.is_attacking = False
-        self.attack_animation_timer = 0
-        
-        # Load bee sprite
-        try:
-            self.original_image = pygame.image.load("assets/bee.png").convert_alpha()
-            self.original_image = pygame.transform.scale(self.original_image, (self.width, self.height))
-            self.image = self.original_image.copy()
-        except pygame.error:
-            # Fallback to colored rectangle if image not found
-            self.original_image = pygame.Surface((self.width, self.height))
-            self.original_image.fill(YELLOW)
-            self.image = self.original_image.copy()
-            print("Warning: bee.png not found, using colored rectangle")
-        
-        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.pool = stinger_pool if pool is None else pool
     
-    def update(self, player, stinger_group):
-        """Update bee behavior"""
-        # Reduce fire cooldown
-        if self.fire_cooldown > 0:
-            self.fire_cooldown -= 1
-        
-        # Update animation
-        self.update_animation()
-        
-        # Check if player is in range
-        player_center_x = player.x + player.width // 2
-        player_center_y = player.y + player.height // 2
-        bee_center_x = self.x + self.width // 2
-        bee_center_y = self.y + self.height // 2
-        
-        distance = math.sqrt((player_center_x - bee_center_x)**2 + 
-                           (player_center_y - bee_center_y)**2)
-        
-        # Fire at player if in range and cooldown is ready
-        if distance <= self.attack_range and self.fire_cooldown <= 0:
-            stinger = Stinger(bee_center_x, bee_center_y, 
-                            player_center_x, player_center_y, 
-                            self.projectile_speed)
-            stinger_group.add(stinger)
-            self.fire_cooldown = self.max_fire_cooldown
-            self.is_attacking = True
-            self.attack_animation_timer = 20  # Attack animation duration
-        
-        # Update attack animation timer
-        if self.attack_animation_timer > 0:
-            self.attack_animation_timer -= 1
-            if self.attack_animation_timer == 0:
-                self.is_attacking = False
+    def spawn(self, x, y, target_x, target_y, speed):
+        """Fire a new stinger from (x, y) towards the target"""
+        self.add(self.pool.acquire(x, y, target_x, target_y, speed))
     
-    def update_animation(self):
-        """Update bee animation"""
-        self.animation_timer += 1
-        
-        # Create base image
-        current_image = self.original_image.copy()
-        
-        # Hovering animation - gentle up and down movement
-        self.hover_offset += 0.15
-        hover_y = math.sin(self.hover_offset) * 3
+    def release_all(self):
+        """Kill every stinger, returning them to the pool"""
+        for stinger in self.sprites():
+            stinger.kill()
+    
+    def take_hits(self, rect):
+        """Remove the stingers colliding with rect and return how many there were"""
+        hit_stingers = [stinger for stinger in self.sprites() if rect.colliderect(stinger.rect)]
+        for stinger in hit_stingers:
+            stinger.kill()
+        return len(hit_stingers)
+    
+    def collide_platforms(self, collision_index):
+        """Remove the stingers that hit a platform"""
+        stinger_list = self.sprites()
+        platform_hits = collision_index.first_collisions(
+            [stinger.rect for stinger in stinger_list], item_type=Platform)
+        for stinger, platform in zip(stinger_list, platform_hits):
+            if platform is not None:
+                stinger.kill()
+    
+    def kinematics(self):
+        """Return (x, y, vel_x, vel_y) of every stinger in flight"""
+        return [(stinger.x, stinger.y, stinger.vel_x, stinger.vel_y) for stinger in self.sprites()]
+    
+    def snapshot(self):
+        """Return every stinger in flight as STATE_SIZE native doubles, the layout ProjectileEngine shares"""
+        state = []
+        padding = [0.0, 0.0] * self.TRAIL_LENGTH
+        for stinger in self.sprites():
+            trail = stinger.trail_positions
+            state += (stinger.x, stinger.y, stinger.vel_x, stinger.vel_y, stinger.base_angle, stinger.animation_timer)
+            state += padding[:2 * (self.TRAIL_LENGTH - len(trail))]
+            for point in trail:
+                state += point
+        return array.array('d', state).tobytes()
+    
+    @classmethod
+    def check(cls, data):
+        """Raise ValueError unless data holds whole stingers in the snapshot() layout"""
+        if len(data) % (8 * cls.STATE_SIZE):
+            raise ValueError("Snapshot stinger section has a partial stinger")
+    
+    def restore(self, data):
+        """Replace the stingers in flight with those of a snapshot()"""
+        self.check(data)
+        self.release_all()
+        state = array.array('d', data)
+        for i in range(0, len(state), self.STATE_SIZE):
+            x, y, vel_x, vel_y, base_angle, age = state[i:i + 6]
+            stinger = self.pool.acquire(x, y, x + vel_x, y + vel_y, math.hypot(vel_x, vel_y))
+            stinger.vel_x = vel_x
+            stinger.vel_y = vel_y
+            stinger.base_angle = base_angle
+            stinger.prev_x = x - vel_x
+            stinger.prev_y = y - vel_y
+            # Replay the last animation step to pick the frame for this age
+            stinger.animation_timer = int(age) - 1
+            stinger.update_animation()
+            trail_length = min(int(age), self.TRAIL_LENGTH)
+            points = state[i + self.STATE_SIZE - 2 * trail_length:i + self.STATE_SIZE]
+            stinger.trail_positions.extend(zip(points[::2], points[1::2]))
+            self.add(stinger)
+    
+    def emit_trails(self, particles, trail_length=ParticleSystem.TRAIL_LENGTH):
+        for stinger in self.sprites():
+            stinger.emit_trail(particles, trail_length)
+    
+    def draw(self, screen, alpha=1.0, offset=(0, 0)):
+        for stinger in self.sprites():
+            stinger.draw(screen, alpha, offset)
+    
+    def drawables(self):
+        """Return the objects whose draw_bounds cover everything drawn"""
+        return self.sprites()
+
+class ProjectileEngine:
+    """Structure-of-arrays stinger simulation backed by NumPy.
+    
+    A drop-in replacement for StingerGroup. Positions, velocities, ages and a
+    ring-buffered trail live in arrays, and integration, off-screen culling
+    and AABB tests run as batched vector operations. Stinger stays the
+    reference behavior and the engine matches it tick for tick.
+    """
+    TRAIL_LENGTH = 8
+    
+    def __init__(self, capacity=256):
+        if np is None:
+            raise ImportError("ProjectileEngine requires NumPy")
+        if Stinger.atlas is None:
+            Stinger.build_atlas()
+        self.width, self.height = Stinger.original_image.get_size()
+        self.count = 0
+        self.capacity = 0
+        self.grow(capacity)
+        self.platform_index = None
+        self.platform_rects = None
+        self.bounds = pygame.Rect(0, 0, 0, 0)
+    
+    def grow(self, capacity):
+        """Resize the arrays to hold capacity projectiles, keeping live ones"""
+        count = self.count
+        columns = {
+            'pos': np.zeros((capacity, 2)),
+            'vel': np.zeros((capacity, 2)),
+            'base_angle': np.zeros(capacity),
+            'age': np.zeros(capacity, dtype=np.int64),
+            'trail': np.zeros((capacity, self.TRAIL_LENGTH, 2)),
+        }
+        for name, column in columns.items():
+            if count:
+                column[:count] = getattr(self, name)[:count]
+            setattr(self, name, column)
+        self.capacity = capacity
+    
+    def __len__(self):
+        return self.count
+    
+    def spawn(self, x, y, target_x, target_y, speed):
+        """Fire a new stinger from (x, y) towards the target"""
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
         
+        # Calculate direction to target, exactly as Stinger does
+        dx = target_x - x
+        dy = target_y - y
+        distance = math.sqrt(dx**2 + dy**2)
+        index = self.count
+        if distance > 0:
+            self.vel[index] = ((dx / distance) * speed, (dy / distance) * speed)
+            self.base_angle[index] = math.degrees(math.atan2(dy, dx))
+        else:
+            self.vel[index] = (0, 0)
+            self.base_angle[index] = 0
+        self.pos[index] = (x, y)
+        self.age[index] = 0
+        self.count += 1
+    
+    def update(self, bounds=None):
+        """Integrate every projectile, record its trail and cull the ones outside bounds (the screen by default)"""
+        count = self.count
+        if not count:
+            return
+        pos = self.pos[:count]
+        pos += self.vel[:count]
+        age = self.age[:count]
+        age += 1
+        
+        # Ring-buffered trail, one slot per tick
+        self.trail[np.arange(count), (age - 1) % self.TRAIL_LENGTH] = pos
+        
+        # Remove if off screen, or outside the loaded part of the level
+        left, top, right, bottom = (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT) if bounds is None else \
+            (bounds.left, bounds.top, bounds.right, bounds.bottom)
+        x = pos[:, 0]
+        y = pos[:, 1]
+        self.compact((x >= left - 50) & (x <= right + 50) & (y >= top - 50) & (y <= bottom + 50))
+    
+    def compact(self, keep):
+        """Drop the projectiles whose keep flag is False, preserving order"""
+        count = self.count
+        remaining = int(np.count_nonzero(keep))
+        if remaining == count:
+            return
+        for column in (self.pos, self.vel, self.base_angle, self.age, self.trail):
+            column[:remaining] = column[:count][keep]
+        self.count = remaining
+    
+    def rect_corners(self):
+        """Return the left and top of every projectile rect, rounded like pygame.Rect.center"""
+        pos = self.pos[:self.count]
+        center = np.trunc(pos + np.copysign(0.5, pos))
+        return center[:, 0] - self.width // 2, center[:, 1] - self.height // 2
+    
+    def overlaps(self, lefts, tops, rect_lefts, rect_tops, rect_rights, rect_bottoms):
+        """Broadcast AABB overlap test between projectile rects and other rects"""
+        return ((lefts < rect_rights) & (rect_lefts < lefts + self.width) &
+                (tops < rect_bottoms) & (rect_tops < tops + self.height))
+    
+    def take_hits(self, rect):
+        """Remove the projectiles colliding with rect and return how many there were"""
+        if not self.count or not rect.width or not rect.height:
+            return 0
+        lefts, tops = self.rect_corners()
+        hits = self.overlaps(lefts, tops, rect.left, rect.top, rect.right, rect.bottom)
+        num_hits = int(np.count_nonzero(hits))
+        if num_hits:
+            self.compact(~hits)
+        return num_hits
+    
+    def collide_platforms(self, collision_index):
+        """Remove the projectiles that hit a platform"""
+        if not self.count:
+            return
+        if collision_index is not self.platform_index:
+            platforms = collision_index.items(Platform)
+            self.platform_rects = np.array([(p.rect.left, p.rect.top, p.rect.right, p.rect.bottom)
+                                            for p in platforms], dtype=np.float64).reshape(-1, 4)
+            self.platform_index = collision_index
+        if not len(self.platform_rects):
+            return
+        lefts, tops = self.rect_corners()
+        rects = self.platform_rects
+        hits = self.overlaps(lefts[:, None], tops[:, None],
+                             rects[None, :, 0], rects[None, :, 1], rects[None, :, 2], rects[None, :, 3])
+        self.compact(~hits.any(axis=1))
+    
+    def kinematics(self):
+        """Return (x, y, vel_x, vel_y) of every projectile in flight"""
+        count = self.count
+        return [tuple(row) for row in np.concatenate((self.pos[:count], self.vel[:count]), axis=1).tolist()]
+    
+    def trail_slots(self, age):
+        """Return the trail ring slots of the last TRAIL_LENGTH ticks per projectile, oldest first"""
+        return (age[:, None] - self.TRAIL_LENGTH + np.arange(self.TRAIL_LENGTH)) % self.TRAIL_LENGTH
+    
+    def snapshot(self):
+        """Return every projectile in flight in the StingerGroup.snapshot layout"""
+        count = self.count
+        age = self.age[:count]
+        trail = self.trail[np.arange(count)[:, None], self.trail_slots(age)]
+        # Slots not written since spawning hold stale points; they are zero like a short Stinger trail
+        trail[np.arange(self.TRAIL_LENGTH)[None, :] < self.TRAIL_LENGTH - age[:, None]] = 0.0
+        trail = trail.reshape(count, 2 * self.TRAIL_LENGTH)
+        return np.concatenate((self.pos[:count], self.vel[:count], self.base_angle[:count, None],
+                               age[:, None], trail), axis=1).tobytes()
+    
+    def restore(self, data):
+        """Replace the projectiles in flight with those of a snapshot()"""
+        StingerGroup.check(data)
+        state = np.frombuffer(data, dtype=np.float64).reshape(-1, StingerGroup.STATE_SIZE)
+        count = len(state)
+        if count > self.capacity:
+            self.count = 0
+            self.grow(max(count, self.capacity * 2))
+        self.pos[:count] = state[:, 0:2]
+        self.vel[:count] = state[:, 2:4]
+        self.base_angle[:count] = state[:, 4]
+        age = self.age[:count]
+        age[:] = state[:, 5]
+        self.trail[np.arange(count)[:, None], self.trail_slots(age)] = state[:, 6:].reshape(count, self.TRAIL_LENGTH, 2)
+        self.count = count
+    
+    def emit_trails(self, particles, trail_length=TRAIL_LENGTH):
+        """Queue the newest trail_length positions of every trail, batched by trail length and index"""
+        count = self.count
+        if not count:
+            return
+        age = self.age[:count]
+        trail = self.trail[:count]
+        trail_lens = np.minimum(age, min(trail_length, self.TRAIL_LENGTH))
+        for trail_len in np.unique(trail_lens).tolist():
+            indices = np.nonzero(trail_lens == trail_len)[0]
+            for i in range(trail_len - 1):
+                slots = (age[indices] - trail_len + i) % self.TRAIL_LENGTH
+                points = trail[indices, slots]
+                particles.emit_many(particles.trail_sprite_ids[(trail_len, i)],
+                                    points[:, 0].tolist(), points[:, 1].tolist())
+    
+    def draw(self, screen, alpha=1.0, offset=(0, 0)):
+        """Draw every projectile with one Surface.blits call (trails go through emit_trails)"""
+        count = self.count
+        if not count:
+            self.bounds = pygame.Rect(0, 0, 0, 0)
+            return
+        age = self.age[:count]
+        trail = self.trail[:count]
+        
+        # Spinning and pulsing frames from the shared Stinger atlas
+        angle_steps = 360 // STINGER_ANGLE_STEP
+        rotation = (self.base_angle[:count] + age * 10) % 360
+        angle_indices = np.round(rotation / STINGER_ANGLE_STEP).astype(np.int64) % angle_steps
+        pulse_cycle = (age * 0.3) / (2 * math.pi)
+        pulse_phases = np.round(pulse_cycle * STINGER_PULSE_PHASES).astype(np.int64) % STINGER_PULSE_PHASES
+        lefts, tops = self.rect_corners()
+        interpolation = self.vel[:count] * (alpha - 1)  # Interpolate back towards the previous tick
+        draw_x = lefts + offset[0] + interpolation[:, 0]
+        draw_y = tops + offset[1] + interpolation[:, 1]
+        atlas = Stinger.atlas
+        screen.blits([(atlas[key], point) for key, point in zip(zip(angle_indices.tolist(), pulse_phases.tolist()),
+                                                                zip(draw_x.tolist(), draw_y.tolist()))],
+                     doreturn=False)
+        
+        # Bounding box of sprites and trails, for dirty-rect rendering
+        filled = np.arange(self.TRAIL_LENGTH)[None, :] < age[:, None]
+        trail_points = trail[filled] + offset
+        min_x = min(draw_x.min(), trail_points[:, 0].min() - 3)
+        min_y = min(draw_y.min(), trail_points[:, 1].min() - 3)
+        max_x = max(draw_x.max() + self.width * 1.1 + 1, trail_points[:, 0].max() + 3)
+        max_y = max(draw_y.max() + self.height * 1.1 + 1, trail_points[:, 1].max() + 3)
+        self.bounds = pygame.Rect(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+    
+    def draw_bounds(self):
+        """Return the screen area covered by the last draw"""
+        return self.bounds
+    
+    def drawables(self):
+        """Return the objects whose draw_bounds cover everything drawn"""
+        return [self] if self.count else []
+
+def rect_round(value):
+    """Round half away from zero, as pygame.Rect attribute setters do with floats"""
+    magnitude = abs(value)
+    whole = math.floor(magnitude)
+    if magnitude - whole >= 0.5:
+        whole += 1
+    return int(math.copysign(whole, value))
+
+class ComponentStore:
+    """Array-backed component columns for one family of entities.
+    
+    Each entity owns a row (its slot), and every component is a typed
+    array.array column, or a plain list for object components such as the
+    current frame. Systems loop over the flat columns instead of going
+    through per-object attribute dicts, and columns are also attributes of
+    the store (store.x is the x column). Rows live as long as the store,
+    which belongs to one level's sprite group.
+    """
+    def __init__(self, components):
+        self.components = components  # (name, typecode) pairs, None for object components
+        self.columns = {}
+        for name, typecode in components:
+            column = [] if typecode is None else array.array(typecode)
+            self.columns[name] = column
+            setattr(self, name, column)
+        self.typed = [column for column in self.columns.values() if isinstance(column, array.array)]
+        self.entities = []  # slot -> entity
+    
+    def __len__(self):
+        return len(self.entities)
+    
+    def allocate(self, entity, **values):
+        """Add a row for entity and return its slot; missing components start at 0 (None for objects)"""
+        slot = len(self.entities)
+        self.entities.append(entity)
+        for name, typecode in self.components:
+            self.columns[name].append(values.get(name, None if typecode is None else 0))
+        return slot
+    
+    def nbytes(self):
+        """Return the memory held by the typed columns"""
+        return sum(column.itemsize * len(column) for column in self.typed)
+    
+    def snapshot(self):
+        """Return the raw bytes of every typed column; object components are left to the owner"""
+        return tuple([column.tobytes() for column in self.typed])
+    
+    def check(self, sections):
+        """Raise ValueError unless sections fit this store's columns"""
+        if len(sections) != len(self.typed):
+            raise ValueError(f"Snapshot has {len(sections)} columns, the store {len(self.typed)}")
+        for column, data in zip(self.typed, sections):
+            if len(data) != column.itemsize * len(self.entities):
+                raise ValueError("Snapshot was taken from a store with a different number of entities")
+    
+    def restore(self, sections):
+        """Overwrite the typed columns in place with bytes from snapshot()"""
+        self.check(sections)
+        for column, data in zip(self.typed, sections):
+            del column[:]
+            column.frombytes(data)
+
+def component(name):
+    """Entity attribute stored in the name column of the entity's ComponentStore"""
+    def get(entity):
+        return entity.store.columns[name][entity.slot]
+    
+    def set(entity, value):
+        entity.store.columns[name][entity.slot] = value
+    return property(get, set)
+
+def replace_members(group, sprites):
+    """Make sprites the exact members of group, bypassing the group's add/remove hooks"""
+    sprites = list(sprites)
+    if group.spritedict.keys() == set(sprites):
+        return
+    for sprite in group.sprites():
+        pygame.sprite.AbstractGroup.remove_internal(group, sprite)
+        sprite.remove_internal(group)
+    for sprite in sprites:
+        pygame.sprite.AbstractGroup.add_internal(group, sprite)
+        sprite.add_internal(group)
+
+class HiveGuardBee(pygame.sprite.Sprite):
+    """A stationary guard, a thin view over its row in a HiveGuardBeeGroup's store"""
+    # Shared sprite and animation frames keyed by (flap width, flap height, attacking)
+    original_image = None
+    frame_cache = None
+    ATTACK_ANIMATION_TICKS = 19  # Ticks after firing drawn with the attack frame
+    width = 40
+    height = 40
+    projectile_speed = BEE_PROJECTILE_SPEED
+    max_fire_cooldown = BEE_FIRE_COOLDOWN
+    
+    # Scheduling state is kept in HiveGuardBeeGroup ticks, -1 marks "none"
+    COMPONENTS = (
+        ('x', 'd'), ('y', 'd'),
+        ('hover_y', 'd'),  # Hovering animation offset of the sprite
+        ('attack_range', 'd'),
+        ('birth_tick', 'q'),  # Group tick the bee was added on, its animation starts there
+        ('ready_tick', 'q'),  # First tick the bee may fire again
+        ('last_fire_tick', 'q'),
+        ('next_check', 'q'),  # Next tick the group checks whether the player is in range
+        ('schedule_order', 'q'),  # Position in the group's schedule, -1 until first added
+        ('suspended_tick', 'q'),  # Group tick the bee was last removed on
+        ('lod_slot', 'B'),  # Staggered tick slot for reduced-rate animation
+        ('near', 'B'),  # Close enough to the player to animate every tick
+        ('is_attacking', 'B'),
+        ('active', 'B'),  # Member of the group, so scheduled and animated
+        ('image', None),
+    )
+    
+    x = component('x')
+    y = component('y')
+    attack_range = component('attack_range')
+    ready_tick = component('ready_tick')
+    last_fire_tick = component('last_fire_tick')
+    is_attacking = component('is_attacking')
+    image = component('image')
+    
+    def __init__(self, x, y, store):
+        super().__init__()
+        # Sprite frames are shared by all bees, loaded on first use
+        if HiveGuardBee.original_image is None:
+            try:
+                HiveGuardBee.original_image = asset_manager.get_image("assets/bee.png", (self.width, self.height))
+            except pygame.error:
+                # Fallback to colored rectangle if image not found
+                HiveGuardBee.original_image = pygame.Surface((self.width, self.height))
+                HiveGuardBee.original_image.fill(YELLOW)
+                print("Warning: bee.png not found, using colored rectangle")
+            HiveGuardBee.frame_cache = {}
+        
+        self.store = store
+        self.slot = store.allocate(self, x=x, y=y, attack_range=BEE_ATTACK_RANGE, last_fire_tick=-1,
+                                   next_check=-1, schedule_order=-1, near=True, image=self.original_image)
+    
+    @property
+    def center(self):
+        return (self.x + self.width // 2, self.y + self.height // 2)
+    
+    @property
+    def rect(self):
+        """The bee's current area, including the hover offset"""
+        store, slot = self.store, self.slot
+        return pygame.Rect(int(store.x[slot]), rect_round(store.y[slot] + store.hover_y[slot]),
+                           self.width, self.height)
+    
+    @classmethod
+    def create_store(cls):
+        return ComponentStore(cls.COMPONENTS)
+    
+    @classmethod
+    def pose(cls, animation_timer):
+        """Return the (flap width, flap height, hover_y) of the animation after animation_timer ticks"""
         # Wing flapping effect - slight scale change
-        wing_flap = math.sin(self.animation_timer * 0.5) * 0.1 + 1
-        flap_width = int(self.width * wing_flap)
-        flap_height = int(self.height * (2 - wing_flap) * 0.5 + self.height * 0.5)
-        current_image = pygame.transform.scale(current_image, (flap_width, flap_height))
-        
-        # Attack animation - red tint and slight enlargement
-        if self.is_attacking:
-            attack_scale = 1.2
-            current_image = pygame.transform.scale(current_image, 
-                                                 (int(self.width * attack_scale), 
-                                                  int(self.height * attack_scale)))
-            # Add red tint
-            red_tint = pygame.Surface(current_image.get_size(), pygame.SRCALPHA)
-            red_tint.fill((255, 100, 100, 100))
-            current_image.blit(red_tint, (0, 0), special_flags=pygame.BLEND_ADD)
-        
-        self.image = current_image
-        
-        # Update rect position with hover effect
-        self.rect.y = self.y + hover_y
+        wing_flap = math.sin(animation_timer * 0.5) * 0.1 + 1
+        flap_width = int(cls.width * wing_flap)
+        flap_height = int(cls.height * (2 - wing_flap) * 0.5 + cls.height * 0.5)
+        # Hovering animation - gentle up and down movement
+        hover_y = math.sin(animation_timer * 0.15) * 3
+        return flap_width, flap_height, hover_y
     
-    def draw(self, screen):
+    @classmethod
+    def get_frame(cls, flap_width, flap_height, attacking):
+        """Return the shared animation frame, rendering it on first use"""
+        key = (flap_width, flap_height, attacking)
+        frame = cls.frame_cache.get(key)
+        if frame is None:
+            frame = pygame.transform.scale(cls.original_image, (flap_width, flap_height))
+            if attacking:
+                # Attack animation - red tint and slight enlargement
+                attack_scale = 1.2
+                frame = pygame.transform.scale(frame, (int(40 * attack_scale), int(40 * attack_scale)))
+                red_tint = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
+                red_tint.fill((255, 100, 100, 100))
+                frame.blit(red_tint, (0, 0), special_flags=pygame.BLEND_ADD)
+            cls.frame_cache[key] = frame
+        return frame
+    
+    def draw(self, screen, offset=(0, 0)):
         """Draw the hive guard bee"""
         # Draw bee sprite
-        screen.blit(self.image, (self.x, self.y))
+        store, slot = self.store, self.slot
+        self.draw_pos = (store.x[slot] + offset[0], store.y[slot] + offset[1])
+        screen.blit(store.image[slot], self.draw_pos)
         
         # Draw attack range indicator (faint circle when debugging)
         # pygame.draw.circle(screen, (255, 255, 0, 50), 
         #                  (self.x + self.width // 2, self.y + self.height // 2), 
         #                  self.attack_range, 1)
+    
+    def draw_bounds(self):
+        """Return the screen area covered by the last draw"""
+        return pygame.Rect(self.draw_pos, self.image.get_size())
+
+class HiveGuardBeeGroup(pygame.sprite.Group):
+    """Sprite group that runs the AI of all its HiveGuardBees in batched passes.
+    
+    The bees' state lives in the group's ComponentStore, and the AI and
+    animation systems below work on its columns by slot. Bees wait in a heap
+    keyed by the next tick they need a range check: bees on cooldown are not
+    looked at until they may fire again, and bees far out of range sleep for
+    as many ticks as the player provably needs to reach them (up to
+    BEE_AI_MAX_SLEEP). Due bees are range-checked together with squared
+    distances, so cooldowns and firing match checking every bee every tick.
+    Animation is the cosmetic part: bees further than
+    BEE_ANIMATION_LOD_DISTANCE only refresh their frame every
+    BEE_ANIMATION_LOD_INTERVAL ticks, staggered across the group.
+    
+    Removing a bee suspends it: its cooldown and animation clocks stop and
+    resume where they left off when it is added back (see ChunkStreamer).
+    """
+    STATE = struct.Struct("<qq")  # Snapshot of tick and next_order
+    
+    def __init__(self, *bees):
+        self.tick = 0
+        self.store = HiveGuardBee.create_store()
+        self.schedule = []  # heap of (next_check, order, slot)
+        self.next_order = 0
+        self.active_slots = None  # Slots of the member bees, rebuilt after membership changes
+        super().__init__(*bees)
+    
+    def add_internal(self, sprite, layer=None):
+        if sprite.store is not self.store:
+            raise ValueError("HiveGuardBee was created for another group's store")
+        super().add_internal(sprite)
+        store, slot = self.store, sprite.slot
+        order = store.schedule_order[slot]
+        if order >= 0:
+            # Shift the bee's clocks past the ticks it spent suspended
+            paused = self.tick - store.suspended_tick[slot]
+            store.birth_tick[slot] += paused
+            store.ready_tick[slot] += paused
+            if store.last_fire_tick[slot] >= 0:
+                store.last_fire_tick[slot] += paused
+        else:
+            order = self.next_order
+            self.next_order += 1
+            store.schedule_order[slot] = order
+            store.birth_tick[slot] = self.tick
+            store.ready_tick[slot] = self.tick
+            store.lod_slot[slot] = order % BEE_ANIMATION_LOD_INTERVAL
+        store.active[slot] = True
+        store.next_check[slot] = self.tick + 1
+        heapq.heappush(self.schedule, (self.tick + 1, order, slot))
+        self.active_slots = None
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.store.active[sprite.slot] = False
+        self.store.suspended_tick[sprite.slot] = self.tick
+        self.active_slots = None
+    
+    def snapshot(self):
+        """Return the group clock and the bees' columns as bytes sections"""
+        return (self.STATE.pack(self.tick, self.next_order),) + self.store.snapshot()
+    
+    def check(self, sections):
+        """Raise ValueError unless sections are a snapshot() of a group of the same bees"""
+        if not sections or len(sections[0]) != self.STATE.size:
+            raise ValueError("Snapshot bee group clock is malformed")
+        self.store.check(sections[1:])
+    
+    def restore(self, sections):
+        """Return every bee to a snapshot() of this group, membership and schedule included"""
+        self.check(sections)
+        self.tick, self.next_order = self.STATE.unpack(sections[0])
+        store = self.store
+        store.restore(sections[1:])
+        replace_members(self, (bee for bee in store.entities if store.active[bee.slot]))
+        self.active_slots = None
+        
+        # Only the member bees' latest entries are live, so the heap is rebuilt from the columns
+        self.schedule = [(store.next_check[slot], store.schedule_order[slot], slot)
+                         for slot in range(len(store)) if store.active[slot] and store.next_check[slot] >= 0]
+        heapq.heapify(self.schedule)
+        
+        # Frames are not stored; suspended bees show the pose their clocks stopped at
+        for slot in range(len(store)):
+            tick = self.tick if store.active[slot] else store.suspended_tick[slot]
+            flap_width, flap_height, _ = HiveGuardBee.pose(tick - store.birth_tick[slot])
+            store.image[slot] = HiveGuardBee.get_frame(flap_width, flap_height, bool(store.is_attacking[slot]))
+    
+    def sleep_ticks(self, player, distance_sq, attack_range):
+        """Return how many ticks the player certainly stays out of attack_range"""
+        if BEE_AI_MAX_SLEEP <= 1:
+            return 1
+        # Slack covers collision snapping, which can shift the player beyond its velocity
+        gap = math.sqrt(distance_sq) - attack_range - (player.width + player.height)
+        max_step = PLAYER_SPEED + max(abs(player.vel_y), abs(JUMP_STRENGTH)) + GRAVITY * BEE_AI_MAX_SLEEP
+        return max(1, min(BEE_AI_MAX_SLEEP, int(gap / max_step)))
+    
+    def update(self, player, stinger_group):
+        """Advance every bee by one tick: fire the ready bees in range and animate"""
+        self.tick = tick = self.tick + 1
+        store = self.store
+        player_center_x = player.x + player.width // 2
+        player_center_y = player.y + player.height // 2
+        
+        # Pop every bee due for a range check this tick
+        schedule = self.schedule
+        next_checks = store.next_check
+        active = store.active
+        due = []
+        while schedule and schedule[0][0] <= tick:
+            next_check, order, slot = heapq.heappop(schedule)
+            # Entries left behind by a suspended bee are stale
+            if next_check == next_checks[slot] and active[slot]:
+                next_checks[slot] = -1
+                due.append((order, slot))
+        
+        # Range-check them in one pass; a stable order keeps the stinger spawn order
+        due.sort()
+        xs, ys, attack_ranges = store.x, store.y, store.attack_range
+        ready_ticks, near = store.ready_tick, store.near
+        half_width, half_height = HiveGuardBee.width // 2, HiveGuardBee.height // 2
+        lod_distance_sq = BEE_ANIMATION_LOD_DISTANCE * BEE_ANIMATION_LOD_DISTANCE
+        for order, slot in due:
+            bee_center_x = xs[slot] + half_width
+            bee_center_y = ys[slot] + half_height
+            dx = player_center_x - bee_center_x
+            dy = player_center_y - bee_center_y
+            distance_sq = dx * dx + dy * dy
+            attack_range = attack_ranges[slot]
+            near[slot] = distance_sq <= lod_distance_sq
+            if distance_sq <= attack_range * attack_range:
+                # Shoot a stinger at the player and start the cooldown
+                stinger_group.spawn(bee_center_x, bee_center_y, player_center_x, player_center_y,
+                                    HiveGuardBee.projectile_speed)
+                ready_ticks[slot] = tick + HiveGuardBee.max_fire_cooldown
+                store.last_fire_tick[slot] = tick
+                near[slot] = True
+                next_check = ready_ticks[slot]
+            else:
+                next_check = max(ready_ticks[slot], tick + self.sleep_ticks(player, distance_sq, attack_range))
+            next_checks[slot] = next_check
+            heapq.heappush(schedule, (next_check, order, slot))
+        
+        # Nearby bees animate every tick, the rest on their staggered slot
+        if self.active_slots is None:
+            self.active_slots = [sprite.slot for sprite in self.sprites()]
+        lod_slot = tick % BEE_ANIMATION_LOD_INTERVAL
+        lod_slots, birth_ticks, last_fire_ticks = store.lod_slot, store.birth_tick, store.last_fire_tick
+        attacking_flags, images, hover_ys = store.is_attacking, store.image, store.hover_y
+        get_frame, get_pose = HiveGuardBee.get_frame, HiveGuardBee.pose
+        poses = {}  # animation_timer -> (flap width, flap height, hover_y), shared by bees born together
+        for slot in self.active_slots:
+            if not (near[slot] or lod_slots[slot] == lod_slot):
+                continue
+            animation_timer = tick - birth_ticks[slot]
+            pose = poses.get(animation_timer)
+            if pose is None:
+                pose = poses[animation_timer] = get_pose(animation_timer)
+            
+            # Attack animation runs for the ticks after the shot
+            last_fire_tick = last_fire_ticks[slot]
+            attacking = last_fire_tick >= 0 and 0 < tick - last_fire_tick <= HiveGuardBee.ATTACK_ANIMATION_TICKS
+            attacking_flags[slot] = attacking
+            images[slot] = get_frame(pose[0], pose[1], attacking)
+            hover_ys[slot] = pose[2]
 
 class DreamEssence(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    """A collectible, a thin view over its row in a DreamEssenceGroup's store"""
+    # Pre-rendered frames indexed by [hue_index][pulse_phase]
+    frame_table = None
+    original_image = None
+    width = 30
+    height = 30
+    SPARKLE_INTERVAL = 10  # Ticks between sparkle bursts
+    
+    COMPONENTS = (
+        ('x', 'd'), ('y', 'd'),
+        ('rect_y', 'q'),  # Top of the floating sprite this tick
+        ('prev_rect_y', 'q'),  # Top at the start of the last tick, for render interpolation
+        ('animation_timer', 'q'),
+        # Accumulated float and color offsets, kept here while the essence is suspended (see DreamEssenceGroup)
+        ('float_offset', 'd'), ('color_shift', 'd'),
+        ('collected', 'B'),  # Picked up by the player, never activated again
+        ('image', None),
+    )
+    
+    x = component('x')
+    y = component('y')
+    animation_timer = component('animation_timer')
+    collected = component('collected')
+    image = component('image')
+    
+    def __init__(self, x, y, store):
         super().__init__()
-        self.x = x
-        self.y = y
-        self.width = 30
-        self.height = 30
-        
-        # Animation properties
-        self.float_offset = 0
-        self.animation_timer = 0
-        self.sparkle_timer = 0
-        self.color_shift = 0
-        self.pulse_scale = 1.0
-        
-        # Load dream essence sprite
-        try:
-            self.original_image = pygame.image.load("assets/dreamessence.png").convert_alpha()
-            self.original_image = pygame.transform.scale(self.original_image, (self.width, self.height))
-        except pygame.error:
-            # Fallback to colored circle if image not found
-            self.original_image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            pygame.draw.circle(self.original_image, CYAN, (self.width//2, self.height//2), self.width//2)
-            print("Warning: dreamessence.png not found, using colored circle")
-        
-        self.image = self.original_image.copy()
-        self.rect = pygame.Rect(x, y, self.width, self.height)
+        # Sprite and hue/pulse frames are loaded once and shared by every essence
+        if DreamEssence.original_image is None:
+            try:
+                DreamEssence.original_image = asset_manager.get_image("assets/dreamessence.png",
+                                                                      (self.width, self.height))
+            except pygame.error:
+                # Fallback to colored circle if image not found
+                DreamEssence.original_image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+                pygame.draw.circle(DreamEssence.original_image, CYAN, (self.width//2, self.height//2),
+                                   self.width//2)
+                print("Warning: dreamessence.png not found, using colored circle")
+            DreamEssence.frame_table = DreamEssence.build_frame_table(self.original_image, self.width, self.height)
+        
+        self.store = store
+        self.slot = store.allocate(self, x=x, y=y, rect_y=y, prev_rect_y=y, image=self.original_image)
     
-    def update(self):
-        """Update dream essence with enhanced floating animation"""
-        self.animation_timer += 1
-        
-        # Floating animation - more complex movement
-        self.float_offset += 0.08
-        float_y = math.sin(self.float_offset) * 8 + math.sin(self.float_offset * 2) * 3
-        
-        # Update animation
-        self.update_animation()
-        
-        # Update rect position with float effect
-        self.rect.y = self.y + float_y
+    @property
+    def rect(self):
+        """The essence's current area, including the float offset"""
+        store, slot = self.store, self.slot
+        return pygame.Rect(int(store.x[slot]), store.rect_y[slot], self.width, self.height)
     
-    def update_animation(self):
-        """Update dream essence visual effects"""
+    @classmethod
+    def create_store(cls):
+        return ComponentStore(cls.COMPONENTS)
+    
+    @classmethod
+    def frame(cls, animation_timer, color_shift):
+        """Return the pre-rendered frame for an animation timer and color shift"""
         # Color shifting effect
-        self.color_shift += 0.1
+        hue = (color_shift * 50) % 360
+        hue_index = int(round(hue * ESSENCE_HUE_STEPS / 360)) % ESSENCE_HUE_STEPS
         
         # Pulsing scale effect
-        self.pulse_scale = 1.0 + math.sin(self.animation_timer * 0.15) * 0.2
-        
-        # Create base image with scaling
-        scaled_width = int(self.width * self.pulse_scale)
-        scaled_height = int(self.height * self.pulse_scale)
-        current_image = pygame.transform.scale(self.original_image, (scaled_width, scaled_height))
-        
-        # Add color tint cycling through rainbow colors
-        hue = (self.color_shift * 50) % 360
-        # Convert HSV to RGB for color cycling
-        import colorsys
-        r, g, b = colorsys.hsv_to_rgb(hue / 360, 0.7, 1.0)
-        tint_color = (int(r * 255), int(g * 255), int(b * 255), 100)
-        
-        # Apply color tint
-        tint_surface = pygame.Surface(current_image.get_size(), pygame.SRCALPHA)
-        tint_surface.fill(tint_color)
-        current_image.blit(tint_surface, (0, 0), special_flags=pygame.BLEND_ADD)
-        
-        # Add glow effect
-        glow_intensity = math.sin(self.animation_timer * 0.2) * 0.5 + 0.5
-        glow_surface = pygame.Surface(current_image.get_size(), pygame.SRCALPHA)
-        glow_surface.fill((255, 255, 255, int(50 * glow_intensity)))
-        current_image.blit(glow_surface, (0, 0), special_flags=pygame.BLEND_ADD)
-        
-        self.image = current_image
+        pulse_cycle = (animation_timer * 0.15) / (2 * math.pi)
+        pulse_phase = int(round(pulse_cycle * ESSENCE_PULSE_PHASES)) % ESSENCE_PULSE_PHASES
+        return cls.frame_table[hue_index][pulse_phase]
     
-    def draw(self, screen):
-        """Draw the dream essence with sparkle effects"""
-        # Draw sparkles around the essence
-        self.sparkle_timer += 1
-        if self.sparkle_timer % 10 == 0:  # Create sparkles every 10 frames
-            for _ in range(3):
-                sparkle_x = self.rect.centerx + random.randint(-25, 25)
-                sparkle_y = self.rect.centery + random.randint(-25, 25)
-                sparkle_size = random.randint(1, 3)
-                sparkle_color = (255, 255, 255, 150)
+    def float_bounds(self):
+        """Return the rect covering every position of the floating animation"""
+        # float_y stays within +-(8 + 3) pixels
+        return pygame.Rect(self.x, self.y - 12, self.width, self.height + 24)
+    
+    @classmethod
+    def build_frame_table(cls, original_image, width, height):
+        """Pre-render the tinted, glowing and pulsing frame for every quantized phase.
+        
+        Returns frame_table[hue_index][pulse_phase]. BLEND_ADD ignores the source
+        alpha, so the glow intensity never changes a frame and only the hue and
+        pulse phases key the table; frames that blend to the same result are shared.
+        """
+        frames = {}
+        frame_table = []
+        for hue_index in range(ESSENCE_HUE_STEPS):
+            # Color tint cycling through rainbow colors
+            r, g, b = colorsys.hsv_to_rgb(hue_index / ESSENCE_HUE_STEPS, 0.7, 1.0)
+            tint_color = (int(r * 255), int(g * 255), int(b * 255), 100)
+            
+            row = []
+            for pulse_phase in range(ESSENCE_PULSE_PHASES):
+                # Pulsing scale effect
+                pulse_scale = 1.0 + math.sin(2 * math.pi * pulse_phase / ESSENCE_PULSE_PHASES) * 0.2
+                size = (int(width * pulse_scale), int(height * pulse_scale))
                 
-                # Draw sparkle
-                sparkle_surface = pygame.Surface((sparkle_size * 2, sparkle_size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(sparkle_surface, sparkle_color, (sparkle_size, sparkle_size), sparkle_size)
-                screen.blit(sparkle_surface, (sparkle_x - sparkle_size, sparkle_y - sparkle_size))
-        
+                # BLEND_ADD saturates per channel, so frames only differ by what tint plus glow add up to
+                frame_key = (size, tuple(min(255, channel + 255) for channel in tint_color[:3]))
+                frame = frames.get(frame_key)
+                if frame is None:
+                    frame = pygame.transform.scale(original_image, size)
+                    
+                    # Apply color tint
+                    tint_surface = pygame.Surface(size, pygame.SRCALPHA)
+                    tint_surface.fill(tint_color)
+                    frame.blit(tint_surface, (0, 0), special_flags=pygame.BLEND_ADD)
+                    
+                    # Add glow effect
+                    glow_surface = pygame.Surface(size, pygame.SRCALPHA)
+                    glow_surface.fill((255, 255, 255, 50))
+                    frame.blit(glow_surface, (0, 0), special_flags=pygame.BLEND_ADD)
+                    frames[frame_key] = frame
+                row.append(frame)
+            frame_table.append(row)
+        return frame_table
+    
+    def emit_sparkles(self, particles):
+        """Queue the sparkle burst of the current tick, every SPARKLE_INTERVAL ticks, into the particle system"""
+        animation_timer = self.animation_timer
+        if animation_timer % self.SPARKLE_INTERVAL == 0:
+            center_x, center_y = self.rect.center
+            particles.emit_sparkle_burst(self.slot, animation_timer, center_x, center_y)
+    
+    def draw(self, screen, alpha=1.0, offset=(0, 0), tint_cycling=True):
+        """Draw the dream essence interpolated alpha through the last tick; without tint_cycling the hue stays fixed"""
+        store, slot = self.store, self.slot
+        image = store.image[slot] if tint_cycling else self.frame(store.animation_timer[slot], 0)
         # Draw main essence (centered due to scaling)
-        draw_x = self.rect.x - (self.image.get_width() - self.width) // 2
-        draw_y = self.rect.y - (self.image.get_height() - self.height) // 2
-        screen.blit(self.image, (draw_x, draw_y))
+        prev_rect_y = store.prev_rect_y[slot]
+        rect_y = prev_rect_y + (store.rect_y[slot] - prev_rect_y) * alpha
+        draw_x = int(store.x[slot]) - (image.get_width() - self.width) // 2 + offset[0]
+        draw_y = rect_y - (image.get_height() - self.height) // 2 + offset[1]
+        self.draw_offset = offset
+        self.draw_pos = (draw_x, draw_y)
+        screen.blit(image, self.draw_pos)
+    
+    def draw_bounds(self):
+        """Return the screen area covered by the last draw (sprite and sparkles)"""
+        bounds = pygame.Rect(self.draw_pos, self.image.get_size())
+        rect = self.rect
+        sparkle_area = pygame.Rect(rect.centerx - 28, rect.centery - 28, 56, 56).move(self.draw_offset)
+        return bounds.union(sparkle_area)
+
+class DreamEssenceGroup(pygame.sprite.Group):
+    """Sprite group of DreamEssences whose animation runs over the store columns.
+    
+    An essence's float, hue and pulse only depend on how many updates it has
+    had, so essences sharing an animation timer are kept together in a phase:
+    the offsets, trigonometry and frame lookup run once per phase, and each
+    essence only gets its own float position written back. A phase's offsets
+    are written to its essences' columns when they leave the group, so a
+    suspended essence resumes exactly where it stopped.
+    """
+    def __init__(self, *essences):
+        self.store = DreamEssence.create_store()
+        self.phases = {}  # animation_timer -> (float_offset, color_shift, member slots)
+        super().__init__(*essences)
+    
+    def add_internal(self, sprite, layer=None):
+        if sprite.store is not self.store:
+            raise ValueError("DreamEssence was created for another group's store")
+        super().add_internal(sprite)
+        store, slot = self.store, sprite.slot
+        animation_timer = store.animation_timer[slot]
+        phase = self.phases.get(animation_timer)
+        if phase is None:
+            phase = self.phases[animation_timer] = (store.float_offset[slot], store.color_shift[slot], [])
+        phase[2].append(slot)
+    
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        store, slot = self.store, sprite.slot
+        animation_timer = store.animation_timer[slot]
+        float_offset, color_shift, slots = self.phases[animation_timer]
+        store.float_offset[slot] = float_offset
+        store.color_shift[slot] = color_shift
+        slots.remove(slot)
+        if not slots:
+            del self.phases[animation_timer]
+    
+    def update(self):
+        """Advance the floating, color shifting and pulsing animation of every essence"""
+        store = self.store
+        ys, rect_ys, prev_rect_ys = store.y, store.rect_y, store.prev_rect_y
+        animation_timers, images = store.animation_timer, store.image
+        frame = DreamEssence.frame
+        phases = {}
+        for animation_timer, (float_offset, color_shift, slots) in self.phases.items():
+            animation_timer += 1
+            
+            # Floating animation - more complex movement
+            float_offset += 0.08
+            float_y = math.sin(float_offset) * 8 + math.sin(float_offset * 2) * 3
+            
+            # Color shifting and pulsing
+            color_shift += 0.1
+            image = frame(animation_timer, color_shift)
+            
+            for slot in slots:
+                animation_timers[slot] = animation_timer
+                images[slot] = image
+                prev_rect_ys[slot] = rect_ys[slot]
+                # Update rect position with float effect, rounded like a pygame.Rect
+                rect_y = ys[slot] + float_y
+                whole = int(rect_y)
+                if rect_y >= 0:
+                    rect_ys[slot] = whole + 1 if rect_y - whole >= 0.5 else whole
+                else:
+                    rect_ys[slot] = whole - 1 if whole - rect_y >= 0.5 else whole
+            phases[animation_timer] = (float_offset, color_shift, slots)
+        self.phases = phases
+    
+    def snapshot(self):
+        """Return the phases and the essences' columns as bytes sections"""
+        phases = array.array('d')
+        for animation_timer, (float_offset, color_shift, slots) in self.phases.items():
+            phases.extend((animation_timer, float_offset, color_shift, len(slots)))
+            phases.extend(slots)
+        return (phases.tobytes(),) + self.store.snapshot()
+    
+    def decode_phases(self, data):
+        """Return the phases of a snapshot() section, raising ValueError if they do not fit this group"""
+        if len(data) % 8:
+            raise ValueError("Snapshot essence phases are truncated")
+        state = array.array('d', data)
+        phases = {}
+        members = set()
+        i = 0
+        while i < len(state):
+            if i + 4 > len(state):
+                raise ValueError("Snapshot essence phases are truncated")
+            animation_timer, float_offset, color_shift, count = state[i:i + 4]
+            if not 0 < count <= len(state) - i - 4 or count != int(count):
+                raise ValueError("Snapshot essence phase has a bad member count")
+            slots = [int(slot) for slot in state[i + 4:i + 4 + int(count)]]
+            if not members.isdisjoint(slots) or not all(0 <= slot < len(self.store) for slot in slots):
+                raise ValueError("Snapshot essence phase has a bad member")
+            members.update(slots)
+            phases[int(animation_timer)] = (float_offset, color_shift, slots)
+            i += 4 + len(slots)
+        return phases
+    
+    def check(self, sections):
+        """Raise ValueError unless sections are a snapshot() of a group of the same essences"""
+        if not sections:
+            raise ValueError("Snapshot has no essence phases")
+        self.decode_phases(sections[0])
+        self.store.check(sections[1:])
+    
+    def restore(self, sections):
+        """Return every essence to a snapshot() of this group; the phases give the membership"""
+        self.check(sections)
+        store = self.store
+        store.restore(sections[1:])
+        phases = self.decode_phases(sections[0])
+        members = []
+        for animation_timer, (float_offset, color_shift, slots) in phases.items():
+            image = DreamEssence.frame(animation_timer, color_shift)
+            for slot in slots:
+                store.image[slot] = image
+            members += slots
+        replace_members(self, (store.entities[slot] for slot in sorted(members)))
+        self.phases = phases
 
 class Platform(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, color=GRAY):
@@ -546,10 +1706,104 @@ class Platform(pygame.sprite.Sprite):
         for i in range(0, height, 10):
             pygame.draw.line(self.image, LIGHT_GRAY, (0, i), (width, i), 1)
     
-    def draw(self, screen):
-        screen.blit(self.image, (self.x, self.y))
+    def draw(self, screen, offset=(0, 0)):
+        screen.blit(self.image, (self.x + offset[0], self.y + offset[1]))
+
+class SpatialHash:
+    """Uniform grid index over static rects for broadphase collision queries.
+    
+    Items need a ``rect`` attribute; an explicit (larger) bounds rect can be
+    given on insert for items that move within a known envelope. Query results
+    keep insertion order so collision resolution matches a plain list scan.
+    """
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}  # item -> insertion index
+        self.bounds = {}  # item -> indexed rect
+        self.next_order = 0
+    
+    def cell_keys(self, rect):
+        """Return the grid cells covered by rect"""
+        size = self.cell_size
+        return [(cx, cy)
+                for cx in range(rect.left // size, (rect.right - 1) // size + 1)
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+    
+    def insert(self, item, bounds=None):
+        bounds = pygame.Rect(item.rect if bounds is None else bounds)
+        self.bounds[item] = bounds
+        self.order[item] = self.next_order
+        self.next_order += 1
+        for key in self.cell_keys(bounds):
+            self.cells.setdefault(key, []).append(item)
+    
+    def __contains__(self, item):
+        return item in self.bounds
+    
+    def remove(self, item):
+        bounds = self.bounds.pop(item, None)
+        if bounds is None:
+            return
+        del self.order[item]
+        for key in self.cell_keys(bounds):
+            self.cells[key].remove(item)
+    
+    def query(self, rect, item_type=None):
+        """Return indexed items in the cells around rect (broadphase only)"""
+        found = set()
+        cells = self.cells
+        for key in self.cell_keys(rect):
+            items = cells.get(key)
+            if items:
+                found.update(items)
+        if item_type is not None:
+            found = [item for item in found if isinstance(item, item_type)]
+        return sorted(found, key=self.order.__getitem__)
+    
+    def cell_contents(self, items):
+        """Return {cell: [position in items]} for serializing the grid"""
+        positions = {item: position for position, item in enumerate(items)}
+        return {key: [positions[item] for item in cell_items] for key, cell_items in self.cells.items() if cell_items}
+    
+    @classmethod
+    def from_cells(cls, cell_size, items, cell_contents):
+        """Rebuild an index over items from a grid saved with cell_contents"""
+        index = cls(cell_size)
+        for item in items:
+            index.bounds[item] = pygame.Rect(item.rect)
+            index.order[item] = index.next_order
+            index.next_order += 1
+        index.cells = {key: [items[position] for position in positions]
+                       for key, positions in cell_contents.items()}
+        return index
+    
+    def items(self, item_type=None):
+        """Return all indexed items in insertion order"""
+        items = sorted(self.order, key=self.order.__getitem__)
+        if item_type is not None:
+            items = [item for item in items if isinstance(item, item_type)]
+        return items
+    
+    def query_many(self, rects, item_type=None):
+        """Broadphase query for many rects at once, one candidate list per rect"""
+        return [self.query(rect, item_type) for rect in rects]
+    
+    def first_collisions(self, rects, item_type=None):
+        """Return the first indexed item colliding with each rect, or None"""
+        hits = []
+        for rect, candidates in zip(rects, self.query_many(rects, item_type)):
+            hit = None
+            for item in candidates:
+                if rect.colliderect(item.rect):
+                    hit = item
+                    break
+            hits.append(hit)
+        return hits
 
 class PuzzleBlock:
+    label_image = None  # "PUZZLE" text, rendered once
+    
     def __init__(self, x, y, width, height):
         self.x = x
         self.y = y
@@ -577,41 +1831,428 @@ class PuzzleBlock:
         
         if on_top and horizontal_overlap:
             self.activated = True
-            print("Puzzle activated! Player is standing on the red block!")
         else:
             self.activated = False
     
-    def draw(self, screen):
-        color = YELLOW if self.activated else RED
-        pygame.draw.rect(screen, color, self.rect)
+    def draw_block(self, surface, color, offset=(0, 0)):
+        rect = self.rect.move(offset)
+        pygame.draw.rect(surface, color, rect)
         
         # Draw puzzle pattern
-        pygame.draw.line(screen, BLACK, 
-                        (self.x, self.y), 
-                        (self.x + self.width, self.y + self.height), 3)
-        pygame.draw.line(screen, BLACK, 
-                        (self.x + self.width, self.y), 
-                        (self.x, self.y + self.height), 3)
+        pygame.draw.line(surface, BLACK, 
+                        rect.topleft, 
+                        (rect.x + self.width, rect.y + self.height), 3)
+        pygame.draw.line(surface, BLACK, 
+                        (rect.x + self.width, rect.y), 
+                        (rect.x, rect.y + self.height), 3)
+    
+    def draw_static(self, surface, offset=(0, 0)):
+        """Draw the fixed parts (inactive block and pattern) onto the static level layer"""
+        self.draw_block(surface, RED, offset)
+    
+    def draw(self, screen, offset=(0, 0), tick=0.0):
+        """Draw the state-dependent parts on top of the static level layer, pulsing at simulation time tick"""
+        self.draw_offset = offset
+        if self.activated:
+            self.draw_block(screen, YELLOW, offset)
         
         # Add pulsing effect when not activated to make it more noticeable
         if not self.activated:
-            import time
-            pulse = int(abs(math.sin(time.time() * 3)) * 50)  # Pulsing brightness
+            # Pulsing brightness, driven by the tick so a replay or a seeded env draws the same frames
+            pulse = int(abs(math.sin(tick * 3 / SIMULATION_HZ)) * 50)
             pulse_color = (255, pulse, pulse)  # Red with pulsing green/blue
-            pygame.draw.rect(screen, pulse_color, self.rect, 3)
+            pygame.draw.rect(screen, pulse_color, self.rect.move(offset), 3)
             
             # Add "PUZZLE" text above the block
-            font = pygame.font.Font(None, 20)
-            text = font.render("PUZZLE", True, BLACK)
-            screen.blit(text, (self.x - 5, self.y - 25))
+            if PuzzleBlock.label_image is None:
+                PuzzleBlock.label_image = asset_manager.get_font(20).render("PUZZLE", True, BLACK)
+            screen.blit(PuzzleBlock.label_image, (self.x - 5 + offset[0], self.y - 25 + offset[1]))
+    
+    def draw_bounds(self):
+        """Return the screen area covered by the last draw (block and label)"""
+        bounds = self.rect.inflate(4, 4)
+        if PuzzleBlock.label_image is not None:
+            bounds.union_ip(pygame.Rect((self.x - 5, self.y - 25), PuzzleBlock.label_image.get_size()))
+        return bounds.move(self.draw_offset)
+
+class HUD:
+    """Heads-up display that caches fonts, rendered labels and composed panels.
+    
+    Labels are keyed by text, color and size, and the composed panels are only
+    rebuilt when the values shown on them change.
+    """
+    OUTLINE_OFFSETS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    INSTRUCTIONS = [
+        "ARROW KEYS/WASD: Move and Jump",
+        "Collect Dream Essences! Avoid bee stingers!",
+        "Stand on RED BLOCK to complete level!",
+        "R: Restart | BACKSPACE: Rewind | F5/F9: Save/Load | ESC: Quit"
+    ]
+    MAX_CACHED_LABELS = 256
+    
+    def __init__(self):
+        self.labels = {}
+        self.status_panel = None
+        self.status_state = None
+        self.level_panel = None
+        self.level_state = None
+        self.overlays = {}
+        self.changed = True  # Set whenever a panel is rebuilt, cleared by the renderer
+    
+    def render_label(self, text, color, size=20, outlined=True):
+        """Return a cached label surface; outlined labels carry a 1px border on every side"""
+        key = (text, color, size, outlined)
+        label = self.labels.get(key)
+        if label is None:
+            if len(self.labels) >= self.MAX_CACHED_LABELS:
+                self.labels.clear()
+            font = asset_manager.get_font(size)
+            text_surface = font.render(text, True, color)
+            if outlined:
+                # Add black outline for better visibility
+                outline_surface = font.render(text, True, BLACK)
+                width, height = text_surface.get_size()
+                label = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+                for dx, dy in self.OUTLINE_OFFSETS:
+                    label.blit(outline_surface, (1 + dx, 1 + dy))
+                label.blit(text_surface, (1, 1))
+            else:
+                label = text_surface
+            self.labels[key] = label
+        return label
+    
+    def compose(self, placed_labels):
+        """Compose (label, (x, y)) pairs into one transparent panel anchored at (0, 0)"""
+        width = max(x + label.get_width() for label, (x, y) in placed_labels)
+        height = max(y + label.get_height() for label, (x, y) in placed_labels)
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        for label, pos in placed_labels:
+            panel.blit(label, pos)
+        return panel
+    
+    def draw(self, screen, world):
+        """Draw the HUD, rebuilding only the panels whose values changed.
+        
+        Returns the screen rects covered by the HUD this frame.
+        """
+        level_data = world.level_data
+        current_level = world.current_level
+        puzzle_block = world.puzzle_block
+        level_complete_timer = world.level_complete_timer
+        player = world.player
+        # Draw level information and progress
+        level_state = (level_data['level_name'], current_level)
+        if level_state != self.level_state:
+            self.level_panel = self.compose([
+                (self.render_label(level_data['level_name'], BLACK, 32, outlined=False), (0, 0)),
+                (self.render_label(f"Level {current_level}/{MAX_LEVELS}", BLACK, 32, outlined=False), (0, 35)),
+            ])
+            self.level_state = level_state
+            self.changed = True
+        drawn_rects = [screen.blit(self.level_panel, (SCREEN_WIDTH - 250, 10))]
+        
+        # Show puzzle status with clearer messaging
+        puzzle_status = None
+        status_color = None
+        if puzzle_block:
+            if puzzle_block.activated:
+                if level_complete_timer > 0:
+                    puzzle_status = f"🎉 Level {current_level} Complete! Next level in {3 - level_complete_timer//60}..."
+                else:
+                    puzzle_status = "🎉 PUZZLE SOLVED! Great job! 🎉"
+                status_color = GREEN
+            else:
+                puzzle_status = "❌ PUZZLE: Find and stand on the RED BLOCK!"
+                status_color = RED
+        
+        # Instructions, dream essence count, puzzle status and player health
+        health_color = GREEN if player.health > 50 else RED
+        dream_essence_count = world.dream_essence_count
+        status_state = (dream_essence_count, puzzle_status, status_color,
+                        player.health, player.max_health, health_color)
+        if status_state != self.status_state:
+            # Outlined labels are offset by their 1px border
+            placed_labels = [(self.render_label(instruction, WHITE), (9, 9 + i * 22))
+                             for i, instruction in enumerate(self.INSTRUCTIONS)]
+            placed_labels.append((self.render_label(f"Dream Essences: {dream_essence_count}", CYAN), (9, 99)))
+            if puzzle_status is not None:
+                placed_labels.append((self.render_label(puzzle_status, status_color), (9, 124)))
+            placed_labels.append((self.render_label(f"Health: {player.health}/{player.max_health}", health_color),
+                                  (9, 149)))
+            self.status_panel = self.compose(placed_labels)
+            self.status_state = status_state
+            self.changed = True
+        drawn_rects.append(screen.blit(self.status_panel, (0, 0)))
+        
+        # Show game over if player is dead
+        if world.game_over or player.health <= 0:
+            drawn_rects.append(screen.blit(self.get_overlay('game_over'), (0, 0)))
+        # Show game complete screen
+        elif world.game_complete:
+            drawn_rects.append(screen.blit(self.get_overlay('game_complete'), (0, 0)))
+        
+        return drawn_rects
+    
+    def get_overlay(self, name):
+        """Return the cached full-screen game over or game complete overlay"""
+        overlay = self.overlays.get(name)
+        if overlay is not None:
+            return overlay
+        
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        if name == 'game_over':
+            # Semi-transparent overlay
+            overlay.fill((*BLACK, 128))
+            texts = [
+                ("GAME OVER!", RED, 72, 0),
+                # Show restart instruction
+                ("Press R to Restart Level | Press N for New Game", WHITE, 36, 60),
+            ]
+        else:
+            texts = [
+                ("CONGRATULATIONS!", GREEN, 64, -50),
+                ("You completed all levels!", BLACK, 36, 0),
+                ("Press N for New Game", BLUE, 36, 50),
+            ]
+        for text, color, size, offset_y in texts:
+            text_surface = self.render_label(text, color, size, outlined=False)
+            text_rect = text_surface.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + offset_y))
+            overlay.blit(text_surface, text_rect)
+        
+        self.overlays[name] = overlay
+        return overlay
+
+class DirtyRectRenderer:
+    """Optional renderer that only redraws and presents the screen areas that change.
+    
+    Each frame the areas drawn on the previous frame are restored from the
+    level's static layer (see build_static_layer), and only
+    those plus the newly drawn areas are pushed with pygame.display.update.
+    A scrolling camera moves everything, so frames where the view moved are
+    redrawn in full.
+    """
+    def __init__(self):
+        self.static_layer = None
+        self.view_topleft = None
+        self.previous_rects = []
+        self.full_redraw = True
+        self.screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    
+    def restore(self, screen, static_layer, view_topleft=(0, 0)):
+        """Erase last frame's moving entities, or redraw everything after a level change or scroll"""
+        if static_layer is not self.static_layer or view_topleft != self.view_topleft:
+            self.static_layer = static_layer
+            self.view_topleft = view_topleft
+            self.full_redraw = True
+        
+        if self.full_redraw:
+            screen.blit(static_layer, (0, 0))
+        else:
+            for rect in self.previous_rects:
+                screen.blit(static_layer, rect, rect)
+    
+    def present(self, entities, hud, hud_rects, overlay):
+        """Push the changed areas to the display; overlays force a full update"""
+        drawn_rects = []
+        for entity in entities:
+            rect = entity.draw_bounds().inflate(2, 2).clip(self.screen_rect)
+            if rect.width and rect.height:
+                drawn_rects.append(rect)
+        
+        if self.full_redraw or overlay:
+            pygame.display.flip()
+        else:
+            # HUD areas are redrawn every frame but only need presenting when they change
+            update_rects = self.previous_rects + drawn_rects
+            if hud.changed:
+                update_rects += hud_rects
+            pygame.display.update(update_rects)
+        
+        hud.changed = False
+        self.previous_rects = drawn_rects + [rect.clip(self.screen_rect) for rect in hud_rects]
+        # Semi-transparent overlays cover the whole screen, so restore all of it next frame
+        self.full_redraw = overlay
+
+class FrameProfiler:
+    """Per-phase frame timings with rolling percentiles, an overlay and CSV/JSON export.
+    
+    lap(phase) charges the time since the previous lap (or start()) to a phase,
+    summed over all simulation ticks of the frame, and end_frame() stores the
+    frame's totals in fixed-size ring buffers. Callers only keep a reference
+    while profiling is on, so a disabled profiler costs a None check per phase.
+    """
+    PHASES = ("events", "player", "bees", "stingers", "essences", "collisions", "snapshot",
+              "draw_world", "draw_hud", "flip")
+    COLUMNS = PHASES + ("total",)
+    QUANTILES = (50, 95, 99)
+    
+    def __init__(self, history=PROFILER_HISTORY):
+        self.history = history
+        self.samples = {column: array.array('d', bytes(8 * history)) for column in self.COLUMNS}  # ms
+        self.frame_totals = dict.fromkeys(self.PHASES, 0.0)
+        self.frames = 0  # Frames recorded since the profiler was created
+        self.counts = {}  # Entity counts of the last recorded frame
+        self.last_lap = time.perf_counter()
+        self.overlay = None
+        self.overlay_frame = None
+    
+    def start(self):
+        """Restart the lap clock, leaving the time since the last lap uncounted"""
+        self.last_lap = time.perf_counter()
+    
+    def lap(self, phase):
+        """Charge the time since the previous lap to phase"""
+        now = time.perf_counter()
+        self.frame_totals[phase] += now - self.last_lap
+        self.last_lap = now
+    
+    def end_frame(self, counts):
+        """Store this frame's phase totals and entity counts"""
+        slot = self.frames % self.history
+        total = 0.0
+        for phase, seconds in self.frame_totals.items():
+            self.samples[phase][slot] = seconds * 1000
+            self.frame_totals[phase] = 0.0
+            total += seconds
+        self.samples["total"][slot] = total * 1000
+        self.frames += 1
+        self.counts = counts
+    
+    def recent(self, column):
+        """Return the recorded samples of a column in ms, oldest first"""
+        samples = self.samples[column]
+        if self.frames <= self.history:
+            return samples[:self.frames]
+        slot = self.frames % self.history
+        return samples[slot:] + samples[:slot]
+    
+    def percentiles(self, column):
+        """Return the (p50, p95, p99) frame time of a column in ms"""
+        values = sorted(self.recent(column))
+        if not values:
+            return tuple(0.0 for _ in self.QUANTILES)
+        return tuple(values[min(len(values) - 1, len(values) * q // 100)] for q in self.QUANTILES)
+    
+    def summary(self):
+        """Return {column: {"p50": ms, "p95": ms, "p99": ms}} over the recorded frames"""
+        return {column: dict(zip((f"p{q}" for q in self.QUANTILES), self.percentiles(column)))
+                for column in self.COLUMNS}
+    
+    def export(self, path=PROFILER_EXPORT_PATH):
+        """Write the recorded frames to path as JSON if it ends in .json, CSV otherwise"""
+        first_frame = max(0, self.frames - self.history)
+        columns = {column: self.recent(column) for column in self.COLUMNS}
+        with open(path, "w", newline="") as f:
+            if path.endswith(".json"):
+                json.dump({
+                    "summary": self.summary(),
+                    "counts": self.counts,
+                    "frames": [dict({"frame": first_frame + i},
+                                    **{column: columns[column][i] for column in self.COLUMNS})
+                               for i in range(len(columns["total"]))],
+                }, f, indent=2)
+            else:
+                f.write(",".join(("frame",) + self.COLUMNS) + "\n")
+                for i in range(len(columns["total"])):
+                    f.write(",".join([str(first_frame + i)] +
+                                     [f"{columns[column][i]:.4f}" for column in self.COLUMNS]) + "\n")
+        print(f"Frame profile written to {path}")
+    
+    def draw(self, screen):
+        """Draw the percentile overlay in the bottom-left corner, rebuilt every PROFILER_OVERLAY_REFRESH frames.
+        
+        Returns the screen rect covered and whether the overlay was rebuilt.
+        """
+        rebuilt = False
+        if self.overlay is None or self.frames - self.overlay_frame >= PROFILER_OVERLAY_REFRESH:
+            font = asset_manager.get_font(18)
+            rows = [("phase ms", "p50", "p95", "p99")]
+            rows += [(column, *(f"{ms:.2f}" for ms in self.percentiles(column))) for column in self.COLUMNS]
+            counts_label = font.render("  ".join(f"{name} {count}" for name, count in self.counts.items()),
+                                       True, WHITE)
+            width = max(250, counts_label.get_width() + 10)
+            self.overlay = pygame.Surface((width, (len(rows) + 1) * 16 + 8), pygame.SRCALPHA)
+            self.overlay.fill((*BLACK, 160))
+            for i, row in enumerate(rows):
+                y = 4 + i * 16
+                self.overlay.blit(font.render(row[0], True, WHITE), (5, y))
+                # Right-align the values in fixed columns
+                for j, cell in enumerate(row[1:]):
+                    label = font.render(cell, True, WHITE)
+                    self.overlay.blit(label, (130 + j * 55 - label.get_width(), y))
+            self.overlay.blit(counts_label, (5, 4 + len(rows) * 16))
+            self.overlay_frame = self.frames
+            rebuilt = True
+        return screen.blit(self.overlay, (0, SCREEN_HEIGHT - self.overlay.get_height())), rebuilt
 
-def load_background():
+class EffectQuality:
+    """Settings of the purely visual effects for one quality tier"""
+    __slots__ = ('name', 'trail_length', 'sparkles', 'tint_cycling', 'idle_breathing')
+    
+    def __init__(self, name, trail_length, sparkles, tint_cycling, idle_breathing):
+        self.name = name
+        self.trail_length = trail_length  # Stinger trail positions drawn, at most ParticleSystem.TRAIL_LENGTH
+        self.sparkles = sparkles  # Essence sparkles
+        self.tint_cycling = tint_cycling  # Essence hue cycling, frozen when off
+        self.idle_breathing = idle_breathing  # Player breathing scale while idle
+
+# Effect quality tiers, best first
+QUALITY_TIERS = (
+    EffectQuality("high", trail_length=8, sparkles=True, tint_cycling=True, idle_breathing=True),
+    EffectQuality("medium", trail_length=5, sparkles=True, tint_cycling=True, idle_breathing=False),
+    EffectQuality("low", trail_length=3, sparkles=False, tint_cycling=True, idle_breathing=False),
+    EffectQuality("minimal", trail_length=2, sparkles=False, tint_cycling=False, idle_breathing=False),
+)
+
+class QualityGovernor:
+    """Steps the effect quality through QUALITY_TIERS to keep frames inside the 60 FPS budget.
+    
+    record() takes each frame's work time, without the frame cap's sleep. A
+    tier is dropped once the last QUALITY_DOWNGRADE_FRAMES frames average
+    over budget, and only restored after QUALITY_UPGRADE_FRAMES frames
+    averaging under QUALITY_UPGRADE_HEADROOM of it; the gap between the two
+    keeps the quality from flapping. Both windows restart on a tier change.
+    """
+    def __init__(self, tiers=QUALITY_TIERS, budget=QUALITY_FRAME_BUDGET):
+        self.tiers = tiers
+        self.budget = budget
+        self.tier = 0
+        self.samples = array.array('d', bytes(8 * max(QUALITY_DOWNGRADE_FRAMES, QUALITY_UPGRADE_FRAMES)))
+        self.frames = 0  # Frames recorded since the last tier change
+    
+    @property
+    def quality(self):
+        return self.tiers[self.tier]
+    
+    def average(self, frames):
+        """Return the mean work time of the last frames recorded frames"""
+        end = self.frames % len(self.samples)
+        if frames <= end:
+            window = self.samples[end - frames:end]
+        else:
+            window = self.samples[end - frames:] + self.samples[:end]
+        return sum(window) / frames
+    
+    def record(self, seconds):
+        """Record one frame's work time and return True if the quality tier changed"""
+        self.samples[self.frames % len(self.samples)] = seconds
+        self.frames += 1
+        if (self.tier < len(self.tiers) - 1 and self.frames >= QUALITY_DOWNGRADE_FRAMES and
+                self.average(QUALITY_DOWNGRADE_FRAMES) > self.budget):
+            self.tier += 1
+        elif (self.tier > 0 and self.frames >= QUALITY_UPGRADE_FRAMES and
+                self.average(QUALITY_UPGRADE_FRAMES) < self.budget * QUALITY_UPGRADE_HEADROOM):
+            self.tier -= 1
+        else:
+            return False
+        self.frames = 0
+        return True
+
+def load_background(path=DEFAULT_BACKGROUND):
     """Load and scale background image"""
     try:
         # Try to load the space-themed background
-        background = pygame.image.load("assets/pRSfmIss.jpeg").convert()
-        background = pygame.transform.scale(background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        return background
+        return asset_manager.get_image(path, (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
     except pygame.error:
         print("Warning: Background image not found, using gradient background")
         # Create a gradient background as fallback
@@ -623,116 +2264,374 @@ def load_background():
             pygame.draw.line(background, color, (0, y), (SCREEN_WIDTH, y))
         return background
 
+def build_static_layer(background, platforms, puzzle_block, area=None):
+    """Composite the immutable level geometry into one display-format surface.
+    
+    area is the world rect to render, the first screen by default; the
+    background is tiled across the level from its top-left corner.
+    """
+    if area is None:
+        area = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    if area.size == background.get_size() and area.topleft == (0, 0):
+        static_layer = background.copy()
+    else:
+        static_layer = pygame.Surface(area.size, 0, background)
+        tile_width, tile_height = background.get_size()
+        for tile_x in range(area.left - area.left % tile_width, area.right, tile_width):
+            for tile_y in range(area.top - area.top % tile_height, area.bottom, tile_height):
+                static_layer.blit(background, (tile_x - area.left, tile_y - area.top))
+    offset = (-area.left, -area.top)
+    for platform in platforms:
+        platform.draw(static_layer, offset)
+    if puzzle_block:
+        puzzle_block.draw_static(static_layer, offset)
+    return static_layer
+
+class Camera:
+    """Screen-sized view into the level that follows the player.
+    
+    follow() is called once per simulation tick, so the view that decides
+    which chunks are loaded is deterministic; view(alpha) interpolates
+    between the last two ticks for drawing, like the entities themselves.
+    """
+    def __init__(self, world_width, world_height, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.world_rect = pygame.Rect(0, 0, world_width, world_height)
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.prev_topleft = self.rect.topleft
+    
+    def follow(self, x, y, snap=False):
+        """Center the view on world point (x, y), kept inside the level; snap skips interpolation"""
+        self.prev_topleft = self.rect.topleft
+        self.rect.center = (round(x), round(y))
+        # Levels smaller than the view are centered on it
+        self.rect.clamp_ip(self.world_rect)
+        if snap:
+            self.prev_topleft = self.rect.topleft
+    
+    def view(self, alpha=1.0):
+        """Return the view rect interpolated alpha of the way through the last tick"""
+        prev_x, prev_y = self.prev_topleft
+        return pygame.Rect(round(prev_x + (self.rect.x - prev_x) * alpha),
+                           round(prev_y + (self.rect.y - prev_y) * alpha), self.rect.width, self.rect.height)
+
+class LevelChunk:
+    """One CHUNK_SIZE square of the level and the entities that start in it"""
+    def __init__(self, key, rect):
+        self.key = key
+        self.rect = rect  # World area covered, clipped to the level
+        self.bees = []
+        self.essences = []
+
+class ChunkStreamer:
+    """Splits a level into CHUNK_SIZE squares and keeps only those near the view live.
+    
+    Chunks within CHUNK_LOAD_MARGIN of the camera view are active: their bees
+    and dream essences are members of the level's sprite groups, so they are
+    updated and drawn. Chunks that fall out of range are suspended; their
+    entities leave the groups with their state intact and pick up where they
+    left off when the chunk is activated again. The static layer of each
+    chunk is rendered on first sight and kept in an LRU cache of
+    CHUNK_CACHE_CAPACITY surfaces, so drawing memory follows the visible area
+    rather than the level size.
+    """
+    RENDER_PADDING = 4  # Pixels rendered past a chunk's edges, more than any outline reaches
+    
+    def __init__(self, world_size, collision_index, puzzle_block, bees, essences, hive_guard_bees, dream_essences,
+                 background=None, chunk_size=CHUNK_SIZE, capacity=CHUNK_CACHE_CAPACITY):
+        self.world_rect = pygame.Rect((0, 0), world_size)
+        self.collision_index = collision_index
+        self.puzzle_block = puzzle_block
+        self.hive_guard_bees = hive_guard_bees
+        self.dream_essences = dream_essences
+        self.background = background  # None for headless levels, which are never drawn
+        self.chunk_size = chunk_size
+        self.capacity = capacity
+        self.surfaces = {}  # key -> rendered static layer, least recently used first
+        self.view_surface = None
+        self.view_topleft = None
+        self.hits = 0
+        self.misses = 0
+        
+        # Every chunk starts suspended, holding the entities placed in it
+        self.chunks = {key: LevelChunk(key, self.chunk_rect(key)) for key in self.chunk_keys(self.world_rect)}
+        self.order = {}  # entity -> position in the level, so activation keeps level order
+        for bee in bees:
+            self.order[bee] = len(self.order)
+            self.chunk_at(bee.rect.center).bees.append(bee)
+        for essence in essences:
+            self.order[essence] = len(self.order)
+            self.chunk_at(essence.rect.center).essences.append(essence)
+        self.active = set()
+        self.active_rect = pygame.Rect(0, 0, 0, 0)
+    
+    def chunk_keys(self, rect):
+        """Return the keys of the chunks overlapping rect, row by row"""
+        rect = rect.clip(self.world_rect)
+        if not rect.width or not rect.height:
+            return []
+        size = self.chunk_size
+        return [(cx, cy)
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1)
+                for cx in range(rect.left // size, (rect.right - 1) // size + 1)]
+    
+    def chunk_rect(self, key):
+        size = self.chunk_size
+        return pygame.Rect(key[0] * size, key[1] * size, size, size).clip(self.world_rect)
+    
+    def chunk_at(self, point):
+        """Return the chunk holding a world point, clamped into the level"""
+        size = self.chunk_size
+        x = min(max(int(point[0]), 0), self.world_rect.right - 1)
+        y = min(max(int(point[1]), 0), self.world_rect.bottom - 1)
+        return self.chunks[(x // size, y // size)]
+    
+    def update(self, view_rect):
+        """Activate the chunks near view_rect, suspend the others and return the active area"""
+        keys = set(self.chunk_keys(view_rect.inflate(2 * CHUNK_LOAD_MARGIN, 2 * CHUNK_LOAD_MARGIN)))
+        if keys == self.active:
+            return self.active_rect
+        for key in self.active - keys:
+            self.suspend(self.chunks[key])
+        activated = [self.chunks[key] for key in keys - self.active]
+        bees = sorted((bee for chunk in activated for bee in chunk.bees), key=self.order.__getitem__)
+        essences = sorted((essence for chunk in activated for essence in chunk.essences if not essence.collected),
+                          key=self.order.__getitem__)
+        self.hive_guard_bees.add(*bees)
+        self.dream_essences.add(*essences)
+        self.active = keys
+        self.active_rect = self.area(keys)
+        return self.active_rect
+    
+    def area(self, keys):
+        """Return the bounding box of the given chunks, the area stingers may fly in"""
+        area = None
+        for key in keys:
+            rect = self.chunks[key].rect
+            area = rect.copy() if area is None else area.union(rect)
+        return area or pygame.Rect(0, 0, 0, 0)
+    
+    def restore(self, view_rect):
+        """Mark the chunks near view_rect active after a snapshot restored the groups' members"""
+        self.active = set(self.chunk_keys(view_rect.inflate(2 * CHUNK_LOAD_MARGIN, 2 * CHUNK_LOAD_MARGIN)))
+        self.active_rect = self.area(self.active)
+        return self.active_rect
+    
+    def suspend(self, chunk):
+        """Take a chunk's entities out of the live groups"""
+        self.hive_guard_bees.remove(*chunk.bees)
+        self.dream_essences.remove(*chunk.essences)
+    
+    def chunk_surface(self, key):
+        """Return the rendered static layer of a chunk, rendering it on a cache miss"""
+        surface = self.surfaces.pop(key, None)
+        if surface is None:
+            self.misses += 1
+            if len(self.surfaces) >= self.capacity:
+                del self.surfaces[next(iter(self.surfaces))]
+            # Render with padding past the chunk's inner edges so outlines clip as in an unsplit level
+            rect = self.chunks[key].rect
+            area = rect.inflate(2 * self.RENDER_PADDING, 2 * self.RENDER_PADDING).clip(self.world_rect)
+            platforms = [platform for platform in self.collision_index.query(area, Platform)
+                         if platform.rect.colliderect(area)]
+            puzzle_block = self.puzzle_block if self.puzzle_block and self.puzzle_block.rect.colliderect(area) \
+                else None
+            layer = build_static_layer(self.background, platforms, puzzle_block, area)
+            surface = layer.subsurface(rect.move(-area.x, -area.y)).copy()
+        else:
+            self.hits += 1
+        self.surfaces[key] = surface
+        return surface
+    
+    def prerender(self, view_rect):
+        """Render the static layers of the chunks under view_rect ahead of time"""
+        for key in self.chunk_keys(view_rect):
+            self.chunk_surface(key)
+    
+    def view_layer(self, view_rect):
+        """Return a screen-sized static layer for view_rect, rebuilt only when the view moves"""
+        if self.view_surface is None or view_rect.topleft != self.view_topleft:
+            if self.view_surface is None:
+                self.view_surface = pygame.Surface(view_rect.size, 0, self.background)
+            if not self.world_rect.contains(view_rect):
+                self.view_surface.fill(BLACK)
+            for key in self.chunk_keys(view_rect):
+                rect = self.chunks[key].rect
+                self.view_surface.blit(self.chunk_surface(key), (rect.x - view_rect.x, rect.y - view_rect.y))
+            self.view_topleft = view_rect.topleft
+        return self.view_surface
+    
+    def invalidate(self):
+        """Drop every rendered surface after the level geometry changed"""
+        self.surfaces.clear()
+        self.view_surface = None
+    
+    def stats(self):
+        return {'chunks': len(self.chunks), 'active': len(self.active), 'surfaces': len(self.surfaces),
+                'hits': self.hits, 'misses': self.misses}
+
+# Compiled level layout: header, then the level body.
+# Header: magic, version, grid cell size, source SHA-256, source mtime_ns and size, body length
+LEVEL_CACHE_MAGIC = b"LVLC"
+LEVEL_CACHE_VERSION = 3
+LEVEL_CACHE_HEADER = struct.Struct("<4sHH32sqqI")
+
+def count_levels():
+    """Count the consecutive level_<n>.json files in LEVELS_DIR"""
+    count = 0
+    while os.path.exists(os.path.join(LEVELS_DIR, f"level_{count + 1}.json")):
+        count += 1
+    return count
+
+MAX_LEVELS = count_levels()
+
+def compile_level(source, cell_size=SPATIAL_HASH_CELL_SIZE):
+    """Compile a JSON level source into the packed binary level body.
+    
+    Besides the level contents, the body carries the static layer background
+    and the broadphase grid over the platforms and puzzle block, so loading
+    does not need to rebuild it.
+    """
+    level = json.loads(source)
+    platforms = [tuple(platform) for platform in level['platforms']]
+    puzzle = level.get('puzzle')
+    
+    # Precompute the collision grid; the puzzle block is indexed after the platforms
+    collision_items = [Platform(*platform) for platform in platforms]
+    if puzzle:
+        collision_items.append(PuzzleBlock(*puzzle))
+    collision_index = SpatialHash(cell_size)
+    for item in collision_items:
+        collision_index.insert(item)
+    cells = collision_index.cell_contents(collision_items)
+    
+    parts = []
+    for text in (level['name'], level.get('background', DEFAULT_BACKGROUND)):
+        encoded = text.encode("utf-8")
+        parts.append(struct.pack("<H", len(encoded)) + encoded)
+    parts.append(struct.pack("<2i3B", *level['player_start'], *level.get('background_color', WHITE)))
+    parts.append(struct.pack("<2i", *level.get('size', (SCREEN_WIDTH, SCREEN_HEIGHT))))
+    parts.append(struct.pack("<B4i", bool(puzzle), *(puzzle or (0, 0, 0, 0))))
+    parts.append(struct.pack("<H", len(platforms)) + b"".join(struct.pack("<4i", *p) for p in platforms))
+    for key in ('bees', 'dream_essences'):
+        positions = level.get(key, [])
+        parts.append(struct.pack("<H", len(positions)) + b"".join(struct.pack("<2i", *pos) for pos in positions))
+    parts.append(struct.pack("<I", len(cells)))
+    for (cell_x, cell_y), positions in sorted(cells.items()):
+        parts.append(struct.pack(f"<2iH{len(positions)}H", cell_x, cell_y, len(positions), *positions))
+    return b"".join(parts)
+
+def decode_level(body, cell_size=SPATIAL_HASH_CELL_SIZE):
+    """Unpack a compiled level body into level data"""
+    offset = 0
+    
+    def unpack(fmt):
+        nonlocal offset
+        values = struct.unpack_from(fmt, body, offset)
+        offset += struct.calcsize(fmt)
+        return values
+    
+    strings = []
+    for _ in range(2):
+        (length,) = unpack("<H")
+        strings.append(body[offset:offset + length].decode("utf-8"))
+        offset += length
+    level_name, background = strings
+    player_x, player_y, *background_color = unpack("<2i3B")
+    world_size = unpack("<2i")
+    has_puzzle, *puzzle = unpack("<B4i")
+    
+    (num_platforms,) = unpack("<H")
+    platforms = [Platform(*unpack("<4i")) for _ in range(num_platforms)]
+    (num_bees,) = unpack("<H")
+    bees = [unpack("<2i") for _ in range(num_bees)]
+    (num_essences,) = unpack("<H")
+    dream_essences = [unpack("<2i") for _ in range(num_essences)]
+    
+    collision_cells = {}
+    (num_cells,) = unpack("<I")
+    for _ in range(num_cells):
+        cell_x, cell_y, count = unpack("<2iH")
+        collision_cells[(cell_x, cell_y)] = list(unpack(f"<{count}H"))
+    
+    return {
+        'platforms': platforms,
+        'bees': bees,
+        'dream_essences': dream_essences,
+        'puzzle_pos': tuple(puzzle) if has_puzzle else None,
+        'player_start': (player_x, player_y),
+        'world_size': world_size,
+        'background_color': tuple(background_color),
+        'background': background,
+        'level_name': level_name,
+        'collision_cells': collision_cells,
+        'collision_cell_size': cell_size,
+    }
+
+def load_compiled_level(level_num):
+    """Return the compiled body for a level, recompiling when the source changed.
+    
+    The cache is trusted while the source's mtime and size match; otherwise
+    the source is hashed and only recompiled if its SHA-256 differs.
+    """
+    source_path = os.path.join(LEVELS_DIR, f"level_{level_num}.json")
+    cache_path = os.path.join(LEVEL_CACHE_DIR, f"level_{level_num}.bin")
+    source_stat = os.stat(source_path)
+    
+    cached = None
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached = cache_file.read()
+    except OSError:
+        pass
+    
+    cached_hash = None
+    if cached is not None and len(cached) >= LEVEL_CACHE_HEADER.size:
+        magic, version, cell_size, source_hash, mtime_ns, size, body_length = LEVEL_CACHE_HEADER.unpack_from(cached)
+        # A truncated body is treated like a stale cache
+        if ((magic, version, cell_size) == (LEVEL_CACHE_MAGIC, LEVEL_CACHE_VERSION, SPATIAL_HASH_CELL_SIZE) and
+                len(cached) == LEVEL_CACHE_HEADER.size + body_length):
+            if (mtime_ns, size) == (source_stat.st_mtime_ns, source_stat.st_size):
+                return cached[LEVEL_CACHE_HEADER.size:]
+            cached_hash = source_hash
+    
+    with open(source_path, "rb") as source_file:
+        source = source_file.read()
+    digest = hashlib.sha256(source).digest()
+    if digest == cached_hash:
+        # Only the timestamp changed, keep the compiled body
+        body = cached[LEVEL_CACHE_HEADER.size:]
+    else:
+        body = compile_level(source)
+    
+    # Refresh the cache; failing to write it only costs a recompile next time
+    header = LEVEL_CACHE_HEADER.pack(LEVEL_CACHE_MAGIC, LEVEL_CACHE_VERSION, SPATIAL_HASH_CELL_SIZE,
+                                     digest, source_stat.st_mtime_ns, source_stat.st_size, len(body))
+    # Write then rename, the prefetch thread and other processes may be reading the same cache
+    temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(LEVEL_CACHE_DIR, exist_ok=True)
+        with open(temp_path, "wb") as cache_file:
+            cache_file.write(header + body)
+        os.replace(temp_path, cache_path)
+    except OSError as error:
+        print(f"Warning: could not write level cache {cache_path}: {error}")
+    return body
+
 def create_level_data(level_num):
     """Create level-specific data including platforms, enemies, and puzzle"""
-    level_data = {
-        'platforms': [],
-        'bees': [],
-        'dream_essences': [],  # Add dream essences
-        'puzzle_pos': None,
-        'player_start': (100, SCREEN_HEIGHT - 100),
-        'background_color': WHITE,
-        'level_name': f"Level {level_num}"
-    }
+    return decode_level(load_compiled_level(level_num))
+
+def create_game_objects(level_num=1, headless=False):
+    """Create and return all game objects for the specified level.
     
-    # Always add ground platform - make it more visible
-    level_data['platforms'].append(Platform(0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 50, GRAY))
-    
-    if level_num == 1:
-        # Level 1: Tutorial - Simple platforms, no enemies
-        level_data['platforms'].extend([
-            Platform(200, SCREEN_HEIGHT - 150, 150, 20),
-            Platform(400, SCREEN_HEIGHT - 200, 120, 20),
-        ])
-        level_data['dream_essences'] = [(250, SCREEN_HEIGHT - 180), (150, SCREEN_HEIGHT - 80)]
-        level_data['puzzle_pos'] = (450, SCREEN_HEIGHT - 220, 30, 20)
-        level_data['level_name'] = "Level 1: Tutorial"
-        
-    elif level_num == 2:
-        # Level 2: Introduction to enemies - 1 bee, more platforms
-        level_data['platforms'].extend([
-            Platform(150, SCREEN_HEIGHT - 120, 100, 20),
-            Platform(300, SCREEN_HEIGHT - 180, 120, 20),
-            Platform(500, SCREEN_HEIGHT - 140, 100, 20),
-            Platform(650, SCREEN_HEIGHT - 220, 120, 20),
-        ])
-        level_data['bees'] = [(350, SCREEN_HEIGHT - 230)]
-        level_data['dream_essences'] = [(180, SCREEN_HEIGHT - 150), (530, SCREEN_HEIGHT - 170)]
-        level_data['puzzle_pos'] = (680, SCREEN_HEIGHT - 240, 30, 20)
-        level_data['level_name'] = "Level 2: First Enemy"
-        
-    elif level_num == 3:
-        # Level 3: Multiple enemies, vertical challenge
-        level_data['platforms'].extend([
-            Platform(100, SCREEN_HEIGHT - 120, 80, 20),
-            Platform(250, SCREEN_HEIGHT - 200, 100, 20),
-            Platform(450, SCREEN_HEIGHT - 160, 80, 20),
-            Platform(600, SCREEN_HEIGHT - 280, 100, 20),
-            Platform(300, SCREEN_HEIGHT - 320, 120, 20),
-        ])
-        level_data['bees'] = [
-            (200, SCREEN_HEIGHT - 250),
-            (500, SCREEN_HEIGHT - 210),
-        ]
-        level_data['dream_essences'] = [(130, SCREEN_HEIGHT - 150), (280, SCREEN_HEIGHT - 230), (630, SCREEN_HEIGHT - 310)]
-        level_data['puzzle_pos'] = (350, SCREEN_HEIGHT - 340, 30, 20)
-        level_data['level_name'] = "Level 3: Double Trouble"
-        level_data['background_color'] = (240, 248, 255)  # Light blue
-        
-    elif level_num == 4:
-        # Level 4: Maze-like with strategic bee placement
-        level_data['platforms'].extend([
-            Platform(120, SCREEN_HEIGHT - 100, 60, 20),
-            Platform(220, SCREEN_HEIGHT - 160, 80, 20),
-            Platform(350, SCREEN_HEIGHT - 120, 60, 20),
-            Platform(450, SCREEN_HEIGHT - 200, 100, 20),
-            Platform(580, SCREEN_HEIGHT - 140, 80, 20),
-            Platform(200, SCREEN_HEIGHT - 280, 120, 20),
-            Platform(400, SCREEN_HEIGHT - 320, 100, 20),
-            Platform(600, SCREEN_HEIGHT - 260, 80, 20),
-        ])
-        level_data['bees'] = [
-            (180, SCREEN_HEIGHT - 210),
-            (380, SCREEN_HEIGHT - 250),
-            (520, SCREEN_HEIGHT - 190),
-        ]
-        level_data['dream_essences'] = [(150, SCREEN_HEIGHT - 130), (380, SCREEN_HEIGHT - 150), (230, SCREEN_HEIGHT - 310), (610, SCREEN_HEIGHT - 290)]
-        level_data['puzzle_pos'] = (430, SCREEN_HEIGHT - 340, 30, 20)
-        level_data['level_name'] = "Level 4: The Gauntlet"
-        level_data['background_color'] = (255, 248, 220)  # Light yellow
-        
-    elif level_num == 5:
-        # Level 5: Final challenge - complex layout with strategic positioning
-        level_data['platforms'].extend([
-            Platform(80, SCREEN_HEIGHT - 100, 60, 20),
-            Platform(180, SCREEN_HEIGHT - 140, 80, 20),
-            Platform(300, SCREEN_HEIGHT - 100, 60, 20),
-            Platform(400, SCREEN_HEIGHT - 180, 100, 20),
-            Platform(540, SCREEN_HEIGHT - 120, 80, 20),
-            Platform(660, SCREEN_HEIGHT - 200, 100, 20),
-            Platform(150, SCREEN_HEIGHT - 240, 100, 20),
-            Platform(320, SCREEN_HEIGHT - 280, 120, 20),
-            Platform(500, SCREEN_HEIGHT - 320, 100, 20),
-            Platform(250, SCREEN_HEIGHT - 380, 150, 20),
-        ])
-        level_data['bees'] = [
-            (130, SCREEN_HEIGHT - 190),
-            (350, SCREEN_HEIGHT - 230),
-            (470, SCREEN_HEIGHT - 130),
-            (600, SCREEN_HEIGHT - 250),
-        ]
-        level_data['dream_essences'] = [(110, SCREEN_HEIGHT - 130), (330, SCREEN_HEIGHT - 130), (570, SCREEN_HEIGHT - 150), (180, SCREEN_HEIGHT - 270), (530, SCREEN_HEIGHT - 350)]
-        level_data['puzzle_pos'] = (300, SCREEN_HEIGHT - 400, 30, 20)
-        level_data['level_name'] = "Level 5: Final Challenge"
-        level_data['background_color'] = (255, 240, 245)  # Light pink
-    
-    return level_data
-
-def create_game_objects(level_num=1):
-    """Create and return all game objects for the specified level"""
+    Bees and dream essences are handed to the level's ChunkStreamer, which
+    adds them to their groups as their chunks come into range. Headless
+    objects never render chunk static layers, which are only needed for drawing.
+    """
     level_data = create_level_data(level_num)
+    world_width, world_height = level_data['world_size']
     
-    player = Player(*level_data['player_start'])
+    player = Player(*level_data['player_start'], world_width, world_height)
     
     # Create platforms from level data
     platforms = []
@@ -745,45 +2644,550 @@ def create_game_objects(level_num=1):
         puzzle_block = PuzzleBlock(*level_data['puzzle_pos'])
     
     # Create enemy groups
-    hive_guard_bees = pygame.sprite.Group()
-    stingers = pygame.sprite.Group()
+    hive_guard_bees = HiveGuardBeeGroup()
+    stingers = StingerGroup()
     
-    # Add bees from level data
-    for bee_pos in level_data['bees']:
-        hive_guard_bees.add(HiveGuardBee(*bee_pos))
+    # Create bees from level data
+    bees = [HiveGuardBee(*bee_pos, hive_guard_bees.store) for bee_pos in level_data['bees']]
     
     # Create dream essence group
-    dream_essences = pygame.sprite.Group()
+    dream_essences = DreamEssenceGroup()
     
-    # Add dream essences from level data
-    for essence_pos in level_data['dream_essences']:
-        dream_essences.add(DreamEssence(*essence_pos))
+    # Create dream essences from level data
+    essences = [DreamEssence(*essence_pos, dream_essences.store) for essence_pos in level_data['dream_essences']]
+    
+    # Broadphase index over the static level geometry, precomputed by the level compiler
+    collision_items = platforms + ([puzzle_block] if puzzle_block else [])
+    level_data['collision_index'] = SpatialHash.from_cells(
+        level_data['collision_cell_size'], collision_items, level_data['collision_cells'])
+    
+    # Broadphase index over the dream essences
+    essence_index = SpatialHash()
+    for essence in essences:
+        essence_index.insert(essence, essence.float_bounds())
+    level_data['essence_index'] = essence_index
+    
+    # Split the level into chunks streamed in around the camera
+    background = None if headless else load_background(level_data['background'])
+    chunks = ChunkStreamer(level_data['world_size'], level_data['collision_index'], puzzle_block,
+                           bees, essences, hive_guard_bees, dream_essences, background)
+    level_data['chunks'] = chunks
+    
+    # The level's camera starts on the player; World takes it over with the level
+    camera = Camera(world_width, world_height)
+    camera.follow(*player.rect.center, snap=True)
+    level_data['camera'] = camera
+    
+    # Pre-composite background, platforms and the puzzle block's fixed parts around the start
+    if not headless:
+        chunks.prerender(camera.rect)
     
     return player, platforms, puzzle_block, hive_guard_bees, stingers, dream_essences, level_data
 
-def main():
+class LevelPrefetcher:
+    """Builds a level's game objects on a background thread ahead of time.
+    
+    Level data, sprites and the static layer are prepared by one worker
+    thread; take() hands the finished objects over, building them inline
+    only if nothing was prefetched for that level.
+    """
+    def __init__(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")
+        self.pending = {}  # (level_num, headless) -> future
+    
+    def prefetch(self, level_num, headless=False):
+        """Start building the level in the background if it is not already on its way"""
+        key = (level_num, headless)
+        if key not in self.pending:
+            self.pending[key] = self.executor.submit(create_game_objects, level_num, headless)
+    
+    def take(self, level_num, headless=False):
+        """Return freshly built game objects for the level, waiting for the prefetch if needed"""
+        future = self.pending.pop((level_num, headless), None)
+        if future is None:
+            return create_game_objects(level_num, headless)
+        return future.result()
+
+class World:
+    """Game simulation state advanced one tick at a time from explicit inputs.
+    
+    The world never touches the display, fonts or the event queue, so with
+    headless=True it can be stepped under the SDL dummy video driver:
+    
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        world = World(headless=True, verbose=False)
+        world.step(PlayerInput(right=True, jump=True))
+    """
+    def __init__(self, level_num=1, headless=False, verbose=True, projectile_engine=False, prefetch=True,
+                 seed=None):
+        self.headless = headless
+        self.verbose = verbose
+        self.projectile_engine = projectile_engine
+        # Prepares the next level in the background during the completion delay
+        self.prefetcher = LevelPrefetcher() if prefetch else None
+        self.stingers = None
+        self.tick_count = 0
+        self.profiler = None  # FrameProfiler timing the simulation phases, if profiling
+        # The simulation itself draws no random numbers; the seed places the renderer's sparkles
+        # (see ParticleSystem) and is recorded with sessions so replays draw the same frames
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.new_game(level_num)
+    
+    def log(self, message):
+        if self.verbose:
+            print(message)
+    
+    def build_level(self, level_num):
+        """Return fresh game objects for the given level, prefetched if possible"""
+        if self.prefetcher:
+            return self.prefetcher.take(level_num, self.headless)
+        return create_game_objects(level_num, self.headless)
+    
+    def load_level(self, level_num, game_objects=None):
+        """Replace all game objects with a fresh copy of the given level, or the given build_level() objects"""
+        if game_objects is None:
+            game_objects = self.build_level(level_num)
+        if isinstance(self.stingers, StingerGroup):
+            # Return the stingers still in flight to the pool
+            self.stingers.release_all()
+        self.current_level = level_num
+        # Swap every object in at once
+        (self.player, self.platforms, self.puzzle_block, self.hive_guard_bees,
+         self.stingers, self.dream_essences, self.level_data) = game_objects
+        if self.projectile_engine:
+            self.stingers = ProjectileEngine()
+        self.chunks = self.level_data['chunks']
+        self.camera = self.level_data['camera']
+        self.follow_player(snap=True)
+        self.level_complete_timer = 0
+        self.game_over = False
+    
+    def follow_player(self, snap=False):
+        """Move the camera onto the player and stream in the chunks around it"""
+        self.camera.follow(*self.player.rect.center, snap=snap)
+        self.active_rect = self.chunks.update(self.camera.rect)
+    
+    def restart_level(self):
+        """Restart the current level"""
+        self.load_level(self.current_level)
+        self.dream_essence_count = 0
+        self.log(f"Level {self.current_level} restarted!")
+    
+    def new_game(self, level_num=1):
+        """Start a new game from the given level"""
+        self.load_level(level_num)
+        self.game_complete = False
+        self.dream_essence_count = 0
+    
+    def run_commands(self, commands):
+        """Apply COMMAND_* bits from a key press or a recorded tick"""
+        if commands & COMMAND_RESTART:
+            self.restart_level()
+        if commands & COMMAND_NEW_GAME and (self.game_complete or self.game_over):
+            self.new_game()
+            self.log("New game started!")
+    
+    @property
+    def running(self):
+        """True while the simulation still advances on step()"""
+        return self.player.health > 0 and not self.game_complete and not self.game_over
+    
+    def step(self, player_input):
+        """Advance the simulation by one tick"""
+        self.tick_count += 1
+        if not self.running:
+            return
+        
+        profiler = self.profiler
+        player = self.player
+        stingers = self.stingers
+        player.update(self.level_data['collision_index'], player_input)
+        if self.puzzle_block:
+            was_activated = self.puzzle_block.activated
+            self.puzzle_block.check_activation(player)
+            if self.puzzle_block.activated and not was_activated:
+                self.log("Puzzle activated! Player is standing on the red block!")
+        self.follow_player()
+        if profiler:
+            profiler.lap("player")
+        
+        # Update enemies
+        self.hive_guard_bees.update(player, stingers)
+        if profiler:
+            profiler.lap("bees")
+        
+        # Update stingers, dropping those that leave the loaded chunks
+        stingers.update(self.active_rect)
+        if profiler:
+            profiler.lap("stingers")
+        
+        # Update dream essences
+        self.dream_essences.update()
+        if profiler:
+            profiler.lap("essences")
+        
+        # Check collisions between stingers and player
+        for _ in range(stingers.take_hits(player.rect)):
+            health = player.health
+            game_over = player.take_damage(10)
+            if player.health != health:
+                self.log(f"Player hit by Stinger! Health: {player.health}")
+            if game_over:
+                self.game_over = True
+                self.log("GAME OVER! Player health reached zero!")
+        
+        # Check collisions between stingers and platforms
+        stingers.collide_platforms(self.level_data['collision_index'])
+        
+        # Check collisions between player and dream essences
+        essence_index = self.level_data['essence_index']
+        for essence in essence_index.query(player.rect):
+            if player.rect.colliderect(essence.rect):
+                essence.collected = True
+                essence.kill()
+                essence_index.remove(essence)
+                self.dream_essence_count += 1
+                self.log(f"Dream Essence collected! Total: {self.dream_essence_count}")
+        if profiler:
+            profiler.lap("collisions")
+        
+        # Check level completion
+        if self.puzzle_block and self.puzzle_block.activated and self.level_complete_timer == 0:
+            self.level_complete_timer = 1
+            self.log(f"Level {self.current_level} completed!")
+            if self.prefetcher and self.current_level < MAX_LEVELS:
+                self.prefetcher.prefetch(self.current_level + 1, self.headless)
+        
+        # Handle level progression
+        if self.level_complete_timer > 0:
+            self.level_complete_timer += 1
+            if self.level_complete_timer >= LEVEL_COMPLETE_DELAY:
+                if self.current_level < MAX_LEVELS:
+                    self.load_level(self.current_level + 1)
+                    self.player.reset_health()  # Restore health for new level
+                    self.log(f"Welcome to Level {self.current_level}!")
+                else:
+                    self.game_complete = True
+                    self.log("Congratulations! You completed all levels!")
+    
+    def snapshot(self):
+        """Return the simulation state as a tuple of bytes sections (see SnapshotRing)"""
+        player, camera = self.player, self.camera
+        header = SNAPSHOT_HEADER.pack(
+            self.current_level, self.tick_count, self.level_complete_timer, self.dream_essence_count,
+            self.game_over, self.game_complete, self.puzzle_block is not None and self.puzzle_block.activated,
+            player.x, player.y, player.prev_x, player.prev_y, player.vel_x, player.vel_y,
+            player.health, player.invulnerable_time, player.animation_timer,
+            player.on_ground, player.facing_right, player.is_jumping, player.is_moving,
+            *camera.rect.topleft, *camera.prev_topleft)
+        return (header, self.stingers.snapshot()) + self.hive_guard_bees.snapshot() + self.dream_essences.snapshot()
+    
+    def restore(self, snapshot):
+        """Return the simulation to a snapshot(), loading the snapshot's level if another one is running.
+        
+        Raises ValueError if the snapshot does not fit the level's entities;
+        every section is checked first, so the world is left as it was.
+        """
+        if len(snapshot) < 2 or len(snapshot[0]) != SNAPSHOT_HEADER.size:
+            raise ValueError("Snapshot header is malformed")
+        level_num = SNAPSHOT_HEADER.unpack_from(snapshot[0])[0]
+        game_objects = None
+        if level_num != self.current_level:
+            if not 1 <= level_num <= MAX_LEVELS:
+                raise ValueError(f"Snapshot is of level {level_num}, which does not exist")
+            game_objects = self.build_level(level_num)
+            hive_guard_bees, dream_essences = game_objects[3], game_objects[5]
+        else:
+            hive_guard_bees, dream_essences = self.hive_guard_bees, self.dream_essences
+        bee_sections = 1 + len(hive_guard_bees.store.typed)
+        StingerGroup.check(snapshot[1])
+        hive_guard_bees.check(snapshot[2:2 + bee_sections])
+        dream_essences.check(snapshot[2 + bee_sections:])
+        if game_objects:
+            self.load_level(level_num, game_objects)
+        
+        player, camera = self.player, self.camera
+        (self.current_level, self.tick_count, self.level_complete_timer, self.dream_essence_count,
+         self.game_over, self.game_complete, activated,
+         player.x, player.y, player.prev_x, player.prev_y, player.vel_x, player.vel_y,
+         player.health, player.invulnerable_time, player.animation_timer,
+         player.on_ground, player.facing_right, player.is_jumping, player.is_moving,
+         camera.rect.x, camera.rect.y, prev_camera_x, prev_camera_y) = SNAPSHOT_HEADER.unpack(snapshot[0])
+        camera.prev_topleft = (prev_camera_x, prev_camera_y)
+        if self.puzzle_block:
+            self.puzzle_block.activated = activated
+        player.rect.x = player.x
+        player.rect.y = player.y
+        # Replay the last animation step to pick the player's frame
+        player.animation_timer -= 1
+        player.update_animation()
+        
+        self.stingers.restore(snapshot[1])
+        self.hive_guard_bees.restore(snapshot[2:2 + bee_sections])
+        self.dream_essences.restore(snapshot[2 + bee_sections:])
+        essence_index = self.level_data['essence_index']
+        for essence in self.dream_essences.store.entities:
+            if essence.collected:
+                essence_index.remove(essence)
+            elif essence not in essence_index:
+                essence_index.insert(essence, essence.float_bounds())
+        self.active_rect = self.chunks.restore(camera.rect)
+
+# Recorded session layout: header, then the zlib-compressed per-tick input bits.
+# Header: magic, version, start level, world seed and tick count
+REPLAY_MAGIC = b"RPLY"
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct("<4sHHQI")
+
+class InputRecorder:
+    """Records one byte of INPUT_* and COMMAND_* bits per simulation tick.
+    
+    Together with the world's start level and seed this is everything
+    needed to re-run and redraw a session tick for tick (see load_recording).
+    """
+    def __init__(self, level_num, seed):
+        self.level_num = level_num
+        self.seed = seed
+        self.ticks = bytearray()
+        self.pending_commands = 0  # Commands issued since the last recorded tick
+    
+    def command(self, commands):
+        """Note COMMAND_* bits applied to the world before the next tick"""
+        self.pending_commands |= commands
+    
+    def record(self, player_input):
+        """Record the input of one simulation tick"""
+        self.ticks.append(player_input.to_bits() | self.pending_commands)
+        self.pending_commands = 0
+    
+    def save(self, path):
+        header = REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.level_num, self.seed, len(self.ticks))
+        with open(path, "wb") as f:
+            f.write(header + zlib.compress(bytes(self.ticks), 9))
+        print(f"Recorded {len(self.ticks)} ticks to {path}")
+
+def load_recording(path):
+    """Return (level_num, seed, per-tick bits) from a file written by InputRecorder"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < REPLAY_HEADER.size:
+        raise ValueError(f"{path} is not a recorded session")
+    magic, version, level_num, seed, tick_count = REPLAY_HEADER.unpack_from(data)
+    if (magic, version) != (REPLAY_MAGIC, REPLAY_VERSION):
+        raise ValueError(f"{path} is not a version {REPLAY_VERSION} recorded session")
+    ticks = zlib.decompress(data[REPLAY_HEADER.size:])
+    if len(ticks) != tick_count:
+        raise ValueError(f"{path} is truncated: {len(ticks)} of {tick_count} ticks")
+    return level_num, seed, ticks
+
+# World snapshot header: level, tick count, level complete timer, essence count, game over, game complete,
+# puzzle activated, player x, y, prev_x, prev_y, vel_x, vel_y, health, invulnerable_time, animation_timer,
+# on_ground, facing_right, is_jumping, is_moving, then the camera topleft and previous topleft
+SNAPSHOT_HEADER = struct.Struct("<Hqii???6diiq????4i")
+
+class SnapshotRing:
+    """Rewind history holding one World snapshot per tick in a fixed number of slots.
+    
+    A snapshot is a tuple of bytes sections: the world header, the stingers,
+    then the bee and essence group state and one section per component
+    column. capture() delta-encodes against the previous tick by keeping the
+    previous tick's object for every section whose bytes did not change, so
+    a tick only adds memory for the columns that moved. Render-only state
+    (the particle system) is not captured.
+    
+    Columns that move every tick (positions, essence floats, every stinger)
+    are copied whole, so capture time and memory grow with the live
+    entities: tens of microseconds a tick on the shipped levels, but about
+    0.5 ms and 15 MB per 300 ticks with 200 bees, 200 stingers and 500
+    essences, mostly spent on the stingers. The main loop charges capture
+    and rewind to the FrameProfiler's "snapshot" phase.
+    """
+    def __init__(self, history=SNAPSHOT_HISTORY):
+        self.history = history
+        self.frames = [None] * history
+        self.head = 0  # Slot of the next capture
+        self.count = 0  # Snapshots held, at most history
+    
+    def __len__(self):
+        return self.count
+    
+    def capture(self, world):
+        """Store the world's current state as the newest snapshot, dropping the oldest once full"""
+        snapshot = world.snapshot()
+        previous = self.frames[self.head - 1] if self.count else None
+        if previous is not None and len(previous) == len(snapshot):
+            snapshot = tuple([old if new == old else new for new, old in zip(snapshot, previous)])
+        self.frames[self.head] = snapshot
+        self.head = (self.head + 1) % self.history
+        self.count = min(self.count + 1, self.history)
+    
+    def latest(self):
+        """Return the newest snapshot, or None"""
+        return self.frames[self.head - 1] if self.count else None
+    
+    def rewind(self, world):
+        """Drop the newest snapshot and restore the world to the one before it.
+        
+        Returns False, leaving the world alone, once only one snapshot is left.
+        """
+        if self.count < 2:
+            return False
+        self.head = (self.head - 1) % self.history
+        self.frames[self.head] = None
+        self.count -= 1
+        world.restore(self.frames[self.head - 1])
+        return True
+    
+    def clear(self):
+        self.frames = [None] * self.history
+        self.head = 0
+        self.count = 0
+    
+    def nbytes(self):
+        """Return the bytes held by the snapshots, counting shared sections once"""
+        sizes = {id(section): len(section) for frame in self.frames if frame for section in frame}
+        return sum(sizes.values())
+
+# Save file layout: header, then the zlib-compressed section lengths and sections of one snapshot.
+# Header: magic, version and section count. Sections keep native byte order
+SAVE_MAGIC = b"SAVE"
+SAVE_VERSION = 2
+SAVE_HEADER = struct.Struct("<4sHH")
+
+def save_snapshot(snapshot, path):
+    """Write a World snapshot to path"""
+    lengths = struct.pack(f"<{len(snapshot)}I", *map(len, snapshot))
+    with open(path, "wb") as f:
+        f.write(SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, len(snapshot)) +
+                zlib.compress(lengths + b"".join(snapshot)))
+
+def load_snapshot(path):
+    """Return the World snapshot saved to path by save_snapshot"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < SAVE_HEADER.size:
+        raise ValueError(f"{path} is not a saved game")
+    magic, version, section_count = SAVE_HEADER.unpack_from(data)
+    if (magic, version) != (SAVE_MAGIC, SAVE_VERSION):
+        raise ValueError(f"{path} is not a version {SAVE_VERSION} saved game")
+    body = zlib.decompress(data[SAVE_HEADER.size:])
+    offset = 4 * section_count
+    sections = []
+    for length in struct.unpack_from(f"<{section_count}I", body):
+        sections.append(body[offset:offset + length])
+        offset += length
+    if offset != len(body):
+        raise ValueError(f"{path} is truncated")
+    return tuple(sections)
+
+def replay_tick(world, bits):
+    """Apply one recorded tick to the world"""
+    world.run_commands(bits)
+    world.step(PlayerInput.from_bits(bits))
+
+def draw_world(screen, world, particles, alpha, view=None, quality=QUALITY_TIERS[0]):
+    """Draw the world's moving parts inside the camera view over an already restored static layer.
+    
+    quality is the EffectQuality of the optional effects. Returns the drawn
+    objects, whose draw_bounds cover everything drawn.
+    """
+    if view is None:
+        view = world.camera.view(alpha)
+    offset = (-view.x, -view.y)
+    drawn = []
+    
+    # Draw puzzle block
+    if world.puzzle_block and view.colliderect(world.puzzle_block.rect.inflate(80, 60)):
+        world.puzzle_block.draw(screen, offset, world.tick_count - 1 + alpha)
+        drawn.append(world.puzzle_block)
+    
+    # Only entities of the loaded chunks are in the groups; cull those outside the view
+    essences = [essence for essence in world.dream_essences if view.colliderect(essence.rect.inflate(60, 60))]
+    bees = [bee for bee in world.hive_guard_bees if view.colliderect(bee.rect.inflate(20, 20))]
+    
+    # Draw stinger trails and essence sparkles in one batch
+    if quality.sparkles:
+        for essence in essences:
+            essence.emit_sparkles(particles)
+    world.stingers.emit_trails(particles, quality.trail_length)
+    particles.draw(screen, offset)
+    
+    # Draw dream essences
+    for essence in essences:
+        essence.draw(screen, alpha, offset, quality.tint_cycling)
+    
+    # Draw enemies
+    for bee in bees:
+        bee.draw(screen, offset)
+    
+    # Draw stingers
+    world.stingers.draw(screen, alpha, offset)
+    
+    # Draw player
+    world.player.draw(screen, alpha, offset, quality.idle_breathing)
+    
+    return drawn + essences + bees + world.stingers.drawables() + [world.player]
+
+def main(dirty_rects=False, projectile_engine=False, profile=False, profile_path=PROFILER_EXPORT_PATH,
+         record_path=None, quality=None):
+    """Run the game.
+    
+    dirty_rects enables the DirtyRectRenderer instead of full redraws and
+    projectile_engine simulates stingers with the NumPy ProjectileEngine.
+    profile starts with the frame profiler on; F3 toggles it at any time and
+    F4 exports the recorded frames to profile_path. With record_path the
+    session's input is recorded there for run_replay.
+    
+    Every tick is captured into a SnapshotRing: holding Backspace rewinds
+    the last SNAPSHOT_HISTORY ticks, F5 saves the world to QUICKSAVE_PATH and
+    F9 loads it back. Rewinding and loading are off while recording, as the
+    recorded input alone could not reproduce them.
+    
+    quality names a fixed QUALITY_TIERS entry for the visual effects; by
+    default a QualityGovernor lowers and restores it to hold 60 FPS.
+    """
+    tiers = {tier.name: tier for tier in QUALITY_TIERS}
+    if quality is not None and quality not in tiers:
+        raise ValueError(f"Unknown quality {quality!r}, expected one of {', '.join(tiers)}")
+    governor = QualityGovernor() if quality is None else None
+    effects = governor.quality if governor else tiers[quality]
+    
     # Set up display
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Rüyalar ve Gerçeklik Arası - 2D Platformer")
     clock = pygame.time.Clock()
     
-    # Load background
-    background = load_background()
+    # Decode all images once up front so level loads never touch the disk
+    asset_manager.preload()
+    for line in asset_manager.report():
+        print(f"Asset: {line}")
     
-    # Game state
-    current_level = 1
-    level_complete_timer = 0
-    game_complete = False
-    game_over = False
-    dream_essence_count = 0
+    hud = HUD()
+    renderer = DirtyRectRenderer() if dirty_rects else None
+    frame_profiler = FrameProfiler()
+    profiler = frame_profiler if profile else None
     
     # Create game objects for first level
-    player, platforms, puzzle_block, hive_guard_bees, stingers, dream_essences, level_data = create_game_objects(current_level)
+    world = World(projectile_engine=projectile_engine)
+    particles = ParticleSystem(world.seed)
+    recorder = InputRecorder(world.current_level, world.seed) if record_path else None
+    history = SnapshotRing()
+    history.capture(world)
     
-    # Game loop
+    # Fixed-timestep game loop: the simulation advances in SIMULATION_DT ticks
+    # and rendering interpolates between the last two ticks
+    accumulator = 0.0
+    previous_time = time.perf_counter()
     running = True
     while running:
+        current_time = time.perf_counter()
+        accumulator += current_time - previous_time
+        previous_time = current_time
+        if profiler:
+            profiler.start()
+        
         # Handle events
+        commands = 0
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -792,206 +3196,198 @@ def main():
                     running = False
                 elif event.key == pygame.K_r:
                     # Restart the current level
-                    player, platforms, puzzle_block, hive_guard_bees, stingers, dream_essences, level_data = create_game_objects(current_level)
-                    level_complete_timer = 0
-                    game_over = False
-                    dream_essence_count = 0
-                    print(f"Level {current_level} restarted!")
-                elif event.key == pygame.K_n and (game_complete or game_over):
-                    # Start new game from level 1
-                    current_level = 1
-                    game_complete = False
-                    game_over = False
-                    level_complete_timer = 0
-                    dream_essence_count = 0
-                    player, platforms, puzzle_block, hive_guard_bees, stingers, dream_essences, level_data = create_game_objects(current_level)
-                    print("New game started!")
-        
-        # Update game objects
-        if player.health > 0 and not game_complete and not game_over:
-            player.update(platforms + ([puzzle_block] if puzzle_block else []))
-            if puzzle_block:
-                puzzle_block.check_activation(player)
-            
-            # Update enemies
-            for bee in hive_guard_bees:
-                bee.update(player, stingers)
-            
-            # Update stingers
-            stingers.update()
-            
-            # Update dream essences
-            dream_essences.update()
-            
-            # Check collisions between stingers and player
-            hit_stingers = pygame.sprite.spritecollide(player, stingers, True, 
-                                                      collided=lambda p, s: p.rect.colliderect(s.rect))
-            for stinger in hit_stingers:
-                if player.take_damage(10):
-                    game_over = True
-                    print("GAME OVER! Player health reached zero!")
-            
-            # Check collisions between stingers and platforms
-            for stinger in stingers:
-                for platform in platforms:
-                    if stinger.rect.colliderect(platform.rect):
-                        stinger.kill()
-                        break
-            
-            # Check collisions between player and dream essences
-            collected_essences = pygame.sprite.spritecollide(player, dream_essences, True,
-                                                           collided=lambda p, e: p.rect.colliderect(e.rect))
-            for essence in collected_essences:
-                dream_essence_count += 1
-                print(f"Dream Essence collected! Total: {dream_essence_count}")
-            
-            # Check level completion
-            if puzzle_block and puzzle_block.activated and level_complete_timer == 0:
-                level_complete_timer = 1
-                print(f"Level {current_level} completed!")
-            
-            # Handle level progression
-            if level_complete_timer > 0:
-                level_complete_timer += 1
-                if level_complete_timer >= LEVEL_COMPLETE_DELAY:
-                    if current_level < MAX_LEVELS:
-                        current_level += 1
-                        player, platforms, puzzle_block, hive_guard_bees, stingers, dream_essences, level_data = create_game_objects(current_level)
-                        player.reset_health()  # Restore health for new level
-                        level_complete_timer = 0
-                        print(f"Welcome to Level {current_level}!")
-                    else:
-                        game_complete = True
-                        print("Congratulations! You completed all levels!")
-        
-        # Draw everything
-        # Draw background first
-        screen.blit(background, (0, 0))
-        
-        # Draw platforms
-        for platform in platforms:
-            platform.draw(screen)
-        
-        # Draw puzzle block
-        if puzzle_block:
-            puzzle_block.draw(screen)
-        
-        # Draw dream essences
-        for essence in dream_essences:
-            essence.draw(screen)
-        
-        # Draw enemies
-        for bee in hive_guard_bees:
-            bee.draw(screen)
-        
-        # Draw stingers
-        for stinger in stingers:
-            stinger.draw(screen)
-        
-        # Draw player
-        player.draw(screen)
-        
-        # Draw level information
-        level_font = pygame.font.Font(None, 32)
-        level_text = level_font.render(level_data['level_name'], True, BLACK)
-        screen.blit(level_text, (SCREEN_WIDTH - 250, 10))
-        
-        # Draw progress
-        progress_text = f"Level {current_level}/{MAX_LEVELS}"
-        progress_surface = level_font.render(progress_text, True, BLACK)
-        screen.blit(progress_surface, (SCREEN_WIDTH - 250, 45))
-        
-        # Draw instructions
-        font = pygame.font.Font(None, 20)
-        instructions = [
-            "ARROW KEYS/WASD: Move and Jump",
-            "Collect Dream Essences! Avoid bee stingers!",
-            "Stand on RED BLOCK to complete level!",
-            "R: Restart Level | ESC: Quit"
-        ]
-        
-        for i, instruction in enumerate(instructions):
-            text = font.render(instruction, True, WHITE)
-            # Add black outline for better visibility
-            outline_text = font.render(instruction, True, BLACK)
-            for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-                screen.blit(outline_text, (10 + dx, 10 + i * 22 + dy))
-            screen.blit(text, (10, 10 + i * 22))
-        
-        # Show dream essence count
-        essence_text = font.render(f"Dream Essences: {dream_essence_count}", True, CYAN)
-        outline_essence = font.render(f"Dream Essences: {dream_essence_count}", True, BLACK)
-        for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-            screen.blit(outline_essence, (10 + dx, 100 + dy))
-        screen.blit(essence_text, (10, 100))
-        
-        # Show puzzle status with clearer messaging
-        if puzzle_block:
-            if puzzle_block.activated:
-                if level_complete_timer > 0:
-                    puzzle_status = f"🎉 Level {current_level} Complete! Next level in {3 - level_complete_timer//60}..."
-                else:
-                    puzzle_status = "🎉 PUZZLE SOLVED! Great job! 🎉"
-                status_color = GREEN
+                    commands |= COMMAND_RESTART
+                elif event.key == pygame.K_n:
+                    # Start new game from level 1 once the game is over
+                    commands |= COMMAND_NEW_GAME
+                elif event.key == pygame.K_F3:
+                    # Toggle the frame profiler and its overlay
+                    profiler = None if profiler else frame_profiler
+                    if profiler:
+                        profiler.start()
+                    elif renderer:
+                        renderer.full_redraw = True  # Erase the overlay
+                elif event.key == pygame.K_F4:
+                    frame_profiler.export(profile_path)
+                elif event.key == pygame.K_F5:
+                    save_snapshot(world.snapshot(), QUICKSAVE_PATH)
+                    print(f"Game saved to {QUICKSAVE_PATH}")
+                elif event.key == pygame.K_F9:
+                    if recorder:
+                        print("Loading is disabled while recording")
+                    elif os.path.exists(QUICKSAVE_PATH):
+                        try:
+                            world.restore(load_snapshot(QUICKSAVE_PATH))
+                        except (ValueError, struct.error, zlib.error, OSError) as e:
+                            print(f"Could not load {QUICKSAVE_PATH}: {e}")
+                        else:
+                            history.capture(world)
+                            print(f"Game loaded from {QUICKSAVE_PATH}")
+        if commands:
+            world.run_commands(commands)
+            history.capture(world)
+            if recorder:
+                recorder.command(commands)
+        world.profiler = profiler
+        if profiler:
+            profiler.lap("events")
+        
+        # Update game objects, catching up at most MAX_CATCH_UP_STEPS ticks per frame
+        keys = pygame.key.get_pressed()
+        player_input = PlayerInput.from_keys(keys)
+        rewinding = keys[pygame.K_BACKSPACE] and not recorder
+        steps = 0
+        while accumulator >= SIMULATION_DT and steps < MAX_CATCH_UP_STEPS:
+            if rewinding:
+                # Step back one tick instead of forward
+                history.rewind(world)
             else:
-                puzzle_status = "❌ PUZZLE: Find and stand on the RED BLOCK!"
-                status_color = RED
-            
-            status_text = font.render(puzzle_status, True, status_color)
-            outline_status = font.render(puzzle_status, True, BLACK)
-            for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-                screen.blit(outline_status, (10 + dx, 125 + dy))
-            screen.blit(status_text, (10, 125))
-        
-        # Show player health
-        health_text = font.render(f"Health: {player.health}/{player.max_health}", True, 
-                                 GREEN if player.health > 50 else RED)
-        outline_health = font.render(f"Health: {player.health}/{player.max_health}", True, BLACK)
-        for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-            screen.blit(outline_health, (10 + dx, 150 + dy))
-        screen.blit(health_text, (10, 150))
+                if recorder:
+                    recorder.record(player_input)
+                world.step(player_input)
+                history.capture(world)
+            if profiler:
+                profiler.lap("snapshot")
+            accumulator -= SIMULATION_DT
+            steps += 1
+        if steps == MAX_CATCH_UP_STEPS:
+            # Too far behind, drop the backlog instead of spiralling
+            accumulator %= SIMULATION_DT
+        # A stopped world keeps the last tick's previous positions, so draw it where it stopped
+        alpha = accumulator / SIMULATION_DT if world.running else 1.0
         
-        # Show game over if player is dead
-        if game_over or player.health <= 0:
-            # Semi-transparent overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(128)
-            overlay.fill(BLACK)
-            screen.blit(overlay, (0, 0))
-            
-            game_over_font = pygame.font.Font(None, 72)
-            game_over_text = game_over_font.render("GAME OVER!", True, RED)
-            text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-            screen.blit(game_over_text, text_rect)
-            
-            # Show restart instruction
-            restart_font = pygame.font.Font(None, 36)
-            restart_text = restart_font.render("Press R to Restart Level | Press N for New Game", True, WHITE)
-            restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 60))
-            screen.blit(restart_text, restart_rect)
-        
-        # Show game complete screen
-        elif game_complete:
-            complete_font = pygame.font.Font(None, 64)
-            complete_text = complete_font.render("CONGRATULATIONS!", True, GREEN)
-            text_rect = complete_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
-            screen.blit(complete_text, text_rect)
-            
-            sub_font = pygame.font.Font(None, 36)
-            sub_text = sub_font.render("You completed all levels!", True, BLACK)
-            sub_rect = sub_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-            screen.blit(sub_text, sub_rect)
-            
-            new_game_text = sub_font.render("Press N for New Game", True, BLUE)
-            new_game_rect = new_game_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
-            screen.blit(new_game_text, new_game_rect)
+        # Draw everything
+        view = world.camera.view(alpha)
+        static_layer = world.chunks.view_layer(view)
+        if renderer:
+            # Restore only what moved since the last frame
+            renderer.restore(screen, static_layer, view.topleft)
+        else:
+            # Draw background, platforms and the fixed puzzle block in one blit
+            screen.blit(static_layer, (0, 0))
+        
+        drawn = draw_world(screen, world, particles, alpha, view, effects)
+        if profiler:
+            profiler.lap("draw_world")
+        
+        # Draw HUD
+        hud_rects = hud.draw(screen, world)
+        if profiler:
+            profiler.lap("draw_hud")
+            # The overlay itself is left out of the timings
+            overlay_rect, rebuilt = profiler.draw(screen)
+            hud_rects.append(overlay_rect)
+            hud.changed = hud.changed or rebuilt
+            profiler.start()
         
         # Update display
-        pygame.display.flip()
-        clock.tick(60)  # 60 FPS
+        if renderer:
+            renderer.present(drawn, hud, hud_rects, not world.running)
+        else:
+            pygame.display.flip()
+        if profiler:
+            profiler.lap("flip")
+            profiler.end_frame({
+                "bees": len(world.hive_guard_bees),
+                "stingers": len(world.stingers),
+                "essences": len(world.dream_essences),
+                "particles": particles.drawn_count,
+                "quality": QUALITY_TIERS.index(effects),
+            })
+        
+        # Trade effects for frame rate when the frame's work runs over budget
+        if governor and governor.record(time.perf_counter() - current_time):
+            effects = governor.quality
+            print(f"Effects quality: {effects.name}")
+        clock.tick(MAX_RENDER_FPS)
     
+    if recorder:
+        recorder.save(record_path)
     pygame.quit()
     sys.exit()
 
+def run_replay(path, headless=False, throttle=True, profile=False, profile_path=PROFILER_EXPORT_PATH):
+    """Re-run a recorded session tick for tick.
+    
+    Rendered replays draw one frame per tick, at SIMULATION_HZ unless
+    throttle is off; headless replays only step the simulation, as fast as
+    possible, and print the final state for comparing runs.
+    """
+    level_num, seed, ticks = load_recording(path)
+    if headless:
+        world = World(level_num, headless=True, verbose=False, seed=seed)
+        start = time.perf_counter()
+        for bits in ticks:
+            replay_tick(world, bits)
+        elapsed = time.perf_counter() - start
+        print(f"Replayed {len(ticks)} ticks in {elapsed:.3f} s ({len(ticks) / max(elapsed, 1e-9):.0f} ticks/s)")
+        player = world.player
+        print(f"Final state: level {world.current_level}, player at ({player.x:.2f}, {player.y:.2f}), "
+              f"health {player.health}, essences {world.dream_essence_count}")
+        return world
+    
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"Replay: {path}")
+    clock = pygame.time.Clock()
+    asset_manager.preload()
+    hud = HUD()
+    particles = ParticleSystem(seed)
+    profiler = FrameProfiler() if profile else None
+    world = World(level_num, seed=seed)
+    world.profiler = profiler
+    
+    for bits in ticks:
+        if profiler:
+            profiler.start()
+        if any(event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE)
+               for event in pygame.event.get()):
+            break
+        if profiler:
+            profiler.lap("events")
+        replay_tick(world, bits)
+        
+        view = world.camera.view()
+        screen.blit(world.chunks.view_layer(view), (0, 0))
+        draw_world(screen, world, particles, 1.0, view)
+        if profiler:
+            profiler.lap("draw_world")
+        hud.draw(screen, world)
+        if profiler:
+            profiler.lap("draw_hud")
+        pygame.display.flip()
+        if profiler:
+            profiler.lap("flip")
+            profiler.end_frame({
+                "bees": len(world.hive_guard_bees),
+                "stingers": len(world.stingers),
+                "essences": len(world.dream_essences),
+                "particles": particles.drawn_count,
+            })
+        if throttle:
+            clock.tick(SIMULATION_HZ)
+    
+    if profiler:
+        profiler.export(profile_path)
+    return world
+
 if __name__ == "__main__":
-    main()
+    def option_value(name, default=None):
+        """Return the value of a --name=value command line option"""
+        return next((arg.split("=", 1)[1] for arg in sys.argv if arg.startswith(f"--{name}=")), default)
+    
+    profile_path = option_value("profile-out", PROFILER_EXPORT_PATH)
+    replay_path = option_value("replay")
+    if replay_path:
+        run_replay(replay_path,
+                   headless="--headless" in sys.argv,
+                   throttle="--unthrottled" not in sys.argv,
+                   profile="--profile" in sys.argv,
+                   profile_path=profile_path)
+        pygame.quit()
+    else:
+        main(dirty_rects="--dirty-rects" in sys.argv,
+             projectile_engine="--numpy-projectiles" in sys.argv,
+             profile="--profile" in sys.argv,
+             profile_path=profile_path,
+             record_path=option_value("record"),
+             quality=option_value("quality"))
@@ -0,0 +1,225 @@
+"""Determinism checks for world snapshots, saved games and recorded sessions.
+
+Runs every level headless under scripted input (with the ProjectileEngine
+too when NumPy is available) and checks that:
+
+- a restored snapshot, or a rewind through SnapshotRing, steps on exactly
+  like the world it was taken from, on the same level or another one
+- save_snapshot/load_snapshot round-trip a snapshot byte for byte
+- corrupt or truncated saves are rejected and leave the world untouched
+- an InputRecorder file replays to the recorded session's final state
+
+    python snapshot_check.py
+    python snapshot_check.py 1 5 --ticks 1200
+"""
+import os
+import sys
+import zlib
+import struct
+import argparse
+import contextlib
+import io
+import tempfile
+
+# Must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import platformer_game as game
+
+DEFAULT_TICKS = 600
+SEED = 1
+REWIND_TICKS = 120  # Ticks rewound through the SnapshotRing
+RESTART_TICK = 200  # Tick the recorded session restarts its level on
+LOAD_ERRORS = (ValueError, struct.error, zlib.error)  # What a bad save may raise, as handled by F9
+
+def scripted_input(tick):
+    """Deterministic input: run right then left every 120 ticks, jumping every 37"""
+    rightward = (tick // 120) % 2 == 0
+    return game.PlayerInput(left=not rightward, right=rightward, jump=tick % 37 == 0)
+
+def make_world(level_num, engine, seed=SEED):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return game.World(level_num, headless=True, verbose=False, projectile_engine=engine, prefetch=False,
+                          seed=seed)
+
+def step(world, tick):
+    with contextlib.redirect_stdout(io.StringIO()):
+        world.step(scripted_input(tick))
+
+def run(world, ticks, start=0):
+    """Step the world through ticks scripted ticks and return the snapshot after each"""
+    snapshots = []
+    for tick in range(start, start + ticks):
+        step(world, tick)
+        snapshots.append(world.snapshot())
+    return snapshots
+
+def first_difference(expected, actual):
+    """Return the index of the first snapshot that differs, or None"""
+    for index, (before, after) in enumerate(zip(expected, actual)):
+        if before != after:
+            return index
+    return None if len(expected) == len(actual) else min(len(expected), len(actual))
+
+def check_restore(level_num, engine, ticks):
+    """Restore a mid-run snapshot into the same world and into one on another level, then step both on"""
+    problems = []
+    half = ticks // 2
+    world = make_world(level_num, engine)
+    run(world, half)
+    snapshot = world.snapshot()
+    expected = run(world, ticks - half, half)
+
+    world.restore(snapshot)
+    diverged = first_difference(expected, run(world, ticks - half, half))
+    if diverged is not None:
+        problems.append(f"restored world diverges {diverged} ticks after the snapshot")
+
+    other = make_world(level_num % game.MAX_LEVELS + 1, engine)
+    run(other, 10)
+    other.restore(snapshot)
+    diverged = first_difference(expected, run(other, ticks - half, half))
+    if diverged is not None:
+        problems.append(f"world restored from another level diverges {diverged} ticks after the snapshot")
+    return problems
+
+def check_rewind(level_num, engine, ticks):
+    """Rewind through a SnapshotRing and check the world is back at every earlier tick"""
+    world = make_world(level_num, engine)
+    history = game.SnapshotRing()
+    expected = []
+    for tick in range(ticks):
+        step(world, tick)
+        history.capture(world)
+        expected.append(world.snapshot())
+    for back in range(1, min(REWIND_TICKS, len(expected) - 1) + 1):
+        history.rewind(world)
+        if world.snapshot() != expected[-1 - back]:
+            return [f"rewinding {back} ticks does not return to the captured state"]
+    return []
+
+def corrupt_saves(data):
+    """Yield (description, bytes) for broken variants of a save file"""
+    yield "empty file", b""
+    yield "short header", data[:game.SAVE_HEADER.size - 1]
+    yield "wrong magic", b"JUNK" + data[4:]
+    yield "newer version", game.SAVE_HEADER.pack(game.SAVE_MAGIC, game.SAVE_VERSION + 1, 0) + data[game.SAVE_HEADER.size:]
+    yield "truncated body", data[:len(data) // 2]
+    yield "flipped body byte", data[:-5] + bytes([data[-5] ^ 0xFF]) + data[-4:]
+    magic, version, section_count = game.SAVE_HEADER.unpack_from(data)
+    body = zlib.decompress(data[game.SAVE_HEADER.size:])
+    lengths = struct.unpack_from(f"<{section_count}I", body)
+    sections = body[4 * section_count:]
+
+    def repack(lengths, sections):
+        return (game.SAVE_HEADER.pack(magic, version, len(lengths)) +
+                zlib.compress(struct.pack(f"<{len(lengths)}I", *lengths) + sections))
+
+    yield "missing section", repack(lengths[:-1], sections[:-lengths[-1]])
+    yield "short column", repack(lengths[:-1] + (lengths[-1] - 1,), sections[:-1])
+    header = bytearray(sections[:lengths[0]])
+    header[0:2] = struct.pack("<H", game.MAX_LEVELS + 1)
+    yield "unknown level", repack(lengths, bytes(header) + sections[lengths[0]:])
+
+def check_save_load(level_num, engine, ticks, directory):
+    """Round-trip a snapshot through a save file and reject broken copies of it"""
+    problems = []
+    world = make_world(level_num, engine)
+    run(world, ticks)
+    snapshot = world.snapshot()
+    path = os.path.join(directory, f"level_{level_num}.sav")
+    game.save_snapshot(snapshot, path)
+    if game.load_snapshot(path) != snapshot:
+        problems.append("loaded snapshot differs from the saved one")
+    with open(path, "rb") as f:
+        data = f.read()
+
+    target = make_world(level_num % game.MAX_LEVELS + 1, engine)
+    run(target, 10)
+    before = target.snapshot()
+    broken_path = os.path.join(directory, "broken.sav")
+    for description, broken in corrupt_saves(data):
+        with open(broken_path, "wb") as f:
+            f.write(broken)
+        try:
+            target.restore(game.load_snapshot(broken_path))
+        except LOAD_ERRORS:
+            pass
+        else:
+            problems.append(f"save with {description} was accepted")
+        if target.snapshot() != before:
+            problems.append(f"save with {description} changed the world")
+            target.restore(before)
+    return problems
+
+def check_replay(level_num, engine, ticks, directory):
+    """Record a session with a restart, save it and check the recording replays to the same state"""
+    problems = []
+    world = make_world(level_num, engine)
+    recorder = game.InputRecorder(level_num, world.seed)
+    for tick in range(ticks):
+        if tick == RESTART_TICK:
+            with contextlib.redirect_stdout(io.StringIO()):
+                world.run_commands(game.COMMAND_RESTART)
+            recorder.command(game.COMMAND_RESTART)
+        recorder.record(scripted_input(tick))
+        step(world, tick)
+    path = os.path.join(directory, f"level_{level_num}.rec")
+    with contextlib.redirect_stdout(io.StringIO()):
+        recorder.save(path)
+
+    recorded_level, seed, recorded_ticks = game.load_recording(path)
+    if (recorded_level, seed, recorded_ticks) != (level_num, world.seed, bytes(recorder.ticks)):
+        problems.append("loaded recording differs from the recorded one")
+    replayed = make_world(recorded_level, engine, seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for bits in recorded_ticks:
+            game.replay_tick(replayed, bits)
+    if replayed.snapshot() != world.snapshot():
+        problems.append("replayed session ends in a different state")
+
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-4])
+    try:
+        game.load_recording(path)
+    except (ValueError, zlib.error):
+        pass
+    else:
+        problems.append("truncated recording was accepted")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Check snapshot, save and replay determinism")
+    parser.add_argument("levels", nargs="*", type=int, help="level numbers (default: all levels)")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="ticks stepped per check")
+    args = parser.parse_args()
+
+    pygame.init()
+    levels = args.levels or list(range(1, game.MAX_LEVELS + 1))
+    engines = [False, True] if game.np is not None else [False]
+    checks = failed = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for level_num in levels:
+            for engine in engines:
+                name = f"level {level_num}" + (" (projectile engine)" if engine else "")
+                problems = (check_restore(level_num, engine, args.ticks) +
+                            check_rewind(level_num, engine, args.ticks) +
+                            check_save_load(level_num, engine, args.ticks, directory) +
+                            check_replay(level_num, engine, args.ticks, directory))
+                checks += 1
+                if problems:
+                    failed += 1
+                    print(f"{name}: FAILED")
+                    for problem in problems:
+                        print(f"  {problem}")
+                else:
+                    print(f"{name}: ok")
+    print(f"{checks} checks run, {failed} failed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())